@@ -0,0 +1,65 @@
+"""
+Compare eager and lazy Flight parsing over a fleet-wide day.
+
+Run from the repository root: python benchmarks/flight_parsing.py
+"""
+
+import sys
+
+sys.path.append("./src")
+sys.path.append(".")
+
+import dataclasses
+import timeit
+
+from apm_crewconnect import Flight
+from tests.fixtures import sector_data
+
+AIRCRAFT = 60
+SECTORS_PER_AIRCRAFT = 6
+CREW_PER_SECTOR = 6
+
+
+def fleet_day() -> list[dict]:
+    crew_member = sector_data()["crewMembers"][0]
+
+    return [
+        sector_data(
+            legId=aircraft * SECTORS_PER_AIRCRAFT + sector,
+            aircraftRegistration=f"FH{aircraft:03}",
+            crewMembers=[crew_member] * CREW_PER_SECTOR,
+        )
+        for aircraft in range(AIRCRAFT)
+        for sector in range(SECTORS_PER_AIRCRAFT)
+    ]
+
+
+def main() -> None:
+    sectors = fleet_day()
+    runs = 20
+
+    cases = {
+        "eager": lambda: [Flight.from_dict(s) for s in sectors],
+        "lazy": lambda: [Flight.from_dict(s, lazy=True) for s in sectors],
+        "lazy, top-level fields read": lambda: [
+            (f.flight_number, f.aircraft_registration)
+            for f in (Flight.from_dict(s, lazy=True) for s in sectors)
+        ],
+        "lazy, everything read": lambda: [
+            dataclasses.asdict(f)
+            for f in (Flight.from_dict(s, lazy=True) for s in sectors)
+        ],
+        "eager, everything read": lambda: [
+            dataclasses.asdict(Flight.from_dict(s)) for s in sectors
+        ],
+    }
+
+    print(f"{len(sectors)} sectors, best of {runs} runs")
+
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=runs))
+        print(f"{name:>28}: {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
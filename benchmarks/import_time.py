@@ -0,0 +1,95 @@
+"""
+Measure the import time of the package, failing if it exceeds its budget.
+
+Each statement is run in a fresh interpreter with python -X importtime, and
+the time spent importing modules which a bare interpreter doesn't import is
+added up. The best of several runs is compared to the statement's budget.
+
+Run from the repository root: python benchmarks/import_time.py
+"""
+
+import os
+import subprocess
+import sys
+
+# Import statements, and their budgets in milliseconds
+BUDGETS = {
+    "import apm_crewconnect": 10,
+    "from apm_crewconnect import Flight, Roster, utils": 120,
+    "from apm_crewconnect import Apm": 600,
+}
+
+# Modules which must not be imported by each statement
+FORBIDDEN_MODULES = {
+    "import apm_crewconnect": ["humps", "numpy", "oauthlib", "requests"],
+    "from apm_crewconnect import Flight, Roster, utils": [
+        "numpy",
+        "oauthlib",
+        "requests",
+    ],
+    "from apm_crewconnect import Apm": ["numpy"],
+}
+
+RUNS = 5
+
+
+def imported_modules(statement: str) -> tuple[dict[str, int], set[str]]:
+    """
+    Get the cumulative import time, in microseconds, of each top-level import,
+    and the names of all imported modules, including nested imports.
+    """
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=os.environ | {"PYTHONPATH": "src"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    names = set()
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        names.add(name.strip())
+
+        # Nested imports are indented, and counted by their top-level import
+        if not name.startswith("  ", 1):
+            times[name.strip()] = int(cumulative)
+
+    return times, names
+
+
+def main() -> None:
+    baseline, _ = imported_modules("pass")
+    failures = []
+
+    for statement, budget in BUDGETS.items():
+        runs = [imported_modules(statement) for _ in range(RUNS)]
+        best = min(
+            sum(time for name, time in times.items() if name not in baseline)
+            for times, _ in runs
+        )
+        forbidden = [
+            name
+            for name in FORBIDDEN_MODULES.get(statement, [])
+            if any(name in names for _, names in runs)
+        ]
+
+        print(f"{statement:55} {best / 1000:7.1f} ms (budget {budget} ms)")
+
+        if best / 1000 > budget:
+            failures.append(f"{statement}: over budget")
+
+        if forbidden:
+            failures.append(f"{statement}: imports {', '.join(forbidden)}")
+
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
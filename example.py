@@ -2,14 +2,12 @@ import sys
 
 sys.path.append("./src")
 
-import dataclasses
-from datetime import date, datetime, time, timedelta, timezone
+from datetime import date, time, timedelta
 from email.policy import default
 import json
-import statistics
 from typing import Any
 
-from apm_crewconnect import Apm, utils
+from apm_crewconnect import Apm, PairingRanker, serialization, utils
 import requests_cache
 
 from file_token_manager import FileTokenManager
@@ -20,37 +18,11 @@ from file_token_manager import FileTokenManager
 apm = Apm("https://crewmobile.to.aero", FileTokenManager())
 
 
-class EnhancedJSONEncoder(json.JSONEncoder):
-    def default(self, o):
-        if hasattr(o, "to_dict"):
-            return o.to_dict()
-
-        if dataclasses.is_dataclass(o):
-            return dataclasses.asdict(o)
-
-        if isinstance(o, datetime):
-            return o.isoformat()
-
-        if isinstance(o, date):
-            return o.isoformat()
-
-        if isinstance(o, time):
-            return o.isoformat()
-
-        if isinstance(o, timedelta):
-            return utils.timedelta_to_str(o)
-
-        if isinstance(o, timezone):
-            return utils.timezone_to_offset_str(o)
-
-        return super().default(o)
-
-
 # with open(".storage/roster.json", "w+") as file:
 #     # roster = apm.get_roster(date.today(), date.today() + timedelta(days=30))
 #     roster = apm.get_roster(date(2024, 11, 1), date(2024, 12, 31))
 
-#     file.write(json.dumps(roster, cls=EnhancedJSONEncoder))
+#     file.write(serialization.dumps(roster))
 
 # with open(".storage/schedule.json", "w+") as file:
 #     flight_schedule = apm.get_flight_schedule(date.today())
@@ -59,14 +31,14 @@ class EnhancedJSONEncoder(json.JSONEncoder):
 #     #     flight for flight in flight_schedule if flight.aircraft_registration == "FHUYE"
 #     # ]
 
-#     file.write(json.dumps(flight_schedule, cls=EnhancedJSONEncoder))
+#     file.write(serialization.dumps(flight_schedule))
 
 # with open(".storage/test.json", "w+") as file:
 #     output = apm.client.request("GET", "/api/airports/ORY")
 
 #     print(output)
 
-#     file.write(json.dumps(output.json(), cls=EnhancedJSONEncoder))
+#     file.write(json.dumps(output.json()))
 
 # flights = apm.get_flight_schedule(date(2024, 11, 10))
 
@@ -83,32 +55,30 @@ class EnhancedJSONEncoder(json.JSONEncoder):
 # print(f"Found {len(flights_with_missing_crew_members)} unstaffed flights.")
 
 # with open(".storage/schedule.json", "w+") as file:
-#     file.write(json.dumps(flights_with_missing_crew_members, cls=EnhancedJSONEncoder))
+#     file.write(serialization.dumps(flights_with_missing_crew_members))
 
 pairing_options = apm.get_pairing_options(
     date(2025, 4, 1),
-    sort_by=lambda pairing_option: (
-        statistics.mean(
-            [
-                rest_period["duration"].total_seconds()
-                for rest_period in pairing_option.rest_periods
-            ]
-            or [0]
-        ),
-        pairing_option.total_on_days,
-    ),
-    excluded_dates=(
-        utils.date_range(date(2025, 4, 5), date(2025, 4, 20))
-        + utils.date_range(date(2025, 4, 26), date(2025, 4, 27))
+    sort_by=PairingRanker(weights={"mean_rest": 1}, tie_breakers=["on_days"]),
+    excluded_dates=utils.DateSet(
+        [
+            utils.DateRange(date(2025, 4, 5), date(2025, 4, 20)),
+            utils.DateRange(date(2025, 4, 26), date(2025, 4, 27)),
+        ]
     ),
+    roster=apm.get_roster(date(2025, 4, 1), date(2025, 4, 30)),
     # stopovers=["RAK"],
     # excluded_stopovers=["LYS", "NTE", "MRS", "DWC", "BVC", "SID"],
     minimum_on_days=3,
     earliest_check_in=time(8, 0, 0),
     without_bidders="OPL",
+    on_page=lambda page: print(f"Retrieved results page {page}"),
+    on_details=lambda pairing: print(
+        f"Retrieved duty periods for pairing ID {pairing.id}"
+    ),
 )
 
 print(f"Found {len(pairing_options)} pairing options.")
 
 with open(".storage/pairing-options.json", "w+") as file:
-    file.write(json.dumps(pairing_options, cls=EnhancedJSONEncoder))
+    serialization.dump(pairing_options, file)
@@ -1,16 +1,119 @@
-from .apm import Apm
-from .apm_client import ApmClient
-from . import exceptions
-from .okta_client import OktaClient
-from . import utils
-from .models.activity import *
-from .models.crew_member import CrewMember
-from .models.delay import Delay
-from .models.duty_period_component import DutyPeriodComponent
-from .models.duty_period import DutyPeriod
-from .models.flight_times import FlightTimes
-from .models.flight import Flight
-from .models.freight_info import FreightInfo
-from .models.roster import Roster
-from .models.pairing import Pairing
-from .models.passenger_info import PassengerInfo
+"""
+A package to interact with the APM CrewConnect API.
+
+Submodules are imported lazily, on first access of one of their attributes: a
+program only using models doesn't import the HTTP and OAuth stacks, nor numpy.
+"""
+
+from importlib import import_module
+
+# typing itself takes longer to import than the package: it isn't imported
+TYPE_CHECKING = False
+
+# The module defining each attribute of the package
+_ATTRIBUTE_MODULES = {
+    "FlightTimeLimit": ".analytics",
+    "Headroom": ".analytics",
+    "RosterTotals": ".analytics",
+    "Apm": ".apm",
+    "ApmClient": ".apm_client",
+    "MemoryCache": ".cache",
+    "SqliteCache": ".cache",
+    "CrewDirectory": ".crew_directory",
+    "ThumbnailStore": ".crew_directory",
+    "OktaClient": ".okta_client",
+    "PairingIndex": ".pairing_index",
+    "ParsingPool": ".parsing",
+    "PairingQuery": ".planner",
+    "PairingRanker": ".ranking",
+    "ScheduleIndex": ".schedule_index",
+    "Snapshot": ".snapshot",
+    "write_snapshot": ".snapshot",
+    "PairingSortKey": ".sorting",
+    "FlightStore": ".store",
+    "SqliteTokenManager": ".token_manager",
+    "ScheduleChanges": ".watcher",
+    "ScheduleWatcher": ".watcher",
+    "Activity": ".models.activity",
+    "GroundActivity": ".models.activity",
+    "OffActivity": ".models.activity",
+    "BlankFlightActivity": ".models.activity",
+    "VacationActivity": ".models.activity",
+    "AbsentActivity": ".models.activity",
+    "UnfitActivity": ".models.activity",
+    "SimulatorActivity": ".models.activity",
+    "HotelActivity": ".models.activity",
+    "DeadheadActivity": ".models.activity",
+    "ShuttleActivity": ".models.activity",
+    "TrainActivity": ".models.activity",
+    "FlightActivity": ".models.activity",
+    "Airport": ".models.airport",
+    "CrewMember": ".models.crew_member",
+    "Delay": ".models.delay",
+    "DutyPeriodComponent": ".models.duty_period_component",
+    "DutyPeriod": ".models.duty_period",
+    "FlightTimes": ".models.flight_times",
+    "Flight": ".models.flight",
+    "LazyFlight": ".models.flight",
+    "FreightInfo": ".models.freight_info",
+    "Roster": ".models.roster",
+    "Pairing": ".models.pairing",
+    "RestPeriod": ".models.rest_period",
+    "PassengerInfo": ".models.passenger_info",
+}
+
+# Submodules which are attributes of the package
+_SUBMODULES = {"exceptions", "filters", "serialization", "utils"}
+
+__all__ = [*_ATTRIBUTE_MODULES, *sorted(_SUBMODULES)]
+
+if TYPE_CHECKING:
+    from . import exceptions, filters, serialization, utils
+    from .analytics import FlightTimeLimit, Headroom, RosterTotals
+    from .apm import Apm
+    from .apm_client import ApmClient
+    from .cache import MemoryCache, SqliteCache
+    from .crew_directory import CrewDirectory, ThumbnailStore
+    from .okta_client import OktaClient
+    from .pairing_index import PairingIndex
+    from .parsing import ParsingPool
+    from .planner import PairingQuery
+    from .ranking import PairingRanker
+    from .schedule_index import ScheduleIndex
+    from .snapshot import Snapshot, write_snapshot
+    from .sorting import PairingSortKey
+    from .store import FlightStore
+    from .token_manager import SqliteTokenManager
+    from .watcher import ScheduleChanges, ScheduleWatcher
+    from .models.activity import *
+    from .models.airport import Airport
+    from .models.crew_member import CrewMember
+    from .models.delay import Delay
+    from .models.duty_period_component import DutyPeriodComponent
+    from .models.duty_period import DutyPeriod
+    from .models.flight_times import FlightTimes
+    from .models.flight import Flight, LazyFlight
+    from .models.freight_info import FreightInfo
+    from .models.roster import Roster
+    from .models.pairing import Pairing
+    from .models.rest_period import RestPeriod
+    from .models.passenger_info import PassengerInfo
+
+
+def __getattr__(name: str) -> object:
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+
+    if name not in _ATTRIBUTE_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_ATTRIBUTE_MODULES[name], __name__), name)
+
+    # Later accesses don't go through __getattr__
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,247 @@
+"""
+Rolling-window flight time totals over a roster.
+
+Block and flight duty times are summed per day into prefix sums, so that the
+total over any window is a difference of two of them. Evaluating a pairing
+overlays its own, much smaller, prefix sums instead of recomputing the roster's.
+
+Totals only include activities within the roster: for 12 month totals to be
+complete, the roster should start 12 months before the first day of interest.
+"""
+
+from bisect import bisect_left, bisect_right
+import calendar
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Iterable, Optional
+
+from .models.activity import FlightActivity, SimulatorActivity
+from .models.pairing import Pairing
+from .models.roster import Roster
+
+
+@dataclass(frozen=True)
+class FlightTimeLimit:
+    name: str
+    days: Optional[int] = None
+    months: Optional[int] = None
+    block: Optional[timedelta] = None
+    duty: Optional[timedelta] = None
+
+    def window_start(self, day: date) -> date:
+        """Get the first day of the window ending on a given day."""
+
+        if self.months is None:
+            return day - timedelta(days=self.days - 1)
+
+        month_index = day.year * 12 + day.month - 1 - self.months
+        year, month = divmod(month_index, 12)
+        month += 1
+
+        return date(
+            year, month, min(day.day, calendar.monthrange(year, month)[1])
+        ) + timedelta(days=1)
+
+
+LIMITS = [
+    FlightTimeLimit("7 days", days=7, duty=timedelta(hours=60)),
+    FlightTimeLimit(
+        "28 days", days=28, block=timedelta(hours=100), duty=timedelta(hours=190)
+    ),
+    FlightTimeLimit("12 months", months=12, block=timedelta(hours=1000)),
+]
+
+
+@dataclass
+class Headroom:
+    """Time left under a limit, negative if exceeded, or None if it isn't limited."""
+
+    block: Optional[timedelta]
+    duty: Optional[timedelta]
+
+
+class _DailyTotals:
+    """Block and duty seconds per day, as prefix sums over the days having any."""
+
+    def __init__(self, totals: dict[int, tuple[int, int]]) -> None:
+        self._days = sorted(totals)
+        self._block = [0, *accumulate(totals[day][0] for day in self._days)]
+        self._duty = [0, *accumulate(totals[day][1] for day in self._days)]
+
+    @property
+    def first_day(self) -> Optional[int]:
+        return self._days[0] if self._days else None
+
+    @property
+    def last_day(self) -> Optional[int]:
+        return self._days[-1] if self._days else None
+
+    def sum(self, start: int, end: int) -> tuple[int, int]:
+        """Sum block and duty seconds from the start to the end ordinal, inclusive."""
+
+        low = bisect_left(self._days, start)
+        high = bisect_right(self._days, end)
+
+        return (
+            self._block[high] - self._block[low],
+            self._duty[high] - self._duty[low],
+        )
+
+
+def _add(
+    totals: dict[int, tuple[int, int]], day: date, block: timedelta, duty: timedelta
+) -> None:
+    previous_block, previous_duty = totals.get(day.toordinal(), (0, 0))
+    totals[day.toordinal()] = (
+        previous_block + int(block.total_seconds()),
+        previous_duty + int(duty.total_seconds()),
+    )
+
+
+class RosterTotals:
+    def __init__(self, roster: Roster, limits: list[FlightTimeLimit] = LIMITS) -> None:
+        self.roster = roster
+        self.limits = limits
+
+        totals = {}
+        counted_duties = set()
+
+        for activity in roster.activities:
+            if isinstance(activity, FlightActivity):
+                # Legs of one duty period each carry its flight duty time
+                duty_key = activity.check_in or activity.id
+                duty = (
+                    activity.flight_duty
+                    if duty_key not in counted_duties
+                    else timedelta()
+                )
+                counted_duties.add(duty_key)
+
+                _add(totals, activity.start.date(), activity.block_time, duty)
+            elif isinstance(activity, SimulatorActivity):
+                _add(totals, activity.start.date(), activity.block_time, timedelta())
+
+        self._totals = _DailyTotals(totals)
+
+    def totals(self, day: date, limit: FlightTimeLimit) -> tuple[timedelta, timedelta]:
+        """
+        Get the block and flight duty totals over a limit's window ending on a day.
+        """
+
+        block, duty = self._totals.sum(
+            limit.window_start(day).toordinal(), day.toordinal()
+        )
+
+        return timedelta(seconds=block), timedelta(seconds=duty)
+
+    def headroom(self, day: date) -> dict[str, Headroom]:
+        """Get the headroom under each limit, for its window ending on a day."""
+
+        return self._headroom(day, None)
+
+    def headroom_by_day(
+        self, days: Optional[Iterable[date]] = None
+    ) -> dict[date, dict[str, Headroom]]:
+        """Get the headroom under each limit for each day, by default of the roster."""
+
+        if days is None:
+            days = (
+                self.roster.start + timedelta(days=offset)
+                for offset in range((self.roster.end - self.roster.start).days + 1)
+            )
+
+        return {day: self.headroom(day) for day in days}
+
+    def headroom_with(self, pairing: Pairing) -> dict[date, dict[str, Headroom]]:
+        """
+        Get the headroom under each limit if a pairing were added to the roster,
+        for every day whose windows include any of the pairing's duty periods.
+
+        :param pairing: A pairing, with its duty periods.
+        """
+
+        totals = {}
+
+        for duty_period in pairing.duty_periods or []:
+            _add(
+                totals,
+                duty_period.departure_date,
+                duty_period.block,
+                duty_period.flight_duty_period,
+            )
+
+        extra = _DailyTotals(totals)
+
+        if extra.first_day is None:
+            return {}
+
+        first_day = date.fromordinal(extra.first_day)
+        last_day = date.fromordinal(extra.last_day)
+
+        # The last day whose windows may still include the pairing
+        end = max(
+            (self._window_end(limit, last_day) for limit in self.limits),
+            default=last_day,
+        )
+
+        days = (
+            first_day + timedelta(days=offset)
+            for offset in range((end - first_day).days + 1)
+        )
+
+        return {day: self._headroom(day, extra) for day in days}
+
+    def fits(self, pairing: Pairing) -> bool:
+        """
+        Determine if a pairing can be added to the roster without exceeding limits.
+        """
+
+        return all(
+            (headroom.block is None or headroom.block >= timedelta())
+            and (headroom.duty is None or headroom.duty >= timedelta())
+            for headroom_by_limit in self.headroom_with(pairing).values()
+            for headroom in headroom_by_limit.values()
+        )
+
+    def _headroom(
+        self, day: date, extra: Optional[_DailyTotals]
+    ) -> dict[str, Headroom]:
+        headroom = {}
+
+        for limit in self.limits:
+            start = limit.window_start(day).toordinal()
+            block, duty = self._totals.sum(start, day.toordinal())
+
+            if extra is not None:
+                extra_block, extra_duty = extra.sum(start, day.toordinal())
+                block += extra_block
+                duty += extra_duty
+
+            headroom[limit.name] = Headroom(
+                block=(
+                    limit.block - timedelta(seconds=block)
+                    if limit.block is not None
+                    else None
+                ),
+                duty=(
+                    limit.duty - timedelta(seconds=duty)
+                    if limit.duty is not None
+                    else None
+                ),
+            )
+
+        return headroom
+
+    @staticmethod
+    def _window_end(limit: FlightTimeLimit, day: date) -> date:
+        # Windows ending up to a window's length after a day include it
+        if limit.months is None:
+            return day + timedelta(days=limit.days - 1)
+
+        end = day
+
+        while limit.window_start(end + timedelta(days=1)) <= day:
+            end += timedelta(days=1)
+
+        return end
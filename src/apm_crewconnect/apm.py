@@ -1,35 +1,77 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import heapq
 from datetime import UTC, date, datetime, timedelta, time
 import json
 from oauthlib.oauth2.rfc6749.errors import InvalidGrantError, MismatchingStateError
 import re
-import statistics
-from typing import Callable, List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional
 
 from .models.activity import Activity
 from .models.roster import Roster
 
 from .apm_client import ApmClient
+from .cache import MemoryCache
+from .crew_directory import CrewDirectory
 from .exceptions import InvalidAuthRedirectException
+from .filters import activity_filter, sector_filter
 
+from .interfaces.cache_interface import CacheInterface
 from .interfaces.token_manager_interface import TokenManagerInterface
-from .models.duty_period import DutyPeriod
+from .models.airport import Airport
 from .models.flight import Flight
 from .models.pairing import Pairing
-from .utils import dates_in_range
+from .planner import PairingQuery
+from .ranking import PairingRanker
+from .sorting import PairingSortKey
+from .parsing import ParsingPool, parse_flight_schedule, parse_pairing_details
+from .streaming import iter_array_items
+from .utils import DateRange, date_range
+from .watcher import ScheduleWatcher
 
 
 class Apm:
     roster = {}
 
+    # Cache lifetimes (in seconds) for a day of the flight schedule.
+    # Days older than flight_schedule_settled_after are cached permanently.
+    flight_schedule_live_ttl = 5 * 60
+    flight_schedule_ttl = 60 * 60
+    flight_schedule_settled_after = timedelta(days=2)
+
+    # Cache lifetimes (in seconds) of a pairing's duty periods, which rarely change,
+    # and of its details payload, which also holds its frequently changing bidders.
+    pairing_details_ttl = 24 * 60 * 60
+    pairing_bidders_ttl = 5 * 60
+
+    # Cache lifetime (in seconds) of airports, which are reference data.
+    airport_ttl = 30 * 24 * 60 * 60
+
     def __init__(
         self,
         host: str,
         token_manager: Optional[TokenManagerInterface] = None,
         manual_auth: bool = False,
+        cache: Optional[CacheInterface] = None,
+        max_workers: int = 8,
+        parsing_pool: Optional[ParsingPool] = None,
+        crew_directory: Optional[CrewDirectory] = None,
     ):
+        """
+        :param crew_directory: A directory through which the crew members of
+                               rosters and flight schedules are shared.
+        """
+
         self.host = host
         self.token_manager = token_manager
         self.manual_auth = manual_auth
+        self.cache = cache if cache is not None else MemoryCache()
+        self.max_workers = max_workers
+        self.parsing_pool = (
+            parsing_pool if parsing_pool is not None else ParsingPool(max_workers=0)
+        )
+        self.crew_directory = crew_directory
+        self._airports: dict[str, Airport] = {}
 
         self._setup_client(host)
 
@@ -41,7 +83,18 @@ class Apm:
         self,
         start_date: date | None = None,
         end_date: date | None = None,
+        activity_types: List[type[Activity]] = [],
     ) -> Roster:
+        """
+        Get the roster for a specified date range.
+
+        :param start_date: The beginning of the date range. Defaults to today.
+        :param end_date: The end of the date range. Defaults to 30 days after start.
+        :param activity_types: Activity classes to keep (e.g. FlightActivity).
+                               Other activities are discarded before being parsed.
+        :return: The requested roster
+        """
+
         if start_date is None:
             start_date = date.today()
 
@@ -65,7 +118,9 @@ class Apm:
             },
         ).json()
 
-        return Roster(
+        predicate = activity_filter(activity_types)
+
+        roster = Roster(
             user_id=self.user_id,
             start=datetime.fromisoformat(response["utcCalendar"][0]["day"]).date(),
             end=datetime.fromisoformat(response["utcCalendar"][-1]["day"]).date(),
@@ -75,104 +130,500 @@ class Apm:
                     for calendar_day in response["utcCalendar"]
                     for activity in map(
                         Activity.from_roster,
-                        calendar_day["crewActivities"],
+                        filter(predicate, calendar_day["crewActivities"]),
                     )
                     if activity is not None
                 }.values()
             ),
         )
 
+        if self.crew_directory is not None:
+            self.crew_directory.add_roster(roster)
+
+        return roster
+
     def get_flight_schedule(
         self,
         start_date: date,
         end_date: date | None = None,
+        registrations: List[str] = [],
+        aircraft_types: List[str] = [],
+        flight_numbers: List[str] = [],
+        airports: List[str] = [],
+        departs_after: Optional[datetime] = None,
+        departs_before: Optional[datetime] = None,
+        lazy: bool = False,
     ) -> list:
         """
         Get the flight schedule for a specified date range.
 
+        Each day is fetched separately (in parallel) and cached under its own key,
+        so that multi-day queries only request the days missing from the cache.
+        Filters are checked against the raw sectors, before any Flight is built.
+
         :param start_date: The beginning of the date range.
         :param end_date: An optional end for the date range.
                          If not set, only one day of the schedule will be returned.
+        :param registrations: A list of aircraft registrations to filter the flights.
+        :param aircraft_types: A list of aircraft types to filter the flights.
+        :param flight_numbers: A list of flight numbers to filter the flights.
+        :param airports: A list of airports the flights must depart from or arrive at.
+        :param departs_after: Keep only flights departing at or after this time.
+        :param departs_before: Keep only flights departing before this time.
+        :param lazy: Whether nested objects and times of each flight should only be
+                     decoded when first accessed.
         :return: The requested flight schedule
         """
 
         # Set default value for end_date
         end_date = end_date or start_date
 
-        flight_schedule = self.client.request(
-            "get",
-            f"/api/crews/{self.user_id}/flight-schedule",
-            params={
-                "from": start_date.isoformat(),
-                "to": (end_date + timedelta(days=1)).isoformat(),  # 'to' is exclusive
-                "zoneOffset": "Z",
-            },
-        )
+        contents_by_day = {
+            day: self.cache.get(self._flight_schedule_cache_key(day))
+            for day in date_range(start_date, end_date)
+        }
+        missing_days = [
+            day for day, content in contents_by_day.items() if content is None
+        ]
 
-        flight_schedule = flight_schedule.json()
+        if len(missing_days) == 1:
+            contents_by_day[missing_days[0]] = self._fetch_flight_schedule_day(
+                missing_days[0]
+            )
+        elif len(missing_days) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                contents_by_day.update(
+                    zip(
+                        missing_days,
+                        executor.map(self._fetch_flight_schedule_day, missing_days),
+                    )
+                )
 
-        flights = [
-            Flight.from_dict(flight)
-            for aircraft_by_date in flight_schedule["_embedded"][
-                "companyAircraftByDateDtoList"
-            ]
-            for aircraft in aircraft_by_date["aircraftList"]["_embedded"][
-                "companyAircraftDtoList"
+        contents = [contents_by_day[day] for day in sorted(contents_by_day)]
+        filters = {
+            "registrations": registrations,
+            "aircraft_types": aircraft_types,
+            "flight_numbers": flight_numbers,
+            "airports": airports,
+            "departs_after": departs_after,
+            "departs_before": departs_before,
+        }
+
+        if lazy:
+            # Lazy flights are cheap to build and keep their raw data: parse in-process
+            flights_by_day = [
+                parse_flight_schedule(content, filters, lazy=True)
+                for content in contents
             ]
-            for flight in aircraft["sectors"]
-        ]
+        else:
+            flights_by_day = self.parsing_pool.map(
+                parse_flight_schedule, contents, filters
+            )
+
+        # Sectors overlapping midnight may be returned for two consecutive days
+        flights = {
+            flight.leg_id: flight for flights in flights_by_day for flight in flights
+        }
+
+        if self.crew_directory is not None:
+            return self.crew_directory.add_flights(flights.values())
+
+        return list(flights.values())
+
+    def iter_flight_schedule(
+        self,
+        start_date: date,
+        end_date: date | None = None,
+        registrations: List[str] = [],
+        aircraft_types: List[str] = [],
+        flight_numbers: List[str] = [],
+        airports: List[str] = [],
+        departs_after: Optional[datetime] = None,
+        departs_before: Optional[datetime] = None,
+        lazy: bool = False,
+    ) -> Iterator[Flight]:
+        """
+        Iterate over the flight schedule for a specified date range.
+
+        Days missing from the cache are streamed rather than decoded in one go:
+        sectors are yielded one aircraft at a time, so memory use is bounded by a
+        single aircraft's data. Streamed days are therefore not cached.
+
+        Accepts the same arguments as get_flight_schedule.
+        """
+
+        # Set default value for end_date
+        end_date = end_date or start_date
+
+        predicate = sector_filter(
+            registrations=registrations,
+            aircraft_types=aircraft_types,
+            flight_numbers=flight_numbers,
+            airports=airports,
+            departs_after=departs_after,
+            departs_before=departs_before,
+        )
+        seen_leg_ids = set()
+
+        for day in date_range(start_date, end_date):
+            content = self.cache.get(self._flight_schedule_cache_key(day))
+
+            if content is None:
+                sectors = self.stream_flight_schedule_day(day)
+            else:
+                sectors = self._iter_flight_schedule_sectors([content])
+
+            for sector in filter(predicate, sectors):
+                # Sectors overlapping midnight may be returned for two consecutive days
+                if sector["legId"] in seen_leg_ids:
+                    continue
+
+                seen_leg_ids.add(sector["legId"])
+                flight = Flight.from_dict(sector, lazy=lazy)
+
+                if self.crew_directory is not None:
+                    self.crew_directory.add_flight(flight)
+
+                yield flight
+
+    def watch_flight_schedule(
+        self, day: Optional[date] = None, **kwargs
+    ) -> ScheduleWatcher:
+        """
+        Get a watcher polling the flight schedule of a day for changed legs.
+
+        :param day: The day to watch. Defaults to the current (UTC) day.
+
+        The other arguments are those of ScheduleWatcher.
+        """
 
-        return flights
+        return ScheduleWatcher(self, day, **kwargs)
+
+    def get_airport(self, iata_code: str) -> Airport:
+        """
+        Get an airport by its IATA code.
+
+        Airports are kept in memory once fetched, and cached for airport_ttl:
+        repeated lookups don't make any request.
+        """
+
+        airport = self._airports.get(iata_code)
+
+        if airport is not None:
+            return airport
+
+        return self.get_airports([iata_code])[iata_code]
+
+    def get_airports(self, iata_codes: Iterable[str]) -> dict[str, Airport]:
+        """
+        Get airports by their IATA codes, fetching those missing from the cache
+        in parallel. This may be used to prefetch airports in bulk.
+
+        :param iata_codes: The IATA codes of the airports.
+        :return: The airports, by IATA code.
+        """
+
+        iata_codes = list(dict.fromkeys(iata_codes))
+        missing_codes = []
+
+        for iata_code in iata_codes:
+            if iata_code in self._airports:
+                continue
+
+            airport = self.cache.get(self._airport_cache_key(iata_code))
+
+            if airport is None:
+                missing_codes.append(iata_code)
+            else:
+                self._airports[iata_code] = airport
+
+        if len(missing_codes) == 1:
+            self._fetch_airport(missing_codes[0])
+        elif len(missing_codes) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(self._fetch_airport, missing_codes))
+
+        return {iata_code: self._airports[iata_code] for iata_code in iata_codes}
 
     def get_pairing_options(
         self,
-        reference_date: date,
-        sort_by: str | set[str] | Callable = "rest",
+        reference_date: date | Iterable[date],
+        sort_by: str | Callable | PairingSortKey | PairingRanker = "rest",
         airports: List[str] = [],
         stopovers: List[str] = [],
         flight_numbers: List[str] = [],
         total_on_days: Optional[int] = None,
         consecutive_stopover_nights: Optional[int] = None,
-        excluded_dates: List[date] = [],
+        excluded_dates: Iterable[date | DateRange] = [],
         excluded_stopovers: List[str] = [],
         minimum_on_days: int = 1,
         earliest_check_in: Optional[time] = None,
         without_bidders: Optional[str] = None,
+        roster: Optional[Roster] = None,
+        on_page: Optional[Callable[[int], None]] = None,
+        on_details: Optional[Callable[[Pairing], None]] = None,
+        limit: Optional[int] = None,
     ) -> list:
         """
-        Get the pairing options for a specified reference date.
+        Get the pairing options for specified reference dates, sorted.
+
+        :param reference_date: A reference date, or several (e.g. a DateRange).
+        :param sort_by: The name of a sort key ("rest", "block", "total_on_days",
+                        "departure_date"), or a callable or PairingSortKey
+                        which should be used to sort the results, or a
+                        PairingRanker scoring them all at once.
+        :param limit: If set, only the best pairing options are returned. When
+                      the sort key has a bound, details are only fetched for
+                      those which can make the cut.
+        :return: The filtered pairing options.
+
+        The other arguments are those of iter_pairing_options.
+        """
+
+        query = PairingQuery(
+            airports=airports,
+            stopovers=stopovers,
+            flight_numbers=flight_numbers,
+            total_on_days=total_on_days,
+            consecutive_stopover_nights=consecutive_stopover_nights,
+            excluded_dates=excluded_dates,
+            excluded_stopovers=excluded_stopovers,
+            minimum_on_days=minimum_on_days,
+            earliest_check_in=earliest_check_in,
+            without_bidders=without_bidders,
+            roster=roster,
+        )
+        if isinstance(sort_by, PairingRanker):
+            return sort_by.rank(
+                list(
+                    self._iter_pairing_options(
+                        self._reference_dates(reference_date),
+                        query,
+                        on_page,
+                        on_details,
+                    )
+                ),
+                limit,
+            )
+
+        sort_key = PairingSortKey.resolve(sort_by)
+
+        if limit is not None:
+            return self._top_pairing_options(
+                self._reference_dates(reference_date),
+                query,
+                sort_key,
+                limit,
+                on_page,
+                on_details,
+            )
+
+        pairing_options = list(
+            self._iter_pairing_options(
+                self._reference_dates(reference_date), query, on_page, on_details
+            )
+        )
+
+        pairing_options.sort(
+            key=sort_key.key,
+            reverse=True,
+        )
+
+        return pairing_options
+
+    def iter_pairing_options(
+        self,
+        reference_date: date | Iterable[date],
+        airports: List[str] = [],
+        stopovers: List[str] = [],
+        flight_numbers: List[str] = [],
+        total_on_days: Optional[int] = None,
+        consecutive_stopover_nights: Optional[int] = None,
+        excluded_dates: Iterable[date | DateRange] = [],
+        excluded_stopovers: List[str] = [],
+        minimum_on_days: int = 1,
+        earliest_check_in: Optional[time] = None,
+        without_bidders: Optional[str] = None,
+        roster: Optional[Roster] = None,
+        on_page: Optional[Callable[[int], None]] = None,
+        on_details: Optional[Callable[[Pairing], None]] = None,
+    ) -> Iterator[Pairing]:
+        """
+        Iterate over the pairing options for specified reference dates, yielding
+        each one as soon as its details are retrieved and it matches all filters.
+
+        Searches for several reference dates run concurrently. Pairings found for
+        more than one of them are only yielded, and have their details fetched, once.
 
-        :param reference_date: The beginning of the date range.
-        :param sort_by: The attribute or callable which should be used to sort the results.
+        :param reference_date: A reference date, or several (e.g. a DateRange).
         :param airports: A list of airports to filter the pairing options.
         :param stopovers: A list of stopovers to filter the pairing options.
         :param flight_numbers: A list of flight numbers to filter the pairing options.
         :param total_on_days: The number of ON days to filter the pairing options by.
         :param consecutive_stopover_nights: The number of consecutive stopovers nights
                                             to filter the pairing options by.
-        :excluded_dates: A list of dates to be excluded from results.
+        :excluded_dates: Dates, DateRanges or a DateSet to be excluded from results.
         :excluded_stopovers: A list of stopovers to be excluded from results.
-        :return: The filtered pairing options.
+        :param minimum_on_days: The minimum number of ON days of the pairing options.
+        :param earliest_check_in: The earliest local check-in time of any duty period.
+        :param without_bidders: A role code for which pairing options must not
+                                have any bidders yet.
+        :param roster: A roster whose blocking activities, including their rest
+                       before and after, pairing options must not overlap.
+        :param on_page: Called with the page number once each results page is
+                        retrieved, from worker threads when searching several dates.
+        :param on_details: Called with each pairing option once its details are
+                           retrieved, whether or not it matches the filters.
+        :return: The filtered pairing options, in the order they were found.
         """
 
-        pairing_options = []
-        filters = {}
+        query = PairingQuery(
+            airports=airports,
+            stopovers=stopovers,
+            flight_numbers=flight_numbers,
+            total_on_days=total_on_days,
+            consecutive_stopover_nights=consecutive_stopover_nights,
+            excluded_dates=excluded_dates,
+            excluded_stopovers=excluded_stopovers,
+            minimum_on_days=minimum_on_days,
+            earliest_check_in=earliest_check_in,
+            without_bidders=without_bidders,
+            roster=roster,
+        )
+
+        return self._iter_pairing_options(
+            self._reference_dates(reference_date), query, on_page, on_details
+        )
+
+    @staticmethod
+    def _reference_dates(reference_date: date | Iterable[date]) -> list[date]:
+        if isinstance(reference_date, date):
+            return [reference_date]
 
-        if len(airports) > 0:
-            filters["airports"] = " ".join(airports)
+        return list(reference_date)
 
-        if len(stopovers) > 0:
-            filters["stopovers"] = " ".join(stopovers)
+    def _iter_pairing_options(
+        self,
+        reference_dates: list[date],
+        query: PairingQuery,
+        on_page: Optional[Callable[[int], None]] = None,
+        on_details: Optional[Callable[[Pairing], None]] = None,
+    ) -> Iterator[Pairing]:
+        if query.is_unsatisfiable:
+            return
+
+        pending = deque()
+
+        for pairing_option in self._iter_pairing_summaries(
+            reference_dates, query, on_page
+        ):
+            pending.append(
+                (pairing_option, self._fetch_pairing_details(pairing_option, query))
+            )
 
-        if len(flight_numbers) > 0:
-            filters["flightNumbers"] = " ".join(flight_numbers)
+            # Yield whatever has been parsed, keeping the order pairings were found in
+            while pending and (pending[0][1].done() or len(pending) > self.max_workers):
+                yield from self._resolve_pairing_details(*pending.popleft(), on_details)
 
-        if total_on_days is not None:
-            filters["totalOverlappingDays"] = total_on_days
+        while pending:
+            yield from self._resolve_pairing_details(*pending.popleft(), on_details)
 
-        if consecutive_stopover_nights is not None:
-            filters["consecutiveNightStopover"] = consecutive_stopover_nights
+    def _top_pairing_options(
+        self,
+        reference_dates: list[date],
+        query: PairingQuery,
+        sort_key: PairingSortKey,
+        limit: int,
+        on_page: Optional[Callable[[int], None]] = None,
+        on_details: Optional[Callable[[Pairing], None]] = None,
+    ) -> list[Pairing]:
+        if query.is_unsatisfiable or limit <= 0:
+            return []
+
+        # Ties are ranked by search order, as a stable sort would
+        candidates = list(
+            enumerate(self._iter_pairing_summaries(reference_dates, query, on_page))
+        )
+
+        if sort_key.bound is not None:
+            candidates.sort(
+                key=lambda candidate: (sort_key.bound(candidate[1]), -candidate[0]),
+                reverse=True,
+            )
+
+        # A min-heap of the best pairing options so far, the worst one on top
+        top = []
+
+        for index, pairing_option in candidates:
+            if (
+                len(top) == limit
+                and sort_key.bound is not None
+                and (sort_key.bound(pairing_option), -index) <= top[0][:2]
+            ):
+                # Candidates are ordered by bound: none of the next ones can do better
+                break
 
+            for matching_option in self._resolve_pairing_details(
+                pairing_option,
+                self._fetch_pairing_details(pairing_option, query),
+                on_details,
+            ):
+                entry = (sort_key.key(matching_option), -index, matching_option)
+
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif entry[:2] > top[0][:2]:
+                    heapq.heapreplace(top, entry)
+
+        return [
+            pairing_option
+            for *_, pairing_option in sorted(
+                top, key=lambda entry: entry[:2], reverse=True
+            )
+        ]
+
+    def _iter_pairing_summaries(
+        self,
+        reference_dates: list[date],
+        query: PairingQuery,
+        on_page: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[Pairing]:
+        if len(reference_dates) == 1:
+            yield from self._iter_reference_date_summaries(
+                reference_dates[0], query, on_page
+            )
+            return
+
+        seen_ids = set()
+
+        # Searches for all reference dates run concurrently, their results being
+        # de-duplicated in order, before any details are fetched.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            searches = [
+                executor.submit(
+                    lambda reference_date: list(
+                        self._iter_reference_date_summaries(
+                            reference_date, query, on_page
+                        )
+                    ),
+                    reference_date,
+                )
+                for reference_date in reference_dates
+            ]
+
+            for search in searches:
+                for pairing_option in search.result():
+                    if pairing_option.id not in seen_ids:
+                        seen_ids.add(pairing_option.id)
+
+                        yield pairing_option
+
+    def _iter_reference_date_summaries(
+        self,
+        reference_date: date,
+        query: PairingQuery,
+        on_page: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[Pairing]:
         page = 1
 
         while page == 1 or "_embedded" in response:
@@ -184,7 +635,7 @@ class Apm:
                     "isLocal": True,
                     "page": page,
                 }
-                | filters,
+                | query.server_params,
             )
 
             if "error" in response.json():
@@ -193,141 +644,187 @@ class Apm:
             response = response.json()
 
             if "_embedded" in response:
-                pairing_options += [
-                    Pairing.from_dict(pairing_option)
-                    for pairing_option in response["_embedded"]["pairingRequestDtoList"]
-                ]
-
-                print("Retrieved results page " + str(page))
+                if on_page is not None:
+                    on_page(page)
+
+                # Summary predicates are checked as each page arrives, in a single pass
+                yield from filter(
+                    query.matches_summary,
+                    map(
+                        Pairing.from_dict,
+                        response["_embedded"]["pairingRequestDtoList"],
+                    ),
+                )
 
             page += 1
 
-        # while "_links" in response and "next" in response["_links"]:
-        #     response = self.client.request(
-        #         "get",
-        #         response["_links"]["next"]["href"],
-        #     ).json()
-
-        #     if "_embedded" in response:
-        #         pairing_options += [
-        #             Pairing.from_dict(pairing_option)
-        #             for pairing_option in response["_embedded"]["pairingRequestDtoList"]
-        #         ]
-
-        #     print(
-        #         "Retrieved results page "
-        #         + re.search("page=([0-9]*)", response["_links"]["self"]["href"]).group(
-        #             1
-        #         )
-        #     )
-
-        # Exclude unwanted dates
-        pairing_options = list(
-            filter(
-                lambda pairing_option: not dates_in_range(
-                    excluded_dates,
-                    pairing_option.scheduled_departure_date,
-                    pairing_option.scheduled_arrival_date,
-                ),
-                pairing_options,
-            )
-        )
-
-        # Exclude unwanted stopovers
-        pairing_options = list(
-            filter(
-                lambda pairing_option: len(
-                    set(pairing_option.stopover_airports) - set(excluded_stopovers)
+    def _fetch_pairing_details(
+        self, pairing_option: Pairing, query: PairingQuery
+    ) -> Future:
+        duty_periods_key = self._pairing_cache_key(pairing_option.id, "duty-periods")
+        details_key = self._pairing_cache_key(pairing_option.id, "details")
+        duty_periods = self.cache.get(duty_periods_key)
+
+        # The raw details hold the bidders, so they expire sooner than the parsed
+        # duty periods, which suffice unless bidders must be checked.
+        if duty_periods is not None and query.without_bidders is None:
+            return self._completed_future(
+                duty_periods
+                if query.matches_check_ins(
+                    [duty.check_in_local.time() for duty in duty_periods]
                 )
-                == len(pairing_option.stopover_airports),
-                pairing_options,
+                else None
             )
-        )
 
-        # Include only pairing matching minimum on days
-        pairing_options = list(
-            filter(
-                lambda pairing_option: pairing_option.total_on_days >= minimum_on_days,
-                pairing_options,
-            )
-        )
+        content = self.cache.get(details_key)
 
-        for pairing_option in pairing_options:
-            response = self.client.request(
+        if content is None:
+            content = self.client.request(
                 "get",
                 f"/api/crews/{self.user_id}/pairing-requests/{pairing_option.id}/details",
                 params={"zoneOffset": "+0200"},
-            ).json()
-
-            pairing_option.duty_periods = [
-                DutyPeriod.from_dict(duty_period_dto)
-                for duty_period_dto in response["dutyPeriodRequestDtos"]
-                if len(
-                    [
-                        pairing_request_crews["crewRequestCrewDtos"]
-                        for pairing_request_crews in response[
-                            "pairingRequestCrewByRoleDtos"
-                        ]
-                        if pairing_request_crews["roleCode"] == without_bidders
-                    ]
-                )
-                == 0
-            ]
+            ).content
 
-            print("Retrieved duty periods for pairing ID " + str(pairing_option.id))
-
-        # Exclude pairings where any check-in is earlier than earliest_check_in
-        if earliest_check_in is not None:
-            pairing_options = [
-                pairing_option
-                for pairing_option in pairing_options
-                if pairing_option.duty_periods  # Ensure duty_periods exist
-                and all(
-                    duty.check_in_local.time() >= earliest_check_in
-                    for duty in pairing_option.duty_periods
-                )
-            ]
+            self.cache.set(details_key, content, ttl=self.pairing_bidders_ttl)
 
-        # sorters = {
-        #     "rest": lambda pairing_option: statistics.mean(
-        #         [
-        #             rest_period["duration"].total_seconds()
-        #             for rest_period in pairing_option.rest_periods
-        #         ]
-        #     ),
-        #     "block": lambda pairing_option: statistics.mean(
-        #         [
-        #             duty_period.block.total_seconds()
-        #             for duty_period in pairing_option.duty_periods
-        #         ]
-        #     ),
-        #     "total_on_days": lambda pairing_option: pairing_option.total_on_days,
-        # }
-
-        match sort_by:
-            case "rest":
-                sort_by = lambda pairing_option: statistics.mean(
-                    [
-                        rest_period["duration"].total_seconds()
-                        for rest_period in pairing_option.rest_periods
-                    ]
+        if duty_periods is not None:
+            details = json.loads(content)
+
+            return self._completed_future(
+                duty_periods
+                if query.matches_bidders(details["pairingRequestCrewByRoleDtos"])
+                and query.matches_check_ins(
+                    [duty.check_in_local.time() for duty in duty_periods]
                 )
-            case "block":
-                sort_by = lambda pairing_option: statistics.mean(
-                    [
-                        duty_period.block.total_seconds()
-                        for duty_period in pairing_option.duty_periods
-                    ]
+                else None
+            )
+
+        # Parsing may happen in a worker process while the next details are fetched.
+        # Detail predicates are checked before duty periods are parsed.
+        future = self.parsing_pool.submit(parse_pairing_details, content, query)
+
+        def cache_duty_periods(future: Future) -> None:
+            if future.exception() is None and future.result() is not None:
+                self.cache.set(
+                    duty_periods_key, future.result(), ttl=self.pairing_details_ttl
                 )
-            case "total_on_days":
-                sort_by = "total_on_days"
 
-        pairing_options.sort(
-            key=sort_by,
-            reverse=True,
+        future.add_done_callback(cache_duty_periods)
+
+        return future
+
+    def invalidate_pairing_details(self, pairing_id: Optional[int] = None) -> None:
+        """
+        Remove cached pairing details.
+
+        :param pairing_id: The pairing whose details should be removed.
+                           If not set, the details of all pairings are removed.
+        """
+
+        if pairing_id is None:
+            self.cache.clear(f"pairing:{self.user_id}:")
+        else:
+            self.cache.clear(f"pairing:{self.user_id}:{pairing_id}:")
+
+    def _pairing_cache_key(self, pairing_id: int, section: str) -> str:
+        return f"pairing:{self.user_id}:{pairing_id}:{section}"
+
+    @staticmethod
+    def _completed_future(result) -> Future:
+        future = Future()
+        future.set_result(result)
+
+        return future
+
+    @staticmethod
+    def _resolve_pairing_details(
+        pairing_option: Pairing,
+        duty_periods: Future,
+        on_details: Optional[Callable[[Pairing], None]] = None,
+    ) -> Iterator[Pairing]:
+        pairing_option.duty_periods = duty_periods.result()
+
+        if on_details is not None:
+            on_details(pairing_option)
+
+        if pairing_option.duty_periods is not None:
+            yield pairing_option
+
+    def _fetch_flight_schedule_day(self, day: date) -> bytes:
+        content = self.client.request(
+            "get",
+            f"/api/crews/{self.user_id}/flight-schedule",
+            params={
+                "from": day.isoformat(),
+                "to": (day + timedelta(days=1)).isoformat(),  # 'to' is exclusive
+                "zoneOffset": "Z",
+            },
+        ).content
+
+        self.cache.set(
+            self._flight_schedule_cache_key(day),
+            content,
+            ttl=self._flight_schedule_ttl(day),
         )
 
-        return pairing_options
+        return content
+
+    def stream_flight_schedule_day(self, day: date) -> Iterator[dict]:
+        """
+        Stream the raw sectors of a day's flight schedule, one aircraft at a time,
+        bypassing the cache.
+        """
+
+        response = self.client.request(
+            "get",
+            f"/api/crews/{self.user_id}/flight-schedule",
+            params={
+                "from": day.isoformat(),
+                "to": (day + timedelta(days=1)).isoformat(),  # 'to' is exclusive
+                "zoneOffset": "Z",
+            },
+            stream=True,
+        )
+
+        with response:
+            yield from self._iter_flight_schedule_sectors(
+                response.iter_content(chunk_size=64 * 1024)
+            )
+
+    @staticmethod
+    def _iter_flight_schedule_sectors(chunks: Iterable[bytes]) -> Iterator[dict]:
+        for aircraft in iter_array_items(chunks, "companyAircraftDtoList"):
+            yield from aircraft["sectors"]
+
+    def _fetch_airport(self, iata_code: str) -> Airport:
+        airport = Airport.from_dict(
+            self.client.request("get", f"/api/airports/{iata_code}").json()
+        )
+
+        self.cache.set(
+            self._airport_cache_key(iata_code), airport, ttl=self.airport_ttl
+        )
+        self._airports[iata_code] = airport
+
+        return airport
+
+    @staticmethod
+    def _airport_cache_key(iata_code: str) -> str:
+        return f"airport:{iata_code}"
+
+    def _flight_schedule_cache_key(self, day: date) -> str:
+        return f"flight-schedule:{self.user_id}:{day.isoformat()}"
+
+    def _flight_schedule_ttl(self, day: date) -> Optional[float]:
+        today = datetime.now(UTC).date()
+
+        if day < today - self.flight_schedule_settled_after:
+            return None
+
+        if today <= day <= today + timedelta(days=1):
+            return self.flight_schedule_live_ttl
+
+        return self.flight_schedule_ttl
 
     def _setup_client(self, host):
         if self.token_manager:
@@ -337,24 +834,28 @@ class Apm:
             okta_token_updater = lambda token: self.token_manager.set(
                 key="okta", value=token
             )
+            apm_token = self.token_manager.get("apm")
+            okta_token = self.token_manager.get("okta")
 
-            if (
-                self.token_manager.has("apm")
-                and self.token_manager.has("okta")
-                and self.token_manager.get("apm")
-                and self.token_manager.get("okta")
-            ):
+            if apm_token and okta_token:
                 self.client = ApmClient(
                     host,
-                    token=self.token_manager.get("apm"),
+                    token=apm_token,
                     token_updater=apm_token_updater,
+                    token_transaction=self.token_manager.transaction,
+                    token_reloader=self._reload_tokens,
                 )
                 self.client.setup_okta_client(
-                    token=self.token_manager.get("okta"),
+                    token=okta_token,
                     token_updater=okta_token_updater,
                 )
             else:
-                self.client = ApmClient(host, token_updater=apm_token_updater)
+                self.client = ApmClient(
+                    host,
+                    token_updater=apm_token_updater,
+                    token_transaction=self.token_manager.transaction,
+                    token_reloader=self._reload_tokens,
+                )
                 self.client.setup_okta_client(token_updater=okta_token_updater)
 
                 if not self.manual_auth:
@@ -366,6 +867,26 @@ class Apm:
             if not self.manual_auth:
                 self._authenticate_client()
 
+    def _reload_tokens(self) -> bool:
+        """
+        Adopt the tokens of the token manager if they were refreshed by another
+        client, e.g. in another process.
+
+        :return: Whether the tokens were adopted.
+        """
+
+        apm_token = self.token_manager.get("apm")
+        okta_token = self.token_manager.get("okta")
+
+        if not apm_token or not okta_token or apm_token == self.client.token:
+            return False
+
+        self.client.token = apm_token
+        self.client.okta_client.token = okta_token
+        self.client.okta_client.session.token = okta_token
+
+        return True
+
     def _authenticate_client(self):
         print("Please go here and authorize:")
         print(self.generate_auth_url())
@@ -381,7 +902,8 @@ class Apm:
 
     def authenticate_from_redirect(self, redirect: str) -> None:
         try:
-            self.client.okta_client.fetch_token_from_redirect(redirect)
-            self.client.fetch_token()
+            with self.client.token_transaction():
+                self.client.okta_client.fetch_token_from_redirect(redirect)
+                self.client.fetch_token()
         except (InvalidGrantError, MismatchingStateError):
             raise InvalidAuthRedirectException
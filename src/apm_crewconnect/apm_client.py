@@ -1,4 +1,6 @@
-from typing import Callable, Mapping, Optional, Union
+from contextlib import nullcontext
+from threading import Lock
+from typing import Callable, ContextManager, Mapping, Optional, Union
 from urllib.parse import urljoin
 import requests
 
@@ -12,9 +14,23 @@ class ApmClient:
         host: str,
         token=None,
         token_updater: Optional[Callable[[dict], None]] = None,
+        token_transaction: Optional[Callable[[], ContextManager]] = None,
+        token_reloader: Optional[Callable[[], bool]] = None,
     ) -> None:
+        """
+        :param token_updater: Called with each new token.
+        :param token_transaction: Called for a context grouping the token updates
+                                  of a refresh.
+        :param token_reloader: Called at the start of a refresh, to adopt tokens
+                               refreshed elsewhere. Returns whether it did so,
+                               in which case no refresh is made.
+        """
+
         self.host = host
         self.token_updater = token_updater
+        self.token_transaction = token_transaction or nullcontext
+        self.token_reloader = token_reloader
+        self._refresh_lock = Lock()
         self.token = token or {}
 
     @property
@@ -69,9 +85,13 @@ class ApmClient:
         if not self.okta_client:
             raise ApmClientException("An Okta Client must be provided to proceed")
 
-        self.okta_client.refresh_token()
+        with self.token_transaction():
+            if self.token_reloader is not None and self.token_reloader():
+                return self.token
+
+            self.okta_client.refresh_token()
 
-        return self.fetch_token()
+            return self.fetch_token()
 
     def request(self, method: str, path: str, **kwargs) -> requests.Response:
         """
@@ -80,20 +100,42 @@ class ApmClient:
         We don't use the built-in token refresh mechanism of OAuth2 session because
         we want to allow overriding the token refresh logic.
         """
+        access_token = self.access_token
         response = requests.request(
             method,
             self.build_url(path),
-            headers={"Authorization": f"Bearer {self.access_token}"},
+            headers={"Authorization": f"Bearer {access_token}"},
             **kwargs,
         )
 
-        if response.status_code in (401, 403) and not self.authorized:
-            print("APM token expired. Refreshing.")
-            self.refresh_token()
+        if response.status_code in (401, 403) and self._refresh_expired_token(
+            access_token
+        ):
             return self.request(method, path, **kwargs)
 
         return response
 
+    def _refresh_expired_token(self, access_token: str) -> bool:
+        """
+        Refresh the token a request was rejected with, once for all the threads
+        sharing this client.
+
+        :return: Whether the request should be retried with a new token.
+        """
+
+        with self._refresh_lock:
+            # Another thread refreshed the token while this one was waiting
+            if self.access_token != access_token:
+                return True
+
+            if self.authorized:
+                return False
+
+            print("APM token expired. Refreshing.")
+            self.refresh_token()
+
+            return True
+
     def introspect(self) -> dict:
         return requests.get(
             self.build_url("/api/token/introspect"),
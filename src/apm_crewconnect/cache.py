@@ -0,0 +1,107 @@
+import os
+import pickle
+import sqlite3
+from threading import Lock
+import time
+from typing import Any, Optional
+
+from .interfaces.cache_interface import CacheInterface
+
+
+class MemoryCache(CacheInterface):
+    def __init__(self) -> None:
+        self._items: dict[str, tuple[Any, Optional[float]]] = {}
+        self._lock = Lock()
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._items[key] = (value, expires_at)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._items.get(key)
+
+            if item is None:
+                return None
+
+            value, expires_at = item
+
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+
+            return value
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [key for key in self._items if key.startswith(prefix)]:
+                del self._items[key]
+
+
+class SqliteCache(CacheInterface):
+    """
+    A persistent cache, storing pickled values in a SQLite database.
+
+    It may be shared by several threads, and by several processes.
+    """
+
+    def __init__(self, path: str = ".storage/cache.sqlite") -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self._lock = Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires_at),
+            )
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+
+        return pickle.loads(row[0]) if row is not None else None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM cache WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+
+    def purge(self) -> None:
+        """Remove expired values from the database."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+            )
+
+    def close(self) -> None:
+        self._connection.close()
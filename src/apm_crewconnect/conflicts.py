@@ -0,0 +1,68 @@
+"""
+Conflicts between pairing options and a crew member's roster.
+
+The blocking activities of a roster, extended by their required rest, are
+merged into sorted, disjoint intervals, so that checking whether a pairing
+overlaps any of them is a binary search.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+
+from .models.activity import (
+    Activity,
+    BlankFlightActivity,
+    DeadheadActivity,
+    FlightActivity,
+    GroundActivity,
+    OffActivity,
+)
+from .models.roster import Roster
+
+
+def is_blocking(activity: Activity) -> bool:
+    """Determine if an activity prevents flying a pairing at the same time."""
+
+    if isinstance(activity, OffActivity):
+        return activity.is_requested
+
+    if isinstance(activity, BlankFlightActivity):
+        return False
+
+    return isinstance(activity, (FlightActivity, DeadheadActivity, GroundActivity))
+
+
+class RosterConflicts:
+    def __init__(self, roster: Roster) -> None:
+        intervals = sorted(
+            (
+                (
+                    activity.pre_rest_start or activity.check_in or activity.start
+                ).timestamp(),
+                (
+                    activity.post_rest_end or activity.check_out or activity.end
+                ).timestamp(),
+            )
+            for activity in roster.activities
+            if is_blocking(activity)
+        )
+        self._starts: list[float] = []
+        self._ends: list[float] = []
+
+        for start, end in intervals:
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Determine if the time between start and end overlaps a blocking activity."""
+
+        # The first interval ending after start is the only one which may overlap
+        index = bisect_right(self._ends, start.timestamp())
+
+        return index < len(self._starts) and self._starts[index] < end.timestamp()
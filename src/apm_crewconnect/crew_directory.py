@@ -0,0 +1,231 @@
+"""
+A directory of the crew members met in rosters and flight schedules.
+
+The same crew members appear on dozens of sectors and activities, each one
+built with its own copy of a photo thumbnail. The directory shares a single
+CrewMember per person and role, and stores each distinct thumbnail once, under
+its SHA-256 digest: in memory, or spilled to a directory on disk and only read
+back when accessed.
+"""
+
+from dataclasses import fields
+import hashlib
+import os
+import tempfile
+from threading import Lock
+from typing import Iterable, Optional
+
+from .models.crew_member import CrewMember
+from .models.flight import Flight, LazyFlight
+from .models.roster import Roster
+
+
+class ThumbnailStore:
+    """
+    Photo thumbnails, stored once each and addressed by their SHA-256 digest.
+
+    It may be shared by several threads.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        :param path: A directory to which thumbnails are spilled, one file per
+                     digest. If not set, thumbnails are kept in memory.
+        """
+
+        self.path = path
+        self._thumbnails: dict[str, Optional[str]] = {}
+        self._lock = Lock()
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+            # Thumbnails spilled by a previous directory are known, but not loaded
+            self._thumbnails = {
+                name: None for name in os.listdir(path) if not name.endswith(".tmp")
+            }
+
+    def __len__(self) -> int:
+        return len(self._thumbnails)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._thumbnails
+
+    def add(self, thumbnail: str) -> str:
+        """
+        Store a thumbnail, unless it is already stored.
+
+        :return: The digest of the thumbnail.
+        """
+
+        digest = hashlib.sha256(thumbnail.encode()).hexdigest()
+
+        with self._lock:
+            if digest in self._thumbnails:
+                return digest
+
+            if self.path is None:
+                self._thumbnails[digest] = thumbnail
+            else:
+                self._write(digest, thumbnail)
+                self._thumbnails[digest] = None
+
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Get a thumbnail by its digest, reading it from disk if it was spilled."""
+
+        thumbnail = self._thumbnails[digest]
+
+        if thumbnail is not None:
+            return thumbnail
+
+        with open(os.path.join(self.path, digest), encoding="utf-8") as file:
+            return file.read()
+
+    def _write(self, digest: str, thumbnail: str) -> None:
+        # Written to a temporary file first, so that no partial file is ever read
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            file.write(thumbnail)
+
+        os.replace(temporary_path, os.path.join(self.path, digest))
+
+
+class DirectoryCrewMember(CrewMember):
+    """
+    A CrewMember of a directory, holding the digest of its photo thumbnail
+    rather than the thumbnail itself.
+    """
+
+    def __init__(self, member: CrewMember, thumbnails: ThumbnailStore) -> None:
+        for field in fields(CrewMember):
+            if field.name != "photo_thumbnail":
+                setattr(self, field.name, getattr(member, field.name))
+
+        self.photo_thumbnail_digest = thumbnails.add(member.photo_thumbnail)
+        self._thumbnails = thumbnails
+
+    @property
+    def photo_thumbnail(self) -> str:
+        return self._thumbnails.get(self.photo_thumbnail_digest)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CrewMember):
+            return NotImplemented
+
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in fields(CrewMember)
+        )
+
+    def __reduce__(self):
+        # Pickled as a plain CrewMember, without the thumbnail store
+        return (
+            CrewMember,
+            tuple(getattr(self, field.name) for field in fields(CrewMember)),
+        )
+
+
+# Fields identifying a crew member in a given role, on a given sector
+_IDENTITY_FIELDS = [
+    field.name for field in fields(CrewMember) if field.name != "photo_thumbnail"
+]
+
+
+class CrewDirectory:
+    """
+    Crew members keyed by crew code, or by name for those without one.
+
+    Members differing only by their photo thumbnail are shared. Members whose
+    role, phone or dead heading differ between sectors are kept once per variant.
+    """
+
+    def __init__(self, thumbnails: Optional[ThumbnailStore] = None) -> None:
+        """
+        :param thumbnails: The store of photo thumbnails. Defaults to an in-memory
+                           store.
+        """
+
+        self.thumbnails = thumbnails if thumbnails is not None else ThumbnailStore()
+        self._members: dict[tuple, DirectoryCrewMember] = {}
+        self._people: dict[str | tuple[str, str], DirectoryCrewMember] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._people)
+
+    def __contains__(self, key: str | tuple[str, str]) -> bool:
+        return key in self._people
+
+    def get(self, key: str | tuple[str, str]) -> Optional[CrewMember]:
+        """
+        Get the first member added for a person.
+
+        :param key: The crew code, or a (first name, last name) tuple for crew
+                    members without one.
+        """
+
+        return self._people.get(key)
+
+    @property
+    def members(self) -> list[CrewMember]:
+        return list(self._people.values())
+
+    def add(self, member: CrewMember) -> CrewMember:
+        """Get the directory's member equal to a crew member, adding it if new."""
+
+        # Members of a directory sharing this thumbnail store are already shared
+        if getattr(member, "_thumbnails", None) is self.thumbnails:
+            return member
+
+        identity = tuple(getattr(member, name) for name in _IDENTITY_FIELDS) + (
+            self.thumbnails.add(member.photo_thumbnail),
+        )
+
+        with self._lock:
+            shared = self._members.get(identity)
+
+            if shared is None:
+                shared = DirectoryCrewMember(member, self.thumbnails)
+                self._members[identity] = shared
+                self._people.setdefault(self.key(member), shared)
+
+        return shared
+
+    def add_all(self, members: Iterable[CrewMember]) -> list[CrewMember]:
+        return [self.add(member) for member in members]
+
+    def add_flight(self, flight: Flight) -> Flight:
+        """
+        Replace the crew members of a flight with the directory's.
+
+        Lazy flights are left as they are: their crew members are only decoded
+        from the raw sector they retain when accessed.
+        """
+
+        if not isinstance(flight, LazyFlight):
+            flight.crew_members = self.add_all(flight.crew_members)
+
+        return flight
+
+    def add_flights(self, flights: Iterable[Flight]) -> list[Flight]:
+        return [self.add_flight(flight) for flight in flights]
+
+    def add_roster(self, roster: Roster) -> Roster:
+        """Replace the crew members of a roster's activities with the directory's."""
+
+        for activity in roster.activities:
+            activity.crew_members = self.add_all(activity.crew_members)
+
+        return roster
+
+    @staticmethod
+    def key(member: CrewMember) -> str | tuple[str, str]:
+        """Get the key of a crew member: its crew code, or its name."""
+
+        if member.crew_code:
+            return member.crew_code
+
+        return (member.first_name, member.last_name)
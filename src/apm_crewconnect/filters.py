@@ -0,0 +1,113 @@
+"""
+Predicates evaluated against raw API payloads.
+
+Filtering raw dicts before any model is built means discarded rows cost
+a few dictionary lookups rather than a full parse.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+
+from .models.activity import Activity
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+
+def normalize_registration(registration: str) -> str:
+    return registration.replace("-", "").upper()
+
+
+def sector_filter(
+    registrations: Iterable[str] = (),
+    aircraft_types: Iterable[str] = (),
+    flight_numbers: Iterable[str] = (),
+    airports: Iterable[str] = (),
+    departs_after: Optional[datetime] = None,
+    departs_before: Optional[datetime] = None,
+) -> Optional[Predicate]:
+    """
+    Build a predicate over raw flight-schedule sectors.
+
+    :param registrations: Aircraft registrations to keep, with or without dash.
+    :param aircraft_types: Aircraft types (e.g. "73H") to keep.
+    :param flight_numbers: Flight numbers to keep, with or without airline designator.
+    :param airports: IATA or ICAO codes of which either the departure or the
+                     arrival airport must be part.
+    :param departs_after: Keep only sectors departing at or after this time.
+    :param departs_before: Keep only sectors departing before this time.
+    :return: The predicate, or None when no filter is set.
+    """
+
+    checks: list[Predicate] = []
+
+    if registrations := {normalize_registration(r) for r in registrations}:
+        checks.append(
+            lambda data: normalize_registration(data["aircraftRegistration"])
+            in registrations
+        )
+
+    if aircraft_types := set(aircraft_types):
+        checks.append(
+            lambda data: data["aircraftType"] in aircraft_types
+            or data["aircraftCode"] in aircraft_types
+        )
+
+    if flight_numbers := set(flight_numbers):
+        checks.append(
+            lambda data: data["flightNumber"] in flight_numbers
+            or data["commercialFlightNumber"] in flight_numbers
+        )
+
+    if airports := set(airports):
+        checks.append(
+            lambda data: not airports.isdisjoint(
+                (
+                    data["departureAirportCommercialCode"],
+                    data["arrivalAirportCommercialCode"],
+                    data["icaoDepartureAirport"],
+                    data["icaoArrivalAirport"],
+                )
+            )
+        )
+
+    if departs_after is not None:
+        checks.append(
+            lambda data: datetime.fromisoformat(data["departureTime"]) >= departs_after
+        )
+
+    if departs_before is not None:
+        checks.append(
+            lambda data: datetime.fromisoformat(data["departureTime"]) < departs_before
+        )
+
+    return _all_of(checks)
+
+
+def activity_filter(
+    activity_types: Iterable[type[Activity]] = (),
+) -> Optional[Predicate]:
+    """
+    Build a predicate over raw roster activities.
+
+    :param activity_types: Activity classes to keep. Subclasses are kept too.
+    :return: The predicate, or None when no filter is set.
+    """
+
+    checks: list[Predicate] = []
+
+    if activity_types := tuple(activity_types):
+        checks.append(
+            lambda data: issubclass(Activity.class_for_data(data), activity_types)
+        )
+
+    return _all_of(checks)
+
+
+def _all_of(checks: list[Predicate]) -> Optional[Predicate]:
+    if not checks:
+        return None
+
+    if len(checks) == 1:
+        return checks[0]
+
+    return lambda data: all(check(data) for check in checks)
@@ -1 +1,2 @@
 from .token_manager_interface import TokenManagerInterface
+from .cache_interface import CacheInterface
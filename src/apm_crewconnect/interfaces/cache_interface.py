@@ -0,0 +1,32 @@
+"""An interface for caches."""
+
+from abc import ABCMeta, abstractmethod
+from typing import Any, Optional
+
+
+class CacheInterface(metaclass=ABCMeta):
+    """An interface for caches."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, optionally expiring after ttl seconds."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Get a value, or None if it is missing or expired."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self, prefix: str = "") -> None:
+        """Remove all values whose key starts with a prefix."""
+        raise NotImplementedError
+
+    def has(self, key: str) -> bool:
+        """Determine if a given key exists."""
+        return self.get(key) != None
@@ -1,7 +1,8 @@
 """An interface for token managers."""
 
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from contextlib import nullcontext
+from typing import ContextManager, Optional
 
 
 class TokenManagerInterface(metaclass=ABCMeta):
@@ -20,3 +21,7 @@ class TokenManagerInterface(metaclass=ABCMeta):
     def has(self, key: str) -> bool:
         """Determine if a given key exists."""
         return self.get(key) != None
+
+    def transaction(self) -> ContextManager:
+        """Group the token updates made within a context into a single write."""
+        return nullcontext()
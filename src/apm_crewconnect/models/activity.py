@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
 
@@ -20,6 +20,9 @@ class Activity:
     pre_rest_start: Optional[datetime]
     post_rest_end: Optional[datetime]
     crew_members: list[CrewMember]
+    # Whether the ID was derived from the activity, for lack of one in the roster:
+    # such IDs vary between processes
+    has_generated_id: bool = field(default=False, compare=False, repr=False)
 
     @property
     def title(self) -> str:
@@ -30,6 +33,7 @@ class Activity:
         if force_base:
             return Activity(
                 id=data.get("opsLegCrewId", cls.id_for_data(data)),
+                has_generated_id="opsLegCrewId" not in data,
                 pairing_id=data.get("crewPairingId"),
                 is_pending=data["pendingRequest"],
                 details=data["details"],
@@ -62,48 +66,59 @@ class Activity:
                 ],
             )
 
+        activity_class = cls.class_for_data(data)
+
+        if activity_class is Activity:
+            return Activity.from_roster(data, force_base=True)
+
+        return activity_class.from_roster(data)
+
+    @staticmethod
+    def class_for_data(data: dict[str, Any]) -> type["Activity"]:
+        """Determine which Activity class a roster entry maps to, without parsing it."""
+
         if data["activityType"] == "F":
             if "flightNumber" not in data:
-                return Activity.from_roster(data, force_base=True)
+                return Activity
 
-            return FlightActivity.from_roster(data)
+            return FlightActivity
 
         if data["activityType"] == "S":
-            return ShuttleActivity.from_roster(data)
+            return ShuttleActivity
 
         if data["activityType"] == "T":
-            return TrainActivity.from_roster(data)
+            return TrainActivity
 
         if data["activityType"] == "O":
-            return DeadheadActivity.from_roster(data)
+            return DeadheadActivity
 
         if data["activityType"] == "H":
-            return HotelActivity.from_roster(data)
+            return HotelActivity
 
         if data["activityType"] == "G":
             if data["groundType"] == "G":
-                return GroundActivity.from_roster(data)
+                return GroundActivity
 
             if data["groundType"] == "S":
-                return SimulatorActivity.from_roster(data)
+                return SimulatorActivity
 
             if data["groundType"] == "O":
                 if data["groundCode"] == "OFFHS":
-                    return AbsentActivity.from_roster(data)
+                    return AbsentActivity
 
-                return OffActivity.from_roster(data)
+                return OffActivity
 
             if data["groundType"] == "N":
                 if data["groundCode"] == "UNFIT":
-                    return UnfitActivity.from_roster(data)
+                    return UnfitActivity
 
-                return BlankFlightActivity.from_roster(data)
+                return BlankFlightActivity
 
             if data["groundType"] == "V":
-                return VacationActivity.from_roster(data)
+                return VacationActivity
 
             if data["groundType"] == "A":
-                return AbsentActivity.from_roster(data)
+                return AbsentActivity
 
         raise UnhandledActivityTypeException(data)
 
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from datetime import timedelta, timezone
+from typing import Any, Optional
+
+import humps
+
+
+@dataclass
+class Airport:
+    iata_code: str
+    icao_code: Optional[str] = None
+    name: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    timezone: Optional[timezone] = None
+    terminals: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Airport":
+        """Build an Airport from an /api/airports/{IATA} response."""
+
+        data = humps.decamelize(data)
+
+        return cls(
+            iata_code=data.get("iata_code") or data["commercial_code"],
+            icao_code=data.get("icao_code"),
+            name=data.get("name"),
+            city=data.get("city_name", data.get("city")),
+            country=data.get("country_name", data.get("country")),
+            timezone=(
+                cls._timezone_from_offset(data["time_zone"])
+                if data.get("time_zone")
+                else None
+            ),
+            terminals=[
+                terminal["code"] if isinstance(terminal, dict) else terminal
+                for terminal in data.get("terminals") or []
+            ],
+        )
+
+    @staticmethod
+    def _timezone_from_offset(offset: str) -> timezone:
+        # Offsets are formatted as +HHMM, or +HH:MM
+        digits = offset.replace(":", "")
+        sign = -1 if digits.startswith("-") else 1
+
+        return timezone(
+            sign * timedelta(hours=int(digits[1:3]), minutes=int(digits[3:5] or 0))
+        )
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from functools import cached_property
 from typing import List, Optional
 import humps
 
@@ -134,3 +135,7 @@ class DutyPeriod:
                 for item in data["duty_period_components"]
             ],
         )
+
+    @cached_property
+    def stopover(self) -> str:
+        return self.components[-1].component_airport[-3:]
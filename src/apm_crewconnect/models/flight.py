@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, fields
 from datetime import datetime
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 
 import humps
@@ -54,41 +55,18 @@ class Flight:
     atc_flight_number: Optional[str] = None
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Flight":
-        data = humps.decamelize(data)
+    def from_dict(cls, data: Dict[str, Any], lazy: bool = False) -> "Flight":
+        """
+        Build a Flight from a raw flight-schedule sector.
 
-        passenger_info = PassengerInfo(**data["passenger_info_dto"])
-        freight_info = FreightInfo(**data["freight_info_dto"])
-        flight_times = FlightTimes(
-            departure_estimated=data["flight_times"]["departure_estimated"],
-            arrival_estimated=data["flight_times"]["arrival_estimated"],
-            block_out=(
-                datetime.fromisoformat(data["flight_times"]["out"])
-                if "out" in data["flight_times"]
-                else None
-            ),
-            block_off=(
-                datetime.fromisoformat(data["flight_times"]["off"])
-                if "off" in data["flight_times"]
-                else None
-            ),
-            block_on=(
-                datetime.fromisoformat(data["flight_times"]["on"])
-                if "on" in data["flight_times"]
-                else None
-            ),
-            block_in=(
-                datetime.fromisoformat(data["flight_times"]["in"])
-                if "in" in data["flight_times"]
-                else None
-            ),
-        )
-        delays = [Delay(**delay) for delay in data["delays"]]
-        crew_members = [
-            CrewMember(**member)
-            for member in data["crew_members"]
-            if "first_name" in member and "last_name" in member
-        ]
+        :param data: The raw sector, as returned by the API.
+        :param lazy: Whether nested objects and times should only be decoded
+                     from the raw data when first accessed.
+        """
+        if lazy:
+            return LazyFlight(data)
+
+        data = humps.decamelize(data)
 
         return cls(
             leg_id=data["leg_id"],
@@ -118,14 +96,14 @@ class Flight:
             pax_type=data.get("pax_type", None),
             number_of_passengers=data["number_of_passengers"],
             number_of_infants=data["number_of_infants"],
-            passenger_info=passenger_info,
-            freight_info=freight_info,
-            flight_times=flight_times,
+            passenger_info=PassengerInfo(**data["passenger_info_dto"]),
+            freight_info=FreightInfo(**data["freight_info_dto"]),
+            flight_times=cls._flight_times_from_dict(data["flight_times"]),
             departure_color=data["departure_color"],
             arrival_color=data["arrival_color"],
-            delays=delays,
+            delays=[Delay(**delay) for delay in data["delays"]],
             block_time=data["block_time"],
-            crew_members=crew_members,
+            crew_members=cls._crew_members_from_list(data["crew_members"]),
             icao_departure_airport=data["icao_departure_airport"],
             icao_arrival_airport=data["icao_arrival_airport"],
             departure_hatched=data["departure_hatched"],
@@ -135,6 +113,25 @@ class Flight:
             _links=data["_links"],
         )
 
+    @staticmethod
+    def _flight_times_from_dict(data: Dict[str, Any]) -> FlightTimes:
+        return FlightTimes(
+            departure_estimated=data["departure_estimated"],
+            arrival_estimated=data["arrival_estimated"],
+            block_out=datetime.fromisoformat(data["out"]) if "out" in data else None,
+            block_off=datetime.fromisoformat(data["off"]) if "off" in data else None,
+            block_on=datetime.fromisoformat(data["on"]) if "on" in data else None,
+            block_in=datetime.fromisoformat(data["in"]) if "in" in data else None,
+        )
+
+    @staticmethod
+    def _crew_members_from_list(data: List[Dict[str, Any]]) -> List[CrewMember]:
+        return [
+            CrewMember(**member)
+            for member in data
+            if "first_name" in member and "last_name" in member
+        ]
+
     def is_missing_crew_members(self, role: str | None = None) -> bool:
         required_crew_members = self.required_crew_members()
 
@@ -183,3 +180,98 @@ class Flight:
                 raise UnhandledAircraftTypeException(
                     f"Unhandled aircraft type: {self.aircraft_type}"
                 )
+
+
+# Fields of a LazyFlight which are only decoded from the raw data on first access
+LAZY_FIELDS = {
+    "departure_time",
+    "arrival_time",
+    "scheduled_departure_time",
+    "scheduled_arrival_time",
+    "passenger_info",
+    "freight_info",
+    "flight_times",
+    "delays",
+    "crew_members",
+    "_links",
+}
+
+
+class LazyFlight(Flight):
+    """
+    A Flight retaining its raw sector, from which nested objects and times
+    are decoded on first access and then cached.
+    """
+
+    # Names, raw keys and defaults of the fields which are decoded eagerly
+    _eager_fields = [
+        (field.name, humps.camelize(field.name), field.default)
+        for field in fields(Flight)
+        if field.name not in LAZY_FIELDS
+    ]
+
+    def __new__(cls, data: Optional[Dict[str, Any]] = None, **changes) -> Flight:
+        # dataclasses.replace passes every field to the constructor, and gets a
+        # plain Flight, as there is no raw data left to decode
+        if changes:
+            return Flight(**changes)
+
+        return super().__new__(cls)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+        for name, key, default in self._eager_fields:
+            if default is MISSING:
+                setattr(self, name, data[key])
+            else:
+                setattr(self, name, data.get(key, default))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Flight):
+            return NotImplemented
+
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in fields(Flight)
+        )
+
+    @cached_property
+    def departure_time(self) -> datetime:
+        return datetime.fromisoformat(self._data["departureTime"])
+
+    @cached_property
+    def arrival_time(self) -> datetime:
+        return datetime.fromisoformat(self._data["arrivalTime"])
+
+    @cached_property
+    def scheduled_departure_time(self) -> datetime:
+        return datetime.fromisoformat(self._data["scheduledDepartureTime"])
+
+    @cached_property
+    def scheduled_arrival_time(self) -> datetime:
+        return datetime.fromisoformat(self._data["scheduledArrivalTime"])
+
+    @cached_property
+    def passenger_info(self) -> PassengerInfo:
+        return PassengerInfo(**humps.decamelize(self._data["passengerInfoDto"]))
+
+    @cached_property
+    def freight_info(self) -> FreightInfo:
+        return FreightInfo(**humps.decamelize(self._data["freightInfoDto"]))
+
+    @cached_property
+    def flight_times(self) -> FlightTimes:
+        return self._flight_times_from_dict(humps.decamelize(self._data["flightTimes"]))
+
+    @cached_property
+    def delays(self) -> List[Delay]:
+        return [Delay(**delay) for delay in humps.decamelize(self._data["delays"])]
+
+    @cached_property
+    def crew_members(self) -> List[CrewMember]:
+        return self._crew_members_from_list(humps.decamelize(self._data["crewMembers"]))
+
+    @cached_property
+    def _links(self) -> Dict[str, Dict[str, str]]:
+        return humps.decamelize(self._data["_links"])
@@ -1,12 +1,15 @@
 from dataclasses import dataclass
 import dataclasses
-from datetime import date, datetime
-from functools import reduce
-import operator
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from typing import Any, List, Optional
 import humps
 
 from .duty_period import DutyPeriod
+from .rest_period import RestPeriod
+
+# Properties derived from the duty periods, cached until they are reassigned
+DERIVED_PROPERTIES = ("rest_periods", "total_block", "report_times")
 
 
 @dataclass
@@ -70,27 +73,34 @@ class Pairing:
             total_rest_days_local=data["number_of_rest_days_local"],
         )
 
-    @property
-    def rest_periods(self) -> Optional[list[dict]]:
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        if name == "duty_periods":
+            for derived_property in DERIVED_PROPERTIES:
+                self.__dict__.pop(derived_property, None)
+
+    @cached_property
+    def rest_periods(self) -> Optional[list[RestPeriod]]:
         if self.duty_periods is None:
             return None
 
         return [
-            {
-                "stopover": duty.components[-1].component_airport[-3:],
-                "duration": next_duty.check_in - duty.check_out,
-            }
+            RestPeriod(
+                stopover=duty.stopover,
+                duration=next_duty.check_in - duty.check_out,
+            )
             for duty, next_duty in zip(self.duty_periods, self.duty_periods[1:])
         ]
 
-    @property
-    def total_block(self) -> Optional[list[dict]]:
+    @cached_property
+    def total_block(self) -> Optional[timedelta]:
         if not self.duty_periods:
             return None
 
-        return reduce(operator.add, (duty.block for duty in self.duty_periods))
+        return sum((duty.block for duty in self.duty_periods), timedelta())
 
-    @property
+    @cached_property
     def report_times(self) -> Optional[list[dict]]:
         if self.duty_periods is None:
             return None
@@ -102,7 +112,11 @@ class Pairing:
 
     def to_dict(self):
         return dataclasses.asdict(self) | {
-            "rest_periods": self.rest_periods,
+            "rest_periods": (
+                [dataclasses.asdict(rest_period) for rest_period in self.rest_periods]
+                if self.rest_periods is not None
+                else None
+            ),
             "report_times": self.report_times,
             "total_block": self.total_block,
         }
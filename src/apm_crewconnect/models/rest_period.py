@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+
+@dataclass(slots=True)
+class RestPeriod:
+    stopover: str
+    duration: timedelta
@@ -0,0 +1,135 @@
+"""
+Local index over fetched pairing options.
+
+Each indexed value maps to a bitmap, stored as an int, of the positions of the
+pairings having it. Compound queries are answered with bitwise operations on
+those bitmaps, without scanning the pairings.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+
+from .models.pairing import Pairing
+from .utils import DateRange, DateSet
+
+
+class PairingIndex:
+    def __init__(self, pairings: Iterable[Pairing]) -> None:
+        self.pairings = list(pairings)
+        self._all = (1 << len(self.pairings)) - 1
+        self._stopovers = defaultdict(int)
+        self._airports = defaultdict(int)
+        self._flight_numbers = defaultdict(int)
+        self._on_days = defaultdict(int)
+        self._dates = defaultdict(int)
+
+        for position, pairing in enumerate(self.pairings):
+            bit = 1 << position
+
+            for stopover in pairing.stopover_airports:
+                self._stopovers[stopover] |= bit
+
+            for airport in pairing.routing.split("-"):
+                self._airports[airport] |= bit
+
+            for flight_number in pairing.flight_numbers:
+                self._flight_numbers[flight_number] |= bit
+
+            self._on_days[pairing.total_on_days] |= bit
+
+            day = pairing.scheduled_departure_date
+
+            while day <= pairing.scheduled_arrival_date:
+                self._dates[day] |= bit
+                day += timedelta(days=1)
+
+    def __len__(self) -> int:
+        return len(self.pairings)
+
+    def query(
+        self,
+        airports: list[str] = [],
+        stopovers: list[str] = [],
+        flight_numbers: list[str] = [],
+        dates: Iterable[date | DateRange] = [],
+        total_on_days: Optional[int] = None,
+        minimum_on_days: int = 1,
+        excluded_airports: list[str] = [],
+        excluded_stopovers: list[str] = [],
+        excluded_flight_numbers: list[str] = [],
+        excluded_dates: Iterable[date | DateRange] = [],
+    ) -> list[Pairing]:
+        """
+        Get the indexed pairings matching all given criteria, in their original order.
+
+        :param airports: Only pairings through any of these airports.
+        :param stopovers: Only pairings stopping over at any of these airports.
+        :param flight_numbers: Only pairings including any of these flights.
+        :param dates: Only pairings overlapping any of these dates or date ranges.
+        :param total_on_days: Only pairings with exactly this number of on days.
+        :param minimum_on_days: Only pairings with at least this number of on days.
+        :param excluded_airports: No pairings through any of these airports.
+        :param excluded_stopovers: No pairings stopping over at any of these airports.
+        :param excluded_flight_numbers: No pairings including any of these flights.
+        :param excluded_dates: No pairings overlapping any of these dates or ranges.
+        """
+        bitmap = self._all
+
+        for index, values in (
+            (self._airports, airports),
+            (self._stopovers, stopovers),
+            (self._flight_numbers, flight_numbers),
+        ):
+            if values:
+                bitmap &= self._any_of(index, values)
+
+        if dates := DateSet(dates):
+            bitmap &= self._overlapping(dates)
+
+        if total_on_days is not None:
+            bitmap &= self._on_days.get(total_on_days, 0)
+
+        if minimum_on_days > 1:
+            bitmap &= self._any_of(
+                self._on_days,
+                [on_days for on_days in self._on_days if on_days >= minimum_on_days],
+            )
+
+        for index, values in (
+            (self._airports, excluded_airports),
+            (self._stopovers, excluded_stopovers),
+            (self._flight_numbers, excluded_flight_numbers),
+        ):
+            if values:
+                bitmap &= ~self._any_of(index, values)
+
+        if excluded_dates := DateSet(excluded_dates):
+            bitmap &= ~self._overlapping(excluded_dates)
+
+        return [self.pairings[position] for position in self._positions(bitmap)]
+
+    @staticmethod
+    def _any_of(index: dict, values: Iterable) -> int:
+        bitmap = 0
+
+        for value in values:
+            bitmap |= index.get(value, 0)
+
+        return bitmap
+
+    def _overlapping(self, date_set: DateSet) -> int:
+        # Only look up the smaller of the indexed dates and the queried dates
+        if len(date_set) < len(self._dates):
+            return self._any_of(self._dates, date_set)
+
+        return self._any_of(
+            self._dates, [day for day in self._dates if day in date_set]
+        )
+
+    @staticmethod
+    def _positions(bitmap: int) -> Iterator[int]:
+        while bitmap:
+            lowest_bit = bitmap & -bitmap
+            yield lowest_bit.bit_length() - 1
+            bitmap ^= lowest_bit
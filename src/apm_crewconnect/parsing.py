@@ -0,0 +1,135 @@
+"""
+Parsing of raw response bodies into models, optionally in worker processes.
+
+Parsing is CPU-bound, so it does not benefit from threads. Large bodies can
+instead be handed to a process pool: only the raw bytes are sent to the
+workers, and the resulting models are pickled back.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import json
+import multiprocessing
+from typing import Any, Callable, Iterable, Optional
+
+from .filters import sector_filter
+from .models.duty_period import DutyPeriod
+from .models.flight import Flight
+from .planner import PairingQuery
+
+
+class ParsingPool:
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        threshold: int = 256 * 1024,
+    ) -> None:
+        """
+        :param max_workers: The number of worker processes. Defaults to the number
+                            of CPUs. With 0, everything is parsed in-process.
+        :param threshold: The size in bytes below which a body is parsed in-process,
+                          as it would cost more to send it to a worker.
+        """
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParsingPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+
+    def submit(
+        self, parser: Callable[..., Any], content: bytes, *args, **kwargs
+    ) -> Future:
+        """Parse a body with a module-level parser function, returning a future."""
+
+        if self.max_workers == 0 or len(content) < self.threshold:
+            future = Future()
+
+            try:
+                future.set_result(parser(content, *args, **kwargs))
+            except Exception as exception:
+                future.set_exception(exception)
+
+            return future
+
+        if self._executor is None:
+            # Forking is unsafe once fetching threads are running
+            self._executor = ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return self._executor.submit(parser, content, *args, **kwargs)
+
+    def map(
+        self, parser: Callable[..., Any], contents: Iterable[bytes], *args, **kwargs
+    ) -> list:
+        """Parse several bodies with the same parser, preserving their order."""
+
+        futures = [
+            self.submit(parser, content, *args, **kwargs) for content in contents
+        ]
+
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def parse_flight_schedule(
+    content: bytes, filters: dict[str, Any] = {}, lazy: bool = False
+) -> list[Flight]:
+    """
+    Parse a flight-schedule response body.
+
+    :param content: The raw response body.
+    :param filters: Keyword arguments for filters.sector_filter.
+    :param lazy: Whether flights should be built lazily.
+    """
+
+    flight_schedule = json.loads(content)
+
+    return [
+        Flight.from_dict(sector, lazy=lazy)
+        for sector in filter(
+            sector_filter(**filters), flight_schedule_sectors(flight_schedule)
+        )
+    ]
+
+
+def flight_schedule_sectors(flight_schedule: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        sector
+        for aircraft_by_date in flight_schedule.get("_embedded", {}).get(
+            "companyAircraftByDateDtoList", []
+        )
+        for aircraft in aircraft_by_date["aircraftList"]["_embedded"][
+            "companyAircraftDtoList"
+        ]
+        for sector in aircraft["sectors"]
+    ]
+
+
+def parse_pairing_details(
+    content: bytes, query: Optional[PairingQuery] = None
+) -> Optional[list[DutyPeriod]]:
+    """
+    Parse the duty periods of a pairing-details response body.
+
+    :param content: The raw response body.
+    :param query: A query whose detail predicates the pairing must match.
+    :return: The duty periods, or None if the pairing doesn't match the query.
+    """
+
+    details = json.loads(content)
+
+    if query is not None and not query.matches_details(details):
+        return None
+
+    return [
+        DutyPeriod.from_dict(duty_period_dto)
+        for duty_period_dto in details["dutyPeriodRequestDtos"]
+    ]
@@ -0,0 +1,133 @@
+"""
+Planning of pairing option queries.
+
+Filters are split by where they can be evaluated, cheapest first:
+server-side query parameters, predicates on the pairing summaries returned by
+the search, and finally predicates needing each pairing's details. Anything
+which can be decided earlier avoids a details request.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, time
+from typing import Any, Iterable, Optional
+
+from .conflicts import RosterConflicts
+from .models.pairing import Pairing
+from .models.roster import Roster
+from .utils import DateRange, DateSet
+
+
+@dataclass
+class PairingQuery:
+    # Evaluated server-side
+    airports: list[str] = field(default_factory=list)
+    stopovers: list[str] = field(default_factory=list)
+    flight_numbers: list[str] = field(default_factory=list)
+    total_on_days: Optional[int] = None
+    consecutive_stopover_nights: Optional[int] = None
+
+    # Evaluated on summaries, then on details where needed
+    excluded_dates: Iterable[date | DateRange] = field(default_factory=list)
+    excluded_stopovers: list[str] = field(default_factory=list)
+    minimum_on_days: int = 1
+    earliest_check_in: Optional[time] = None
+    without_bidders: Optional[str] = None
+    roster: Optional[Roster] = field(default=None, repr=False)
+
+    _excluded_date_set: DateSet = field(init=False, repr=False)
+    _roster_conflicts: Optional[RosterConflicts] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._excluded_date_set = DateSet(self.excluded_dates)
+        self._roster_conflicts = (
+            RosterConflicts(self.roster) if self.roster is not None else None
+        )
+
+    @property
+    def server_params(self) -> dict[str, Any]:
+        params = {}
+
+        if len(self.airports) > 0:
+            params["airports"] = " ".join(self.airports)
+
+        if len(self.stopovers) > 0:
+            params["stopovers"] = " ".join(self.stopovers)
+
+        if len(self.flight_numbers) > 0:
+            params["flightNumbers"] = " ".join(self.flight_numbers)
+
+        if self.total_on_days is not None:
+            params["totalOverlappingDays"] = self.total_on_days
+
+        if self.consecutive_stopover_nights is not None:
+            params["consecutiveNightStopover"] = self.consecutive_stopover_nights
+
+        return params
+
+    @property
+    def is_unsatisfiable(self) -> bool:
+        """Whether the query contradicts itself, so nothing needs to be requested."""
+
+        return (
+            self.total_on_days is not None and self.total_on_days < self.minimum_on_days
+        )
+
+    def matches_summary(self, pairing: Pairing) -> bool:
+        """Check the predicates decidable from a pairing summary, cheapest first."""
+
+        if pairing.total_on_days < self.minimum_on_days:
+            return False
+
+        # The first duty period's check-in is the pairing's check-in
+        if (
+            self.earliest_check_in is not None
+            and pairing.check_in_local.time() < self.earliest_check_in
+        ):
+            return False
+
+        if self.excluded_stopovers and not set(self.excluded_stopovers).isdisjoint(
+            pairing.stopover_airports
+        ):
+            return False
+
+        if self._excluded_date_set.intersects(
+            pairing.scheduled_departure_date,
+            pairing.scheduled_arrival_date,
+        ):
+            return False
+
+        if self._roster_conflicts is not None and self._roster_conflicts.overlaps(
+            pairing.check_in, pairing.check_out
+        ):
+            return False
+
+        return True
+
+    def matches_details(self, details: dict[str, Any]) -> bool:
+        """
+        Check the predicates needing a pairing's details, on the raw response
+        so that rejected pairings never have their duty periods parsed.
+        """
+
+        return self.matches_bidders(
+            details["pairingRequestCrewByRoleDtos"]
+        ) and self.matches_check_ins(
+            [
+                time.fromisoformat(duty_period_dto["checkInLocal"])
+                for duty_period_dto in details["dutyPeriodRequestDtos"]
+            ]
+        )
+
+    def matches_bidders(self, crews_by_role: list[dict[str, Any]]) -> bool:
+        return self.without_bidders is None or all(
+            pairing_request_crews["roleCode"] != self.without_bidders
+            for pairing_request_crews in crews_by_role
+        )
+
+    def matches_check_ins(self, check_ins: list[time]) -> bool:
+        """Check the local check-in times of every duty period of a pairing."""
+
+        return self.earliest_check_in is None or (
+            len(check_ins) > 0
+            and all(check_in >= self.earliest_check_in for check_in in check_ins)
+        )
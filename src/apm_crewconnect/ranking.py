@@ -0,0 +1,170 @@
+"""
+Weighted multi-criteria ranking of pairing options.
+
+Features are extracted from all pairings once, into one array per feature, and
+scores are computed over these arrays at once. Requires numpy, which may be
+installed with the "ranking" extra. numpy is only imported once a ranker is
+created, as it is slow to import.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# numpy, once imported by _require_numpy
+np = None
+
+from .models.pairing import Pairing
+
+
+def _rest_hours(pairing: Pairing) -> list[float]:
+    return [
+        rest_period.duration.total_seconds() / 3600
+        for rest_period in pairing.rest_periods or []
+    ]
+
+
+def _mean_rest(pairing: Pairing) -> float:
+    rest_hours = _rest_hours(pairing)
+
+    return sum(rest_hours) / len(rest_hours) if rest_hours else 0.0
+
+
+def _min_rest(pairing: Pairing) -> float:
+    return min(_rest_hours(pairing), default=0.0)
+
+
+def _total_block(pairing: Pairing) -> float:
+    total_block = pairing.total_block
+
+    return total_block.total_seconds() / 3600 if total_block else 0.0
+
+
+def _on_days(pairing: Pairing) -> float:
+    return pairing.total_on_days
+
+
+def _earliest_check_in(pairing: Pairing) -> float:
+    # Local time of day, in hours, of the earliest check-in
+    return min(
+        (
+            duty_period.check_in_local.hour + duty_period.check_in_local.minute / 60
+            for duty_period in pairing.duty_periods or []
+        ),
+        default=0.0,
+    )
+
+
+def _stopover_nights(pairing: Pairing) -> float:
+    return len(pairing.rest_periods or [])
+
+
+FEATURES: dict[str, Callable[[Pairing], float]] = {
+    "mean_rest": _mean_rest,
+    "min_rest": _min_rest,
+    "total_block": _total_block,
+    "on_days": _on_days,
+    "earliest_check_in": _earliest_check_in,
+    "stopover_nights": _stopover_nights,
+}
+
+
+def pairing_features(
+    pairings: list[Pairing], names: Optional[list[str]] = None
+) -> dict[str, "np.ndarray"]:
+    """
+    Extract features of pairings, as one array per feature.
+
+    Durations and times of day are expressed in hours. Pairings without rest
+    periods have a rest of 0.
+    """
+    _require_numpy()
+
+    for name in names or []:
+        if name not in FEATURES:
+            raise ValueError(f"Unknown feature: {name}")
+
+    return {
+        name: np.fromiter(
+            (FEATURES[name](pairing) for pairing in pairings),
+            dtype=float,
+            count=len(pairings),
+        )
+        for name in (names if names is not None else FEATURES)
+    }
+
+
+@dataclass(frozen=True)
+class PairingRanker:
+    """
+    Ranks pairings by a weighted sum of their features, highest first.
+
+    Ties are broken by the tie breakers, in order, highest first, and then by
+    the original order of the pairings.
+    """
+
+    weights: dict[str, float]
+    tie_breakers: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        _require_numpy()
+
+        for name in [*self.weights, *self.tie_breakers]:
+            if name not in FEATURES:
+                raise ValueError(f"Unknown feature: {name}")
+
+    def scores(self, features: dict[str, "np.ndarray"], count: int) -> "np.ndarray":
+        scores = np.zeros(count)
+
+        for name, weight in self.weights.items():
+            scores += weight * features[name]
+
+        return scores
+
+    def rank(self, pairings: list[Pairing], limit: Optional[int] = None) -> list:
+        """
+        Sort pairings by descending score.
+
+        :param pairings: The pairings to rank, with their duty periods.
+        :param limit: Only return the best pairings, up to this number.
+        """
+        count = len(pairings)
+
+        if count == 0 or limit == 0:
+            return []
+
+        features = pairing_features(
+            pairings, list(dict.fromkeys([*self.weights, *self.tie_breakers]))
+        )
+        scores = self.scores(features, count)
+        candidates = np.arange(count)
+
+        if limit is not None and limit < count:
+            # Keep every pairing scoring at least the k-th best score, including
+            # ties, so that the final sort stays stable.
+            threshold = np.partition(scores, count - limit)[count - limit]
+            candidates = np.flatnonzero(scores >= threshold)
+
+        # lexsort is stable, and sorts by its last key first
+        order = np.lexsort(
+            [
+                *(-features[name][candidates] for name in reversed(self.tie_breakers)),
+                -scores[candidates],
+            ]
+        )
+
+        return [pairings[index] for index in candidates[order][:limit]]
+
+
+def _require_numpy() -> None:
+    global np
+
+    if np is not None:
+        return
+
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        raise ImportError(
+            "Ranking pairings requires numpy: "
+            'install it with pip install "apm_crewconnect[ranking]"'
+        )
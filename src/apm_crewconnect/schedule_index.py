@@ -0,0 +1,150 @@
+"""
+Index of a flight schedule, by aircraft and by airport.
+
+Flights are grouped into each aircraft's rotation and into each airport's
+departure and arrival timelines, all sorted by scheduled time, so that lookups
+are binary searches rather than scans of the schedule.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from .filters import normalize_registration
+from .models.flight import Flight
+
+
+class _Timeline:
+    """Flights sorted by a time, with their timestamps for binary searches."""
+
+    def __init__(self, flights: list[tuple[float, Flight]]) -> None:
+        flights.sort(key=lambda item: item[0])
+        self.times = [time for time, _ in flights]
+        self.flights = [flight for _, flight in flights]
+
+    def between(self, start: datetime, end: datetime) -> list[Flight]:
+        """Get the flights from start to end, inclusive."""
+
+        return self.flights[
+            bisect_left(self.times, start.timestamp()) : bisect_right(
+                self.times, end.timestamp()
+            )
+        ]
+
+    def after(
+        self, time: datetime, limit: Optional[int] = None, inclusive: bool = True
+    ) -> list[Flight]:
+        bisect = bisect_left if inclusive else bisect_right
+        index = bisect(self.times, time.timestamp())
+
+        return self.flights[index : index + limit if limit is not None else None]
+
+
+class ScheduleIndex:
+    def __init__(self, flights: Iterable[Flight]) -> None:
+        rotations = defaultdict(list)
+        departures = defaultdict(list)
+        arrivals = defaultdict(list)
+
+        for flight in flights:
+            departure_time = flight.scheduled_departure_time.timestamp()
+
+            rotations[normalize_registration(flight.aircraft_registration)].append(
+                (departure_time, flight)
+            )
+            departures[flight.departure_airport_commercial_code].append(
+                (departure_time, flight)
+            )
+            arrivals[flight.arrival_airport_commercial_code].append(
+                (flight.scheduled_arrival_time.timestamp(), flight)
+            )
+
+        self._rotations = {key: _Timeline(items) for key, items in rotations.items()}
+        self._departures = {key: _Timeline(items) for key, items in departures.items()}
+        self._arrivals = {key: _Timeline(items) for key, items in arrivals.items()}
+
+    @property
+    def registrations(self) -> list[str]:
+        return list(self._rotations)
+
+    def rotation(self, registration: str) -> list[Flight]:
+        """Get the flights of an aircraft, by scheduled departure time."""
+
+        timeline = self._rotations.get(normalize_registration(registration))
+
+        return list(timeline.flights) if timeline is not None else []
+
+    def next_legs(
+        self, registration: str, after: datetime, limit: Optional[int] = None
+    ) -> list[Flight]:
+        """
+        Get the flights of an aircraft scheduled to depart at or after a time.
+
+        :param registration: The aircraft registration, with or without dash.
+        :param limit: The maximum number of flights to return.
+        """
+
+        timeline = self._rotations.get(normalize_registration(registration))
+
+        return timeline.after(after, limit) if timeline is not None else []
+
+    def following_legs(
+        self, flight: Flight, limit: Optional[int] = None
+    ) -> list[Flight]:
+        """Get the flights of a flight's aircraft scheduled to depart after it."""
+
+        timeline = self._rotations.get(
+            normalize_registration(flight.aircraft_registration)
+        )
+
+        if timeline is None:
+            return []
+
+        return timeline.after(flight.scheduled_departure_time, limit, inclusive=False)
+
+    def departures(self, airport: str, start: datetime, end: datetime) -> list[Flight]:
+        """Get the flights scheduled to depart from an airport between two times."""
+
+        timeline = self._departures.get(airport)
+
+        return timeline.between(start, end) if timeline is not None else []
+
+    def arrivals(self, airport: str, start: datetime, end: datetime) -> list[Flight]:
+        """Get the flights scheduled to arrive at an airport between two times."""
+
+        timeline = self._arrivals.get(airport)
+
+        return timeline.between(start, end) if timeline is not None else []
+
+    def connections(
+        self, airport: str, after: datetime, within: timedelta
+    ) -> list[Flight]:
+        """
+        Get the flights scheduled to depart from an airport at or after a time,
+        and at most a given duration after it.
+        """
+
+        return self.departures(airport, after, after + within)
+
+    def connections_from(
+        self,
+        flight: Flight,
+        within: timedelta,
+        minimum_connection_time: timedelta = timedelta(),
+    ) -> list[Flight]:
+        """
+        Get the flights which can be connected to from a flight, at its arrival
+        airport.
+
+        :param within: The maximum time between the flight's arrival and the
+                       departure of a connection, beyond the minimum connection time.
+        :param minimum_connection_time: The minimum time between the flight's
+                                        arrival and a connection's departure.
+        """
+
+        return self.connections(
+            flight.arrival_airport_commercial_code,
+            flight.scheduled_arrival_time + minimum_connection_time,
+            within,
+        )
@@ -0,0 +1,295 @@
+"""
+Serialization of models to JSON, or msgpack.
+
+Each model class gets a list of field encoders, chosen once from its type hints,
+which convert its instances straight to JSON-compatible values: unlike
+dataclasses.asdict, nothing is deep-copied beforehand. Lists are written to
+files one item at a time. Models are built back from these values by decoders
+chosen from the same type hints.
+
+msgpack is an optional dependency, which may be installed with the "msgpack"
+extra.
+"""
+
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time, timedelta, timezone
+import json
+import types
+from typing import IO, Any, Callable, Union, get_args, get_origin, get_type_hints
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+from .models.pairing import DERIVED_PROPERTIES, Pairing
+from .utils import timedelta_to_str, timezone_to_offset_str
+
+Encoder = Callable[[Any], Any]
+Decoder = Callable[[Any], Any]
+
+# Properties serialized along with the fields of a model
+SERIALIZED_PROPERTIES: dict[type, tuple[str, ...]] = {
+    Pairing: DERIVED_PROPERTIES,
+}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _isoformat(value: date | time) -> str:
+    return value.isoformat()
+
+
+SCALAR_ENCODERS: dict[type, Encoder] = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    type(None): _identity,
+    datetime: _isoformat,
+    date: _isoformat,
+    time: _isoformat,
+    timedelta: timedelta_to_str,
+    timezone: timezone_to_offset_str,
+}
+
+_model_encoders: dict[type, Encoder] = {}
+
+
+def _timedelta_from_str(value: str) -> timedelta:
+    # The inverse of utils.timedelta_to_str
+    hours, minutes = value.split(":")
+
+    return timedelta(hours=int(hours), minutes=int(minutes))
+
+
+def _timezone_from_offset_str(value: str) -> timezone:
+    # The inverse of utils.timezone_to_offset_str
+    sign = -1 if value.startswith("-") else 1
+
+    return timezone(sign * timedelta(hours=int(value[1:3]), minutes=int(value[3:5])))
+
+
+SCALAR_DECODERS: dict[type, Decoder] = {
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+    time: time.fromisoformat,
+    timedelta: _timedelta_from_str,
+    timezone: _timezone_from_offset_str,
+}
+
+_model_decoders: dict[type, Decoder] = {}
+
+
+def to_primitive(value: Any) -> Any:
+    """Convert a model, or a collection of models, to JSON-compatible values."""
+
+    encoder = SCALAR_ENCODERS.get(type(value)) or _model_encoders.get(type(value))
+
+    if encoder is not None:
+        return encoder(value)
+
+    if isinstance(value, (list, tuple)):
+        return [to_primitive(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: to_primitive(item) for key, item in value.items()}
+
+    if is_dataclass(value):
+        return _model_encoder(type(value))(value)
+
+    for scalar_type, encoder in SCALAR_ENCODERS.items():
+        if isinstance(value, scalar_type):
+            return encoder(value)
+
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _model_encoder(cls: type) -> Encoder:
+    if cls not in _model_encoders:
+        try:
+            hints = get_type_hints(cls)
+        except Exception:
+            hints = {}
+
+        field_encoders = [
+            (field.name, _encoder_for_hint(hints.get(field.name)))
+            for field in fields(cls)
+        ] + [
+            (name, to_primitive)
+            for model_class, names in SERIALIZED_PROPERTIES.items()
+            if issubclass(cls, model_class)
+            for name in names
+        ]
+
+        def encode(value: Any) -> dict[str, Any]:
+            return {
+                name: encoder(getattr(value, name)) for name, encoder in field_encoders
+            }
+
+        _model_encoders[cls] = encode
+
+    return _model_encoders[cls]
+
+
+def _encoder_for_hint(hint: Any) -> Encoder:
+    # Optional[X] is encoded as X, None being passed through
+    if get_origin(hint) in (Union, types.UnionType):
+        arguments = [
+            argument for argument in get_args(hint) if argument is not type(None)
+        ]
+
+        if len(arguments) == 1:
+            encoder = _encoder_for_hint(arguments[0])
+
+            return lambda value: encoder(value) if value is not None else None
+
+    if get_origin(hint) is list:
+        (item_hint,) = get_args(hint) or (None,)
+        item_encoder = _encoder_for_hint(item_hint)
+
+        return lambda value: [item_encoder(item) for item in value]
+
+    encoder = SCALAR_ENCODERS.get(hint)
+
+    # Values of model fields may be instances of subclasses, so are dispatched
+    # on their own type
+    if encoder is None:
+        return to_primitive
+
+    if encoder is _identity:
+        return encoder
+
+    return lambda value: encoder(value) if value is not None else None
+
+
+def from_primitive(hint: Any, value: Any) -> Any:
+    """
+    Build a value of a type, such as a model or a list of models, from the
+    JSON-compatible values returned by to_primitive.
+    """
+
+    return decoder_for_hint(hint)(value)
+
+
+def decoder_for_hint(hint: Any) -> Decoder:
+    """Get a function building values of a type from their JSON-compatible form."""
+
+    # Optional[X] is decoded as X: every decoder passes None through
+    if get_origin(hint) in (Union, types.UnionType):
+        arguments = [
+            argument for argument in get_args(hint) if argument is not type(None)
+        ]
+
+        if len(arguments) == 1:
+            hint = arguments[0]
+
+    if get_origin(hint) is list:
+        (item_hint,) = get_args(hint) or (Any,)
+        item_decoder = decoder_for_hint(item_hint)
+
+        def decode(value: list) -> list:
+            return [item_decoder(item) for item in value]
+
+    elif get_origin(hint) is dict:
+        _, item_hint = get_args(hint) or (str, Any)
+        item_decoder = decoder_for_hint(item_hint)
+
+        def decode(value: dict) -> dict:
+            return {key: item_decoder(item) for key, item in value.items()}
+
+    elif is_dataclass(hint):
+        decode = _model_decoder(hint)
+    elif hint in SCALAR_DECODERS:
+        decode = SCALAR_DECODERS[hint]
+    else:
+        return _identity
+
+    return lambda value: decode(value) if value is not None else None
+
+
+def _model_decoder(cls: type) -> Decoder:
+    if cls not in _model_decoders:
+        hints = get_type_hints(cls)
+        field_decoders = {
+            field.name: decoder_for_hint(hints[field.name]) for field in fields(cls)
+        }
+
+        # Serialized properties, such as those of pairings, are skipped
+        def decode(value: dict[str, Any]) -> Any:
+            return cls(
+                **{
+                    name: field_decoders[name](item)
+                    for name, item in value.items()
+                    if name in field_decoders
+                }
+            )
+
+        _model_decoders[cls] = decode
+
+    return _model_decoders[cls]
+
+
+def dumps(value: Any, format: str = "json") -> str | bytes:
+    """
+    Serialize a model, or a collection of models.
+
+    :param format: "json", or "msgpack" for bytes.
+    """
+
+    if format == "json":
+        return json.dumps(to_primitive(value))
+
+    if format == "msgpack":
+        return _require_msgpack().packb(to_primitive(value))
+
+    raise ValueError(f"Unknown format: {format}")
+
+
+def dump(value: Any, file: IO, format: str = "json") -> None:
+    """
+    Serialize a model, or a collection of models, to a file. The items of a list
+    are serialized and written one at a time.
+
+    :param file: A text file for JSON, or a binary file for msgpack.
+    :param format: "json" or "msgpack".
+    """
+
+    if not isinstance(value, (list, tuple)):
+        file.write(dumps(value, format))
+        return
+
+    if format == "json":
+        file.write("[")
+
+        for index, item in enumerate(value):
+            if index > 0:
+                file.write(",")
+
+            file.write(json.dumps(to_primitive(item)))
+
+        file.write("]")
+        return
+
+    if format == "msgpack":
+        packer = _require_msgpack().Packer()
+        file.write(packer.pack_array_header(len(value)))
+
+        for item in value:
+            file.write(packer.pack(to_primitive(item)))
+
+        return
+
+    raise ValueError(f"Unknown format: {format}")
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError(
+            "Serializing to msgpack requires msgpack: "
+            'install it with pip install "apm_crewconnect[msgpack]"'
+        )
+
+    return msgpack
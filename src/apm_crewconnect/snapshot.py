@@ -0,0 +1,495 @@
+"""
+Columnar snapshots of rosters and flight schedules.
+
+A snapshot file holds a header followed by one array per model field:
+
+- the magic bytes b"APMSNAP" and a format version byte,
+- the header length as a little-endian uint32, then the header as JSON,
+  describing the snapshot and the location of each column,
+- the columns, each aligned on 8 bytes.
+
+Numbers, booleans, datetimes, durations (in seconds) and timezones (as UTC
+offsets in seconds) are stored as fixed-width arrays, strings as codes into a
+dictionary of the column's distinct strings, and nested objects as JSON.
+Dictionaries are stored as buffers too, and their strings only decoded when
+accessed. Models of several classes, such as roster activities, get a column
+per field of any of their classes, which is null for the rows of the other
+classes.
+
+Snapshots are opened by memory mapping the file: columns are read in place, and
+models are only built for the rows which are accessed.
+"""
+
+from array import array
+from dataclasses import fields
+from datetime import UTC, datetime, timedelta, timezone
+from functools import cache
+import json
+import math
+import mmap
+import struct
+import sys
+import types
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from .models import activity
+from .models.activity import Activity
+from .models.flight import Flight
+from .models.roster import Roster
+from .serialization import decoder_for_hint, to_primitive
+
+MAGIC = b"APMSNAP"
+VERSION = 3
+
+INT_NULL = -(2**63)
+OFFSET_NULL = -(2**31)
+BOOL_NULL = 2
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# The classes which may be stored in a snapshot, by name
+MODEL_CLASSES: dict[str, type] = {
+    cls.__name__: cls
+    for cls in [Flight, *vars(activity).values()]
+    if isinstance(cls, type) and issubclass(cls, (Flight, Activity))
+}
+
+# Array formats of the buffers of each column type
+BUFFER_FORMATS = {
+    "int": ["q"],
+    "float": ["d"],
+    "bool": ["B"],
+    "datetime": ["q", "i"],
+    "timedelta": ["q"],
+    "timezone": ["i"],
+    "str": ["i", "q", "B"],
+    "json": ["q", "B"],
+}
+
+
+def write_snapshot(path: str, value: Roster | list[Flight]) -> None:
+    """
+    Write a roster, or a flight schedule, to a snapshot file.
+
+    :param path: The path of the snapshot file.
+    :param value: A roster, or a list of flights.
+    """
+
+    if isinstance(value, Roster):
+        kind = "roster"
+        items = value.activities
+        meta = {
+            "user_id": value.user_id,
+            "start": value.start.isoformat(),
+            "end": value.end.isoformat(),
+        }
+    else:
+        kind = "flights"
+        items = list(value)
+        meta = {}
+
+    classes = [_model_class(item) for item in items]
+
+    # The types of each field of any of the classes, in order of appearance
+    field_types: dict[str, set[str]] = {}
+
+    for cls in dict.fromkeys(classes):
+        for name, hint in _field_hints(cls).items():
+            field_types.setdefault(name, set()).add(_column_type(hint))
+
+    columns = [
+        (
+            name,
+            # Fields typed differently by several classes are stored as JSON
+            column_types.pop() if len(column_types) == 1 else "json",
+            [getattr(item, name, None) for item in items],
+        )
+        for name, column_types in field_types.items()
+    ]
+    columns.append(("__class__", "str", [cls.__name__ for cls in classes]))
+
+    header = {
+        "kind": kind,
+        "rows": len(items),
+        "byteorder": sys.byteorder,
+        "meta": meta,
+        "columns": [],
+    }
+    buffers = []
+    offset = 0
+
+    for name, column_type, values in columns:
+        column_header = {"name": name, "type": column_type, "buffers": []}
+
+        for part in _encode_column(column_type, values):
+            column_header["buffers"].append([offset, len(part)])
+            buffers.append(part)
+            padding = -len(part) % 8
+            buffers.append(b"\0" * padding)
+            offset += len(part) + padding
+
+        header["columns"].append(column_header)
+
+    header_bytes = json.dumps(header).encode()
+    prefix = MAGIC + bytes([VERSION]) + struct.pack("<I", len(header_bytes))
+    padding = -(len(prefix) + len(header_bytes)) % 8
+
+    with open(path, "wb") as file:
+        file.write(prefix + header_bytes + b"\0" * padding)
+
+        for buffer in buffers:
+            file.write(buffer)
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file.
+
+    Its columns can be read without building any model, and its rows are built
+    into models on access.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a snapshot file: {path}")
+
+        self.version = self._mmap[len(MAGIC)]
+
+        if self.version != VERSION:
+            raise ValueError(f"Unsupported snapshot version: {self.version}")
+
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC) + 1)
+        header_start = len(MAGIC) + 5
+        header = json.loads(self._mmap[header_start : header_start + header_length])
+        data_start = header_start + header_length
+        data_start += -data_start % 8
+
+        self.kind: str = header["kind"]
+        self.meta: dict[str, Any] = header["meta"]
+        self._length: int = header["rows"]
+        self._view = memoryview(self._mmap)
+        self._columns = {
+            column["name"]: _Column(
+                column,
+                [
+                    self._view[data_start + offset : data_start + offset + length]
+                    for offset, length in column["buffers"]
+                ],
+                header["byteorder"] != sys.byteorder,
+            )
+            for column in header["columns"]
+        }
+        self._row_readers: dict[type, list[tuple[str, "_Column", Callable]]] = {}
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Flight | Activity:
+        cls = MODEL_CLASSES[self._columns["__class__"][index]]
+
+        return cls(
+            **{
+                name: decode(column[index])
+                for name, column, decode in self._row_reader(cls)
+            }
+        )
+
+    def __iter__(self) -> Iterator[Flight | Activity]:
+        return (self[index] for index in range(len(self)))
+
+    @property
+    def columns(self) -> list[str]:
+        return [name for name in self._columns if not name.startswith("__")]
+
+    def column(self, name: str) -> "_Column":
+        """
+        Get a column, indexable by row. Its raw array, such as the UTC timestamps
+        in microseconds of a datetime column, is available as its values.
+        """
+
+        return self._columns[name]
+
+    def to_roster(self) -> Roster:
+        if self.kind != "roster":
+            raise ValueError("Snapshot doesn't hold a roster")
+
+        return Roster(
+            user_id=self.meta["user_id"],
+            start=datetime.fromisoformat(self.meta["start"]).date(),
+            end=datetime.fromisoformat(self.meta["end"]).date(),
+            activities=list(self),
+        )
+
+    def close(self) -> None:
+        # The memory map can only be closed once no view of it remains
+        for column in self._columns.values():
+            column.release()
+
+        self._columns = {}
+        self._view.release()
+        self._mmap.close()
+
+    def _row_reader(self, cls: type) -> list[tuple[str, "_Column", Callable]]:
+        # The columns of a class's fields, and how their values are decoded
+        if cls not in self._row_readers:
+            self._row_readers[cls] = [
+                (
+                    name,
+                    self._columns[name],
+                    (
+                        decoder_for_hint(hint)
+                        if self._columns[name].type == "json"
+                        else _identity
+                    ),
+                )
+                for name, hint in _field_hints(cls).items()
+            ]
+
+        return self._row_readers[cls]
+
+
+class _Column:
+    def __init__(self, header: dict, buffers: list[memoryview], swap: bool) -> None:
+        self.name: str = header["name"]
+        self.type: str = header["type"]
+        self._strings: dict[int, str] = {}
+
+        self._raw_buffers = buffers
+        self._buffers = [
+            _array_view(buffer, format, swap)
+            for buffer, format in zip(buffers, BUFFER_FORMATS[self.type])
+        ]
+
+    def release(self) -> None:
+        for buffer in [*self._buffers, *self._raw_buffers]:
+            buffer.release()
+
+    @property
+    def values(self) -> memoryview:
+        return self._buffers[0]
+
+    def __len__(self) -> int:
+        return len(self._buffers[0]) - (1 if self.type == "json" else 0)
+
+    def __getitem__(self, index: int) -> Any:
+        if self.type == "int":
+            value = self._buffers[0][index]
+            return value if value != INT_NULL else None
+
+        if self.type == "float":
+            value = self._buffers[0][index]
+            return value if not math.isnan(value) else None
+
+        if self.type == "bool":
+            value = self._buffers[0][index]
+            return bool(value) if value != BOOL_NULL else None
+
+        if self.type == "datetime":
+            microseconds = self._buffers[0][index]
+
+            if microseconds == INT_NULL:
+                return None
+
+            value = EPOCH + timedelta(microseconds=microseconds)
+            offset = self._buffers[1][index]
+
+            if offset == OFFSET_NULL:
+                return value.replace(tzinfo=None)
+
+            return value.astimezone(timezone(timedelta(seconds=offset)))
+
+        if self.type == "timedelta":
+            seconds = self._buffers[0][index]
+            return timedelta(seconds=seconds) if seconds != INT_NULL else None
+
+        if self.type == "timezone":
+            offset = self._buffers[0][index]
+            return (
+                timezone(timedelta(seconds=offset)) if offset != OFFSET_NULL else None
+            )
+
+        if self.type == "str":
+            code = self._buffers[0][index]
+            return self._string(code) if code >= 0 else None
+
+        # JSON values are returned as decoded, without building nested models
+        offsets, data = self._buffers
+        return json.loads(bytes(data[offsets[index] : offsets[index + 1]]))
+
+    def _string(self, code: int) -> str:
+        # Dictionary strings are decoded once, on first access
+        if code not in self._strings:
+            _, offsets, data = self._buffers
+            self._strings[code] = bytes(
+                data[offsets[code] : offsets[code + 1]]
+            ).decode()
+
+        return self._strings[code]
+
+
+def _array_view(buffer: memoryview, format: str, swap: bool) -> memoryview:
+    if not swap:
+        return buffer.cast(format)
+
+    # Snapshots written on a machine of other endianness are copied once
+    values = array(format, buffer)
+    values.byteswap()
+
+    return memoryview(values)
+
+
+def _model_class(item: Any) -> type:
+    # Subclasses which can't be stored as such, like LazyFlight, are stored as
+    # the model they extend
+    return next(
+        cls for cls in type(item).__mro__ if MODEL_CLASSES.get(cls.__name__) is cls
+    )
+
+
+@cache
+def _field_hints(cls: type) -> dict[str, Any]:
+    hints = get_type_hints(cls)
+
+    return {field.name: hints[field.name] for field in fields(cls)}
+
+
+def _optional_argument(hint: Any) -> Any:
+    # Optional[X] is stored as X, with a null value
+    if get_origin(hint) in (Union, types.UnionType):
+        arguments = [
+            argument for argument in get_args(hint) if argument is not type(None)
+        ]
+
+        if len(arguments) == 1:
+            return arguments[0]
+
+    return hint
+
+
+def _column_type(hint: Any) -> str:
+    return {
+        bool: "bool",
+        int: "int",
+        float: "float",
+        datetime: "datetime",
+        timedelta: "timedelta",
+        timezone: "timezone",
+        str: "str",
+    }.get(_optional_argument(hint), "json")
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _encode_column(column_type: str, values: list) -> list[bytes]:
+    if column_type == "int":
+        return [
+            array(
+                "q", [value if value is not None else INT_NULL for value in values]
+            ).tobytes()
+        ]
+
+    if column_type == "float":
+        return [
+            array(
+                "d", [value if value is not None else math.nan for value in values]
+            ).tobytes()
+        ]
+
+    if column_type == "bool":
+        return [
+            array(
+                "B",
+                [bool(value) if value is not None else BOOL_NULL for value in values],
+            ).tobytes()
+        ]
+
+    if column_type == "datetime":
+        microseconds = array("q")
+        offsets = array("i")
+
+        for value in values:
+            if value is None:
+                microseconds.append(INT_NULL)
+                offsets.append(0)
+                continue
+
+            # Naive datetimes are stored as if they were in UTC
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=UTC)
+                offsets.append(OFFSET_NULL)
+            else:
+                offsets.append(int(value.utcoffset().total_seconds()))
+
+            microseconds.append((value - EPOCH) // timedelta(microseconds=1))
+
+        return [microseconds.tobytes(), offsets.tobytes()]
+
+    if column_type == "timedelta":
+        return [
+            array(
+                "q",
+                [
+                    value // timedelta(seconds=1) if value is not None else INT_NULL
+                    for value in values
+                ],
+            ).tobytes()
+        ]
+
+    if column_type == "timezone":
+        return [
+            array(
+                "i",
+                [
+                    (
+                        int(value.utcoffset(None).total_seconds())
+                        if value is not None
+                        else OFFSET_NULL
+                    )
+                    for value in values
+                ],
+            ).tobytes()
+        ]
+
+    if column_type == "str":
+        codes = array("i")
+        dictionary = {}
+
+        for value in values:
+            if value is None:
+                codes.append(-1)
+            else:
+                codes.append(dictionary.setdefault(value, len(dictionary)))
+
+        return [codes.tobytes(), *_encode_strings(list(dictionary))]
+
+    return _encode_strings([json.dumps(to_primitive(value)) for value in values])
+
+
+def _encode_strings(values: list[str]) -> list[bytes]:
+    # Strings are concatenated, and delimited by the offsets of their ends
+    offsets = array("q", [0])
+    data = bytearray()
+
+    for value in values:
+        data += value.encode()
+        offsets.append(len(data))
+
+    return [offsets.tobytes(), bytes(data)]
@@ -0,0 +1,73 @@
+"""
+Sort keys for pairing options.
+
+Besides computing its value, a sort key may provide an upper bound of that
+value from a pairing's summary alone. Top-k searches use it to skip fetching
+the details of pairings which can't make the top k.
+
+"total_on_days" and "departure_date" are known from the summary, and bound
+themselves. The mean rest and block time of a pairing are bounded by its span,
+from check-in to check-out, as its duty periods and the rest periods between
+them all fit within it: searches sorted by "rest" skip the pairings too short
+to rest as long as the top k, such as day trips.
+"""
+
+from dataclasses import dataclass
+import statistics
+from typing import Any, Callable, Optional
+
+from .models.pairing import Pairing
+
+
+@dataclass(frozen=True)
+class PairingSortKey:
+    key: Callable[[Pairing], Any]
+    bound: Optional[Callable[[Pairing], Any]] = None
+
+    @classmethod
+    def resolve(cls, sort_by: "str | Callable | PairingSortKey") -> "PairingSortKey":
+        if isinstance(sort_by, PairingSortKey):
+            return sort_by
+
+        if callable(sort_by):
+            return cls(key=sort_by)
+
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+
+        return SORT_KEYS[sort_by]
+
+
+def _span(pairing: Pairing) -> float:
+    return (pairing.check_out - pairing.check_in).total_seconds()
+
+
+def _mean_rest(pairing: Pairing) -> float:
+    # Pairings without rest periods, such as day trips, have a rest of 0
+    return statistics.mean(
+        [rest_period.duration.total_seconds() for rest_period in pairing.rest_periods]
+        or [0]
+    )
+
+
+def _mean_block(pairing: Pairing) -> float:
+    return statistics.mean(
+        [duty_period.block.total_seconds() for duty_period in pairing.duty_periods]
+        or [0]
+    )
+
+
+def _total_on_days(pairing: Pairing) -> int:
+    return pairing.total_on_days
+
+
+def _departure_date(pairing: Pairing) -> int:
+    return pairing.scheduled_departure_date.toordinal()
+
+
+SORT_KEYS = {
+    "rest": PairingSortKey(key=_mean_rest, bound=_span),
+    "block": PairingSortKey(key=_mean_block, bound=_span),
+    "total_on_days": PairingSortKey(key=_total_on_days, bound=_total_on_days),
+    "departure_date": PairingSortKey(key=_departure_date, bound=_departure_date),
+}
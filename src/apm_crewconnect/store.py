@@ -0,0 +1,419 @@
+"""
+A local SQLite store of flight schedules and rosters, for historical queries.
+
+Models are stored as versioned JSON, alongside indexed columns (registration,
+flight number, airports and date) on which queries are evaluated by SQLite.
+"""
+
+from datetime import UTC, date
+import hashlib
+from itertools import islice
+import json
+import os
+import sqlite3
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from .filters import normalize_registration
+from .models.activity import Activity
+from .models.flight import Flight
+from .models.roster import Roster
+from .serialization import from_primitive, to_primitive
+from .snapshot import MODEL_CLASSES
+
+if TYPE_CHECKING:
+    from .apm import Apm
+
+# The version of the stored models' format, which is stored with each of them
+MODEL_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    leg_id INTEGER PRIMARY KEY,
+    aircraft_registration TEXT NOT NULL,
+    aircraft_type TEXT NOT NULL,
+    flight_number TEXT NOT NULL,
+    commercial_flight_number TEXT NOT NULL,
+    departure_airport TEXT NOT NULL,
+    arrival_airport TEXT NOT NULL,
+    scheduled_departure_time REAL NOT NULL,
+    scheduled_arrival_time REAL NOT NULL,
+    departure_date TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_registration
+    ON flights (aircraft_registration, departure_date);
+CREATE INDEX IF NOT EXISTS flights_flight_number
+    ON flights (flight_number, departure_date);
+CREATE INDEX IF NOT EXISTS flights_commercial_flight_number
+    ON flights (commercial_flight_number, departure_date);
+CREATE INDEX IF NOT EXISTS flights_departure_airport
+    ON flights (departure_airport, departure_date);
+CREATE INDEX IF NOT EXISTS flights_arrival_airport
+    ON flights (arrival_airport, departure_date);
+CREATE INDEX IF NOT EXISTS flights_departure_date ON flights (departure_date);
+
+CREATE TABLE IF NOT EXISTS activities (
+    key TEXT PRIMARY KEY,
+    id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    activity_type TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    start_date TEXT NOT NULL,
+    flight_number TEXT,
+    aircraft_registration TEXT,
+    origin TEXT,
+    destination TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS activities_user ON activities (user_id, start_date);
+CREATE INDEX IF NOT EXISTS activities_flight_number
+    ON activities (flight_number, start_date);
+CREATE INDEX IF NOT EXISTS activities_registration
+    ON activities (aircraft_registration, start_date);
+"""
+
+FLIGHT_COLUMNS = [
+    "leg_id",
+    "aircraft_registration",
+    "aircraft_type",
+    "flight_number",
+    "commercial_flight_number",
+    "departure_airport",
+    "arrival_airport",
+    "scheduled_departure_time",
+    "scheduled_arrival_time",
+    "departure_date",
+]
+
+ACTIVITY_COLUMNS = [
+    "key",
+    "id",
+    "user_id",
+    "activity_type",
+    "start",
+    "end",
+    "start_date",
+    "flight_number",
+    "aircraft_registration",
+    "origin",
+    "destination",
+]
+
+
+class FlightStore:
+    """
+    A SQLite database of flights and roster activities, upserted by leg ID and
+    activity key respectively.
+
+    Activities are keyed by their user and ID. Activities without an ID in the
+    roster get one which varies between processes: they are keyed by a digest
+    of their user, class, start, end and details instead.
+
+    It may be shared by several threads.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, path: str = ".storage/flights.sqlite") -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self._lock = Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+    def add_flights(self, flights: Iterable[Flight]) -> int:
+        """
+        Insert or replace flights, in transactions of batch_size flights.
+
+        :return: The number of flights stored.
+        """
+
+        return self._upsert("flights", FLIGHT_COLUMNS, map(_flight_row, flights))
+
+    def add_roster(self, roster: Roster) -> int:
+        """
+        Insert or replace the activities of a roster.
+
+        :return: The number of activities stored.
+        """
+
+        return self._upsert(
+            "activities",
+            ACTIVITY_COLUMNS,
+            (_activity_row(roster.user_id, activity) for activity in roster.activities),
+        )
+
+    def ingest_flight_schedule(
+        self, apm: "Apm", start_date: date, end_date: Optional[date] = None, **filters
+    ) -> int:
+        """
+        Fetch a flight schedule and store it, as it is streamed.
+
+        :param filters: Filters of Apm.iter_flight_schedule.
+        :return: The number of flights stored.
+        """
+
+        return self.add_flights(
+            apm.iter_flight_schedule(start_date, end_date, lazy=True, **filters)
+        )
+
+    def ingest_roster(
+        self, apm: "Apm", start_date: date, end_date: Optional[date] = None
+    ) -> int:
+        """
+        Fetch a roster and store its activities.
+
+        :return: The number of activities stored.
+        """
+
+        return self.add_roster(apm.get_roster(start_date, end_date))
+
+    def flights(
+        self,
+        registration: Optional[str] = None,
+        flight_number: Optional[str] = None,
+        airport: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: Optional[list[str]] = None,
+    ) -> list[Flight] | dict[str, list]:
+        """
+        Query stored flights, ordered by scheduled departure time.
+
+        :param registration: The aircraft registration, with or without dash.
+        :param flight_number: The flight number, with or without airline designator.
+        :param airport: The IATA code of the departure or arrival airport.
+        :param start_date: The first (UTC) departure date.
+        :param end_date: The last (UTC) departure date.
+        :param columns: If set, the values of these indexed columns are returned
+                        as one list per column, instead of flights.
+        """
+
+        conditions = []
+        params = []
+
+        if registration is not None:
+            conditions.append("aircraft_registration = ?")
+            params.append(normalize_registration(registration))
+
+        if flight_number is not None:
+            conditions.append("(flight_number = ? OR commercial_flight_number = ?)")
+            params += [flight_number, flight_number]
+
+        if airport is not None:
+            conditions.append("(departure_airport = ? OR arrival_airport = ?)")
+            params += [airport, airport]
+
+        self._date_conditions(
+            "departure_date", start_date, end_date, conditions, params
+        )
+
+        return self._select(
+            "flights",
+            FLIGHT_COLUMNS,
+            conditions,
+            params,
+            "scheduled_departure_time",
+            columns,
+        )
+
+    def activities(
+        self,
+        user_id: Optional[str] = None,
+        activity_type: Optional[type[Activity]] = None,
+        flight_number: Optional[str] = None,
+        registration: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: Optional[list[str]] = None,
+    ) -> list[Activity] | dict[str, list]:
+        """
+        Query stored roster activities, ordered by start.
+
+        :param activity_type: An activity class, e.g. FlightActivity.
+        :param start_date: The first (UTC) start date.
+        :param end_date: The last (UTC) start date.
+        :param columns: If set, the values of these indexed columns are returned
+                        as one list per column, instead of activities.
+        """
+
+        conditions = []
+        params = []
+
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+
+        if activity_type is not None:
+            conditions.append("activity_type = ?")
+            params.append(activity_type.__name__)
+
+        if flight_number is not None:
+            conditions.append("flight_number = ?")
+            params.append(flight_number)
+
+        if registration is not None:
+            conditions.append("aircraft_registration = ?")
+            params.append(normalize_registration(registration))
+
+        self._date_conditions("start_date", start_date, end_date, conditions, params)
+
+        return self._select(
+            "activities", ACTIVITY_COLUMNS, conditions, params, "start", columns
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _upsert(self, table: str, columns: list[str], rows: Iterable[tuple]) -> int:
+        statement = (
+            f"INSERT OR REPLACE INTO {table} ({', '.join([*columns, 'data'])}) "
+            f"VALUES ({', '.join('?' * (len(columns) + 1))})"
+        )
+        rows = iter(rows)
+        count = 0
+
+        while batch := list(islice(rows, self.batch_size)):
+            with self._lock:
+                self._connection.execute("BEGIN")
+
+                try:
+                    self._connection.executemany(statement, batch)
+                except BaseException:
+                    self._connection.execute("ROLLBACK")
+                    raise
+
+                self._connection.execute("COMMIT")
+
+            count += len(batch)
+
+        return count
+
+    def _select(
+        self,
+        table: str,
+        table_columns: list[str],
+        conditions: list[str],
+        params: list[Any],
+        order_by: str,
+        columns: Optional[list[str]],
+    ) -> list | dict[str, list]:
+        for column in columns or []:
+            if column not in table_columns:
+                raise ValueError(f"Unknown column: {column}")
+
+        query = (
+            f"SELECT {', '.join(columns) if columns else 'data'} FROM {table}"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + f" ORDER BY {order_by}"
+        )
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+
+        if columns:
+            return {
+                column: [row[index] for row in rows]
+                for index, column in enumerate(columns)
+            }
+
+        return [_load_model(row[0]) for row in rows]
+
+    @staticmethod
+    def _date_conditions(
+        column: str,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        conditions: list[str],
+        params: list[Any],
+    ) -> None:
+        if start_date is not None:
+            conditions.append(f"{column} >= ?")
+            params.append(start_date.isoformat())
+
+        if end_date is not None:
+            conditions.append(f"{column} <= ?")
+            params.append(end_date.isoformat())
+
+
+def _flight_row(flight: Flight) -> tuple:
+    scheduled_departure_time = flight.scheduled_departure_time
+
+    return (
+        flight.leg_id,
+        normalize_registration(flight.aircraft_registration),
+        flight.aircraft_type,
+        flight.flight_number,
+        flight.commercial_flight_number,
+        flight.departure_airport_commercial_code,
+        flight.arrival_airport_commercial_code,
+        scheduled_departure_time.timestamp(),
+        flight.scheduled_arrival_time.timestamp(),
+        scheduled_departure_time.astimezone(UTC).date().isoformat(),
+        _dump_model(Flight, flight),
+    )
+
+
+def _activity_key(user_id: str, activity: Activity) -> str:
+    """Get the key of a roster activity, which is the same in every process."""
+
+    if not activity.has_generated_id:
+        return json.dumps([user_id, activity.id])
+
+    identity = [
+        user_id,
+        type(activity).__name__,
+        activity.start.timestamp(),
+        activity.end.timestamp(),
+        activity.details,
+    ]
+
+    return hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+
+
+def _activity_row(user_id: str, activity: Activity) -> tuple:
+    return (
+        _activity_key(user_id, activity),
+        activity.id,
+        user_id,
+        type(activity).__name__,
+        activity.start.timestamp(),
+        activity.end.timestamp(),
+        activity.start.astimezone(UTC).date().isoformat(),
+        getattr(activity, "flight_number", None),
+        (
+            normalize_registration(activity.aircraft_registration)
+            if hasattr(activity, "aircraft_registration")
+            else None
+        ),
+        getattr(activity, "origin_iata_code", None),
+        getattr(activity, "destination_iata_code", None),
+        _dump_model(type(activity), activity),
+    )
+
+
+def _dump_model(cls: type, model: Flight | Activity) -> str:
+    # Models are stored as the class they are built back as, e.g. LazyFlight as
+    # Flight
+    return json.dumps(
+        {
+            "version": MODEL_VERSION,
+            "class": cls.__name__,
+            "model": to_primitive(model),
+        }
+    )
+
+
+def _load_model(data: str) -> Flight | Activity:
+    stored = json.loads(data)
+
+    if stored["version"] != MODEL_VERSION:
+        raise ValueError(f"Unsupported stored model version: {stored['version']}")
+
+    return from_primitive(MODEL_CLASSES[stored["class"]], stored["model"])
@@ -0,0 +1,154 @@
+"""
+Incremental decoding of large JSON responses.
+
+Rather than decoding a whole response body at once, the items of the arrays
+stored under a given key are located in the byte stream and decoded one at a
+time, so only a single item needs to be held in memory.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_ARRAY_OPEN = re.compile(r"\s*:\s*\[")
+_ARRAY_OPEN_PREFIX = re.compile(r"\s*(:\s*)?")
+_SEPARATORS = re.compile(r"[\s,]*")
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+_SEEK, _OPEN, _ITEMS, _ITEM = range(4)
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Yield the items of every array of objects stored under a key, in order.
+
+    :param chunks: The raw UTF-8 body, as an iterable of byte chunks.
+    :param key: The name of the key holding the arrays.
+    :return: An iterator over the decoded items.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    needle = f'"{key}"'
+    buffer = ""
+    state = _SEEK
+    position = 0  # Where to resume parsing in the buffer
+    item_start = 0
+    depth = 0
+    in_string = False
+
+    for chunk in _chunks_then_final(chunks):
+        buffer += decoder.decode(chunk, final=chunk == b"")
+
+        while True:
+            if state == _SEEK:
+                index = buffer.find(needle, position)
+
+                if index == -1:
+                    # Keep a tail long enough to hold a key split across chunks
+                    position = max(len(buffer) - len(needle) + 1, position)
+                    break
+
+                position = index + len(needle)
+                state = _OPEN
+
+            if state == _OPEN:
+                match = _ARRAY_OPEN.match(buffer, position)
+
+                if match is None:
+                    if _ARRAY_OPEN_PREFIX.fullmatch(buffer, position):
+                        break
+
+                    # The key holds something other than an array
+                    state = _SEEK
+                    continue
+
+                position = match.end()
+                state = _ITEMS
+
+            if state == _ITEMS:
+                position = _SEPARATORS.match(buffer, position).end()
+
+                if position == len(buffer):
+                    break
+
+                if buffer[position] == "]":
+                    position += 1
+                    state = _SEEK
+                    continue
+
+                if buffer[position] != "{":
+                    raise ValueError(f"Expected an object in array {key}")
+
+                item_start = position
+                depth = 0
+                in_string = False
+                state = _ITEM
+
+            if state == _ITEM:
+                item_end = None
+
+                while item_end is None:
+                    if in_string:
+                        match = _STRING_SPECIAL.search(buffer, position)
+
+                        if match is None:
+                            position = len(buffer)
+                            break
+
+                        if match.group() == "\\":
+                            if match.end() == len(buffer):
+                                # The escaped character is in the next chunk
+                                position = match.start()
+                                break
+
+                            position = match.end() + 1
+                            continue
+
+                        in_string = False
+                        position = match.end()
+                        continue
+
+                    match = _STRUCTURAL.search(buffer, position)
+
+                    if match is None:
+                        position = len(buffer)
+                        break
+
+                    position = match.end()
+
+                    if match.group() == '"':
+                        in_string = True
+                    elif match.group() in "{[":
+                        depth += 1
+                    else:
+                        depth -= 1
+
+                        if depth == 0:
+                            item_end = position
+
+                if item_end is None:
+                    break
+
+                yield json.loads(buffer[item_start:item_end])
+
+                state = _ITEMS
+
+        # Drop what has already been consumed from the buffer
+        consumed = item_start if state == _ITEM else position
+        buffer = buffer[consumed:]
+        position -= consumed
+        item_start = 0
+
+    if state != _SEEK:
+        raise ValueError(f"Unexpected end of JSON while reading array {key}")
+
+
+def _chunks_then_final(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+
+    # An empty chunk flushes the decoder
+    yield b""
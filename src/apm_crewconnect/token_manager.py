@@ -0,0 +1,122 @@
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+from threading import RLock
+from typing import Iterator, Optional
+
+from .interfaces.token_manager_interface import TokenManagerInterface
+
+
+class SqliteTokenManager(TokenManagerInterface):
+    """
+    Tokens stored in a SQLite database.
+
+    It may be shared by several threads, and by several processes. Tokens are
+    read from memory, and only reloaded once another process wrote new ones.
+    """
+
+    def __init__(
+        self, path: str = ".storage/tokens.sqlite", timeout: float = 60
+    ) -> None:
+        """
+        :param timeout: How long to wait, in seconds, for another process to
+                        finish writing tokens.
+        """
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self._lock = RLock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS tokens "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._tokens: dict[str, dict] = {}
+        self._data_version: Optional[int] = None
+        self._in_transaction = False
+        self._changed = False
+
+    def set(self, **kwargs) -> None:
+        with self.transaction():
+            if "key" in kwargs:
+                tokens = self._tokens | {kwargs["key"]: kwargs["value"]}
+            else:
+                tokens = dict(kwargs["value"])
+
+            if tokens != self._tokens:
+                self._tokens = tokens
+                self._changed = True
+
+    def get(self, key: Optional[str] = None) -> dict[str, str | int] | None:
+        with self._lock:
+            if not self._in_transaction:
+                self._reload()
+
+            if key is None:
+                return dict(self._tokens)
+
+            return self._tokens.get(key)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group token updates into a single write.
+
+        Other processes can't write tokens until the transaction ends, and the
+        tokens they wrote before it began are loaded first.
+        """
+
+        with self._lock:
+            if self._in_transaction:
+                yield
+                return
+
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            self._changed = False
+
+            try:
+                self._reload()
+
+                yield
+
+                if self._changed:
+                    self._connection.execute("DELETE FROM tokens")
+                    self._connection.executemany(
+                        "INSERT INTO tokens (key, value) VALUES (?, ?)",
+                        [
+                            (key, json.dumps(value))
+                            for key, value in self._tokens.items()
+                        ],
+                    )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+
+                # Tokens set during the transaction were never written
+                self._data_version = None
+                raise
+            else:
+                self._connection.execute("COMMIT")
+            finally:
+                self._in_transaction = False
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _reload(self) -> None:
+        # The data version only changes when another connection commits
+        (data_version,) = self._connection.execute("PRAGMA data_version").fetchone()
+
+        if data_version == self._data_version:
+            return
+
+        self._tokens = {
+            key: json.loads(value)
+            for key, value in self._connection.execute("SELECT key, value FROM tokens")
+        }
+        self._data_version = data_version
@@ -1,4 +1,7 @@
-from datetime import date, timedelta, timezone
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, Union
 
 
 def date_in_range(date: date, start: date, end: date) -> bool:
@@ -8,7 +11,12 @@ def date_in_range(date: date, start: date, end: date) -> bool:
     return False
 
 
-def dates_in_range(dates: list[date], start: date, end: date) -> bool:
+def dates_in_range(
+    dates: Union[list[date], "DateRange", "DateSet"], start: date, end: date
+) -> bool:
+    if isinstance(dates, (DateRange, DateSet)):
+        return dates.intersects(start, end)
+
     return any(date_in_range(date, start, end) for date in dates)
 
 
@@ -18,6 +26,130 @@ def date_range(start: date, end: date) -> list[date]:
     return [start + timedelta(days=i) for i in range((end - start).days + 1)]
 
 
+class DateRange(Sequence):
+    """
+    A lazy, inclusive range of dates: the counterpart of date_range which,
+    like range, doesn't materialize its dates and checks membership in O(1).
+    """
+
+    def __init__(self, start: date, end: date) -> None:
+        if end < start:
+            raise ValueError("End date must come after start date")
+
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return (self.end - self.start).days + 1
+
+    def __getitem__(self, index: int | slice) -> date | list[date]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+
+        return self.start + timedelta(days=range(len(self))[index])
+
+    def __iter__(self) -> Iterator[date]:
+        return (self.start + timedelta(days=i) for i in range(len(self)))
+
+    def __contains__(self, item: object) -> bool:
+        return (
+            isinstance(item, date)
+            and not isinstance(item, datetime)
+            and self.start <= item <= self.end
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, DateRange):
+            return (self.start, self.end) == (other.start, other.end)
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.end))
+
+    def __or__(self, other: Iterable[Union[date, "DateRange"]]) -> "DateSet":
+        return DateSet([self]) | other
+
+    def __repr__(self) -> str:
+        return f"DateRange({self.start!r}, {self.end!r})"
+
+    def intersects(self, start: date, end: date) -> bool:
+        """Determine if any date between start and end (inclusive) is in the range."""
+        return start <= self.end and end >= self.start
+
+
+class DateSet:
+    """
+    A set of dates stored as sorted, merged intervals of ordinals, so that
+    checking whether it intersects a range of dates takes O(log n).
+    """
+
+    def __init__(self, dates: Iterable[Union[date, DateRange]] = ()) -> None:
+        intervals = sorted(
+            (
+                (item.start.toordinal(), item.end.toordinal())
+                if isinstance(item, DateRange)
+                else (item.toordinal(), item.toordinal())
+            )
+            for item in (dates.ranges() if isinstance(dates, DateSet) else dates)
+        )
+
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+
+        for start, end in intervals:
+            # Merge overlapping or adjacent intervals
+            if self._ends and start <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    def __bool__(self) -> bool:
+        return len(self._starts) > 0
+
+    def __iter__(self) -> Iterator[date]:
+        for date_range in self.ranges():
+            yield from date_range
+
+    def __contains__(self, item: object) -> bool:
+        return (
+            isinstance(item, date)
+            and not isinstance(item, datetime)
+            and self.intersects(item, item)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, DateSet):
+            return (self._starts, self._ends) == (other._starts, other._ends)
+
+        return NotImplemented
+
+    def __or__(self, other: Iterable[Union[date, DateRange]]) -> "DateSet":
+        other = other.ranges() if isinstance(other, DateSet) else other
+
+        return DateSet([*self.ranges(), *other])
+
+    def __repr__(self) -> str:
+        return f"DateSet({list(self.ranges())!r})"
+
+    def ranges(self) -> Iterator[DateRange]:
+        for start, end in zip(self._starts, self._ends):
+            yield DateRange(date.fromordinal(start), date.fromordinal(end))
+
+    def intersects(self, start: date, end: date) -> bool:
+        """Determine if any date between start and end (inclusive) is in the set."""
+
+        # Intervals are disjoint and sorted, so the last one starting before
+        # the end of the range is the only candidate for an intersection.
+        index = bisect_right(self._starts, end.toordinal()) - 1
+
+        return index >= 0 and self._ends[index] >= start.toordinal()
+
+
 def timedelta_to_str(timedelta: timedelta, format: str = "{}:{:02}") -> str:
     total_seconds = timedelta.total_seconds()
     hours, remainder = divmod(total_seconds, 3600)
@@ -0,0 +1,191 @@
+"""
+Watching a day's flight schedule for changes.
+
+Each raw sector is fingerprinted by its leg ID and mutable fields, so that
+unchanged sectors are recognised without building any model. The polling
+interval shortens when the schedule changes or flights are about to move, and
+lengthens when it is quiet.
+"""
+
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+import json
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional
+
+from .filters import sector_filter
+from .models.flight import Flight
+
+if TYPE_CHECKING:
+    from .apm import Apm
+
+# Fields of a sector which may change during the day
+MUTABLE_FIELDS = (
+    "aircraftRegistration",
+    "departureTime",
+    "arrivalTime",
+    "scheduledDepartureTime",
+    "scheduledArrivalTime",
+    "delays",
+    "crewMembers",
+    "flightTimes",
+    "departureColor",
+    "arrivalColor",
+)
+
+
+@dataclass
+class ScheduleChanges:
+    updated: list[Flight] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.updated or self.removed)
+
+
+def sector_fingerprint(sector: dict[str, Any]) -> int:
+    return hash(json.dumps([sector.get(key) for key in MUTABLE_FIELDS], sort_keys=True))
+
+
+class ScheduleWatcher:
+    """
+    Polls a day's flight schedule, reporting the legs which changed since the
+    previous poll.
+    """
+
+    def __init__(
+        self,
+        apm: "Apm",
+        day: Optional[date] = None,
+        registrations: List[str] = [],
+        aircraft_types: List[str] = [],
+        flight_numbers: List[str] = [],
+        airports: List[str] = [],
+        lazy: bool = False,
+        minimum_interval: float = 30,
+        maximum_interval: float = 900,
+        busy_window: timedelta = timedelta(hours=1),
+        now: Callable[[], datetime] = lambda: datetime.now(UTC),
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param apm: The client used to fetch the schedule.
+        :param day: The day to watch. Defaults to the current (UTC) day.
+        :param lazy: Whether changed flights are built as LazyFlight.
+        :param minimum_interval: The shortest time between polls, in seconds.
+        :param maximum_interval: The longest time between polls, in seconds.
+        :param busy_window: Polls are as frequent as possible while a flight is
+                            scheduled to depart or arrive within this duration.
+
+        The other arguments are filters of get_flight_schedule.
+        """
+
+        self.apm = apm
+        self.day = day
+        self.lazy = lazy
+        self.minimum_interval = minimum_interval
+        self.maximum_interval = maximum_interval
+        self.busy_window = busy_window
+        self.interval = minimum_interval
+        self._now = now
+        self._sleep = sleep
+        self._predicate = sector_filter(
+            registrations=registrations,
+            aircraft_types=aircraft_types,
+            flight_numbers=flight_numbers,
+            airports=airports,
+        )
+        self._watched_day: Optional[date] = None
+        self._fingerprints: dict[int, int] = {}
+        # Scheduled departure and arrival times of each leg, as timestamps
+        self._movements: dict[int, tuple[float, float]] = {}
+
+    def poll(self) -> ScheduleChanges:
+        """Fetch the schedule, and get the legs updated or removed since last poll."""
+
+        now = self._now()
+        day = self.day or now.astimezone(UTC).date()
+
+        # Legs of a previous day aren't reported as removed
+        if day != self._watched_day:
+            self._watched_day = day
+            self._fingerprints = {}
+            self._movements = {}
+
+        changes = ScheduleChanges()
+        seen_leg_ids = set()
+
+        for sector in filter(self._predicate, self.apm.stream_flight_schedule_day(day)):
+            leg_id = sector["legId"]
+
+            if leg_id in seen_leg_ids:
+                continue
+
+            seen_leg_ids.add(leg_id)
+            fingerprint = sector_fingerprint(sector)
+
+            if self._fingerprints.get(leg_id) == fingerprint:
+                continue
+
+            self._fingerprints[leg_id] = fingerprint
+            self._movements[leg_id] = (
+                datetime.fromisoformat(sector["scheduledDepartureTime"]).timestamp(),
+                datetime.fromisoformat(sector["scheduledArrivalTime"]).timestamp(),
+            )
+            changes.updated.append(Flight.from_dict(sector, lazy=self.lazy))
+
+        for leg_id in list(self._fingerprints):
+            if leg_id not in seen_leg_ids:
+                del self._fingerprints[leg_id]
+                del self._movements[leg_id]
+                changes.removed.append(leg_id)
+
+        self.interval = self._next_interval(now, bool(changes))
+
+        return changes
+
+    def watch(self) -> Iterator[ScheduleChanges]:
+        """
+        Poll indefinitely, yielding any changes and waiting the adaptive interval
+        between polls. The first changes hold every leg of the schedule.
+        """
+
+        while True:
+            changes = self.poll()
+
+            if changes:
+                yield changes
+
+            self._sleep(self.interval)
+
+    def _next_interval(self, now: datetime, changed: bool) -> float:
+        # Volatile schedules are polled more often, quiet ones less and less
+        if changed:
+            interval = self.interval / 2
+        else:
+            interval = self.interval * 1.5
+
+        # Until the next movement, nothing is likely to change much
+        timestamp = now.timestamp()
+        next_movement = min(
+            (
+                movement
+                for movements in self._movements.values()
+                for movement in movements
+                if movement >= timestamp
+            ),
+            default=None,
+        )
+
+        if next_movement is not None:
+            time_to_movement = next_movement - timestamp
+
+            if time_to_movement <= self.busy_window.total_seconds():
+                interval = self.minimum_interval
+            else:
+                interval = min(
+                    interval,
+                    time_to_movement - self.busy_window.total_seconds(),
+                )
+
+        return max(self.minimum_interval, min(self.maximum_interval, interval))
@@ -0,0 +1,326 @@
+"""Sample API payloads and a fake client for APM CrewConnect SDK tests."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import UTC, date, datetime, timedelta
+import json
+from typing import Any, Callable, Iterator
+
+import humps
+
+from apm_crewconnect import Apm, FlightActivity, GroundActivity
+
+
+def sector_data(**overrides) -> dict[str, Any]:
+    """Build a raw flight-schedule sector, as returned by the API."""
+    departure = datetime.fromisoformat(
+        overrides.pop("departureTime", "2024-11-10T06:00:00Z")
+    )
+    arrival = departure + timedelta(hours=2)
+
+    return {
+        "legId": 1,
+        "serieId": 1,
+        "aircraftRegistration": "FHUYE",
+        "aircraftCode": "73H",
+        "aircraftType": "73H",
+        "commercialFlightNumber": "TO4012",
+        "airlineDesignator": "TO",
+        "flightNumber": "4012",
+        "departureAirportCommercialCode": "ORY",
+        "departureAirportName": "Paris Orly",
+        "arrivalAirportCommercialCode": "RAK",
+        "arrivalAirportName": "Marrakech Menara",
+        "departureTime": departure.isoformat(),
+        "arrivalTime": arrival.isoformat(),
+        "scheduledDepartureTime": departure.isoformat(),
+        "scheduledArrivalTime": arrival.isoformat(),
+        "numberOfPassengers": 180,
+        "numberOfInfants": 2,
+        "passengerInfoDto": {"bookedPaxY": 180, "bookedPaxInfant": 2},
+        "freightInfoDto": {"freightTotal": 120.5},
+        "flightTimes": {
+            "departureEstimated": False,
+            "arrivalEstimated": True,
+            "out": departure.isoformat(),
+            "off": (departure + timedelta(minutes=10)).isoformat(),
+        },
+        "departureColor": "green",
+        "arrivalColor": "green",
+        "delays": [{"delayMinutes": 5, "delayCode": "93"}],
+        "blockTime": "02:00",
+        "crewMembers": [
+            {
+                "firstName": "Jane",
+                "lastName": "Doe",
+                "photoThumbnail": "data:image/jpeg;base64,AAAA",
+                "deadHeading": False,
+                "groundStaffOnBoard": False,
+                "roleCode": "CDB",
+                "crewCode": "JDO",
+                "commander": True,
+            },
+            {"roleCode": "OPL"},
+        ],
+        "icaoDepartureAirport": "LFPO",
+        "icaoArrivalAirport": "GMMX",
+        "departureHatched": False,
+        "arrivalHatched": False,
+        "paxOverbooking": False,
+        "paxUnderbooking": False,
+        "_links": {"self": {"href": "/api/legs/1"}},
+    } | overrides
+
+
+def flight_schedule_data(aircraft: dict[str, list[dict]]) -> dict[str, Any]:
+    """Build a raw flight-schedule response from sectors grouped by registration."""
+    return {
+        "_embedded": {
+            "companyAircraftByDateDtoList": [
+                {
+                    "aircraftList": {
+                        "_embedded": {
+                            "companyAircraftDtoList": [
+                                {"registration": registration, "sectors": sectors}
+                                for registration, sectors in aircraft.items()
+                            ]
+                        }
+                    }
+                }
+            ]
+        }
+    }
+
+
+def flight_activity(
+    activity_id: int, day: date, check_in_hour: int = 6
+) -> FlightActivity:
+    start = datetime(day.year, day.month, day.day, 8, tzinfo=UTC)
+
+    return FlightActivity(
+        id=activity_id,
+        pairing_id=None,
+        is_pending=False,
+        details="",
+        start=start,
+        end=start + timedelta(hours=3),
+        check_in=start.replace(hour=check_in_hour),
+        check_out=None,
+        pre_rest_start=None,
+        post_rest_end=None,
+        crew_members=[],
+        flight_number=f"TO{activity_id}",
+        aircraft_type="737-800",
+        aircraft_registration="FHUYE",
+        origin_iata_code="ORY",
+        origin_icao_code="LFPO",
+        origin_name="Orly",
+        origin_country="France",
+        origin_timezone=UTC,
+        destination_iata_code="RAK",
+        destination_icao_code="GMMX",
+        destination_name="Marrakech",
+        destination_country="Morocco",
+        destination_timezone=UTC,
+        block_time=timedelta(hours=3),
+        flight_duty=timedelta(hours=10),
+        max_flight_duty=timedelta(hours=13),
+        is_extended_flight_duty=False,
+        role="OPL",
+        catering_type="",
+    )
+
+
+def ground_activity(
+    activity_class: type, ground_code: str, start: datetime, hours: int, **kwargs
+) -> GroundActivity:
+    """Build a roster ground activity of any GroundActivity class."""
+    return activity_class(
+        **{
+            "id": hash(ground_code),
+            "pairing_id": None,
+            "is_pending": False,
+            "details": ground_code,
+            "start": start,
+            "end": start + timedelta(hours=hours),
+            "check_in": None,
+            "check_out": None,
+            "pre_rest_start": None,
+            "post_rest_end": None,
+            "crew_members": [],
+            "ground_code": ground_code,
+            "description": None,
+        }
+        | kwargs
+    )
+
+
+def pairing_data(
+    pairing_id: int,
+    start: date,
+    days: int = 2,
+    stopovers: list[str] = [],
+    check_in: str = "08:30",
+) -> dict[str, Any]:
+    """Build a raw pairing summary, as returned by the pairing search."""
+    end = start + timedelta(days=days - 1)
+
+    return humps.camelize(
+        {
+            "pairing_id": pairing_id,
+            "key": pairing_id,
+            "schedule_departure_date": f"{start}T00:00:00Z",
+            "scheduled_arrival_date": f"{end}T00:00:00Z",
+            "check_in": f"{start}T{check_in}:00Z",
+            "check_out": f"{end}T18:00:00Z",
+            "end_of_rest_after": f"{end + timedelta(days=1)}T06:00:00Z",
+            "schedule_departure_date_local": f"{start}T00:00:00Z",
+            "scheduled_arrival_date_local": f"{end}T00:00:00Z",
+            "check_in_local": f"{start}T{check_in}:00",
+            "check_out_local": f"{end}T18:00:00",
+            "end_of_rest_after_local": f"{end + timedelta(days=1)}T06:00:00",
+            "routing": "-".join(["ORY", *stopovers, "ORY"]),
+            "flight_numbers": [f"TO{4000 + pairing_id}"],
+            "stopover_airports": stopovers,
+            "consecutive_night_stopover": [],
+            "total_overlapping_utc_days": days,
+            "total_overlapping_local_days": days,
+            "number_of_rest_days": 1,
+            "number_of_rest_days_local": 1,
+        }
+    )
+
+
+def pairing_details_data(
+    pairing_id: int,
+    start: date,
+    check_ins: list[str] = ["08:30", "09:00"],
+    bidder_roles: list[str] = [],
+    block: str = "04:00",
+) -> dict[str, Any]:
+    """Build a raw pairing-details response, with one duty period per check-in."""
+    return humps.camelize(
+        {
+            "duty_period_request_dtos": [
+                duty_period_data(pairing_id, index, start + timedelta(days=index))
+                | {"check_in": check_in, "check_in_local": check_in, "block": block}
+                for index, check_in in enumerate(check_ins)
+            ],
+            "pairing_request_crew_by_role_dtos": [
+                {"role_code": role, "crew_request_crew_dtos": [{"crew_code": "ABC"}]}
+                for role in bidder_roles
+            ],
+        }
+    )
+
+
+def duty_period_data(pairing_id: int, index: int, day: date) -> dict[str, Any]:
+    times = {
+        "check_in": "08:30",
+        "check_out": "18:00",
+        "end_of_rest_after": "06:00",
+        "number_of_days_between_check_in_and_check_out": 0,
+        "number_of_days_between_check_in_and_end_of_rest": 1,
+    }
+
+    return {
+        "id": pairing_id * 100 + index,
+        "pairing_id": pairing_id,
+        "key": index,
+        "departure_date": day.isoformat(),
+        "departure_date_local": day.isoformat(),
+        "departure_date_local_device": day.isoformat(),
+        **times,
+        **{key + "_local": value for key, value in times.items()},
+        **{key + "_local_device": value for key, value in times.items()},
+        "block": "04:00",
+        "duty": "09:30",
+        "flight_duty_period": "09:00",
+        "maximum_flight_duty_period": "13:00",
+        "flight": True,
+        "hotac": True,
+        "hotac_name": "Hotel",
+        "duty_period_components": [
+            {
+                "id": pairing_id * 1000 + index,
+                "duty_period_id": pairing_id * 100 + index,
+                **{
+                    key + suffix: value
+                    for key, value in {
+                        "departure_time": "09:30",
+                        "arrival_time": "17:30",
+                    }.items()
+                    for suffix in ("", "_local", "_local_device")
+                },
+                "component_description": "Hotel",
+                "component_airport": "ORY-RAK",
+                "key": 0,
+            }
+        ],
+    }
+
+
+def pairing_search_handler(
+    pairings: list[dict], details: dict[int, dict], page_size: int = 2
+) -> Callable[[str, str, dict], Any]:
+    """Serve pairing search pages and details from sample data."""
+
+    def handler(method: str, path: str, kwargs: dict) -> Any:
+        if path.endswith("/details"):
+            return details[int(path.split("/")[-2])]
+
+        page = kwargs["params"]["page"]
+        results = pairings[(page - 1) * page_size : page * page_size]
+
+        if not results:
+            return {}
+
+        return {"_embedded": {"pairingRequestDtoList": results}}
+
+    return handler
+
+
+class FakeResponse:
+    def __init__(self, data: Any) -> None:
+        self.content = json.dumps(data).encode()
+        self.status_code = 200
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]
+
+
+class FakeClient:
+    """Stands in for ApmClient, routing requests to a handler."""
+
+    user_id = "12345"
+
+    def __init__(self, handler: Callable[[str, str, dict], Any]) -> None:
+        self.handler = handler
+        self.requests: list[tuple[str, str, dict]] = []
+
+    def request(self, method: str, path: str, **kwargs) -> FakeResponse:
+        self.requests.append((method, path, kwargs))
+
+        return FakeResponse(self.handler(method, path, kwargs))
+
+
+class FakeApm(Apm):
+    def __init__(self, handler: Callable[[str, str, dict], Any], **kwargs) -> None:
+        self._handler = handler
+
+        super().__init__("https://crewmobile.example.com", **kwargs)
+
+    def _setup_client(self, host):
+        self.client = FakeClient(self._handler)
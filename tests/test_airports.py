@@ -0,0 +1,67 @@
+"""Test fetching and caching airports."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import timedelta, timezone
+
+from apm_crewconnect import Airport, SqliteCache
+
+from .fixtures import FakeApm
+
+
+def airport_data(iata_code: str) -> dict:
+    """Build a raw airport, as returned by the API."""
+    return {
+        "iataCode": iata_code,
+        "icaoCode": "LF" + iata_code[:2],
+        "name": f"Airport {iata_code}",
+        "cityName": "Paris",
+        "countryName": "France",
+        "timeZone": "+0100",
+        "terminals": [{"code": "1"}, {"code": "2"}],
+    }
+
+
+def test_airport_from_dict() -> None:
+    """Test airports are built from the API's payload."""
+    assert Airport.from_dict(airport_data("ORY")) == Airport(
+        iata_code="ORY",
+        icao_code="LFOR",
+        name="Airport ORY",
+        city="Paris",
+        country="France",
+        timezone=timezone(timedelta(hours=1)),
+        terminals=["1", "2"],
+    )
+    assert Airport.from_dict({"iataCode": "RAK", "timeZone": "-03:30"}).timezone == (
+        timezone(-timedelta(hours=3, minutes=30))
+    )
+
+
+def test_airports_are_fetched_once(tmp_path) -> None:
+    """Test airports are fetched in bulk, then served from memory and the cache."""
+
+    def handler(method, path, kwargs):
+        return airport_data(path.rsplit("/", 1)[-1])
+
+    cache = SqliteCache(str(tmp_path / "cache.sqlite"))
+    apm = FakeApm(handler, cache=cache)
+
+    airports = apm.get_airports(["ORY", "RAK", "ORY", "NTE"])
+
+    assert list(airports) == ["ORY", "RAK", "NTE"]
+    assert sorted(path for _, path, _ in apm.client.requests) == [
+        "/api/airports/NTE",
+        "/api/airports/ORY",
+        "/api/airports/RAK",
+    ]
+    assert apm.get_airport("RAK") is airports["RAK"]
+    assert len(apm.client.requests) == 3
+
+    # Another client finds the airports in the persistent cache
+    other_apm = FakeApm(handler, cache=cache)
+
+    assert other_apm.get_airport("ORY") == airports["ORY"]
+    assert other_apm.client.requests == []
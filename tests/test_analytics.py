@@ -0,0 +1,72 @@
+"""Test rolling-window flight time totals."""
+
+import json
+import sys
+
+sys.path.append("./src")
+
+from datetime import date, timedelta
+
+from apm_crewconnect import (
+    FlightTimeLimit,
+    Pairing,
+    Roster,
+    RosterTotals,
+)
+from apm_crewconnect.parsing import parse_pairing_details
+
+from .fixtures import flight_activity, pairing_data, pairing_details_data
+
+LIMITS = [
+    FlightTimeLimit("7 days", days=7, duty=timedelta(hours=30)),
+    FlightTimeLimit("28 days", days=28, block=timedelta(hours=20)),
+    FlightTimeLimit("12 months", months=12, block=timedelta(hours=900)),
+]
+
+
+def test_window_start() -> None:
+    assert LIMITS[0].window_start(date(2025, 4, 7)) == date(2025, 4, 1)
+    assert LIMITS[2].window_start(date(2025, 4, 7)) == date(2024, 4, 8)
+    assert LIMITS[2].window_start(date(2024, 2, 29)) == date(2023, 3, 1)
+
+
+def test_roster_totals() -> None:
+    """Test window totals, headroom and what-if evaluation of a pairing."""
+    roster = Roster(
+        user_id="12345",
+        start=date(2025, 4, 1),
+        end=date(2025, 4, 30),
+        activities=[
+            # Two legs of one duty period, sharing its check-in
+            flight_activity(1, date(2025, 4, 1)),
+            flight_activity(2, date(2025, 4, 1)),
+            flight_activity(3, date(2025, 4, 5)),
+            flight_activity(4, date(2025, 4, 9)),
+        ],
+    )
+    totals = RosterTotals(roster, LIMITS)
+
+    assert totals.totals(date(2025, 4, 7), LIMITS[0]) == (
+        timedelta(hours=9),
+        timedelta(hours=20),
+    )
+
+    headroom = totals.headroom(date(2025, 4, 9))
+
+    assert headroom["7 days"].duty == timedelta(hours=10)
+    assert headroom["7 days"].block is None
+    assert headroom["28 days"].block == timedelta(hours=8)
+    assert len(totals.headroom_by_day()) == 30
+
+    pairing = Pairing.from_dict(pairing_data(1, date(2025, 4, 10)))
+    pairing.duty_periods = parse_pairing_details(
+        json.dumps(pairing_details_data(1, date(2025, 4, 10), block="04:00")).encode()
+    )
+    headroom_with = totals.headroom_with(pairing)
+
+    # Two duty periods of 4 hours block and 9 hours flight duty
+    assert headroom_with[date(2025, 4, 11)]["28 days"].block == timedelta(0)
+    assert headroom_with[date(2025, 4, 11)]["7 days"].duty == timedelta(hours=-8)
+    assert max(headroom_with) == date(2026, 4, 10)
+    assert not totals.fits(pairing)
+    assert RosterTotals(roster, LIMITS[1:]).fits(pairing)
@@ -0,0 +1,49 @@
+"""Test requests made by the APM client."""
+
+import sys
+
+sys.path.append("./src")
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from types import SimpleNamespace
+
+from apm_crewconnect import ApmClient
+from apm_crewconnect import apm_client
+
+
+def test_concurrent_expired_requests_refresh_once(monkeypatch) -> None:
+    """Test requests rejected together only refresh the token once."""
+    rejected = Barrier(2)
+    refreshes = []
+
+    def request(method, url, headers, **kwargs):
+        if headers["Authorization"] == "Bearer expired":
+            # Both requests are rejected before either refreshes the token
+            rejected.wait(timeout=5)
+            return SimpleNamespace(status_code=401)
+
+        return SimpleNamespace(status_code=200)
+
+    def refresh_token(self) -> dict:
+        refreshes.append(self.access_token)
+        self.token = {"userId": 1, "token": "refreshed"}
+        return self.token
+
+    monkeypatch.setattr(apm_client.requests, "request", request)
+    monkeypatch.setattr(ApmClient, "refresh_token", refresh_token)
+    monkeypatch.setattr(
+        ApmClient, "authorized", property(lambda self: self.access_token != "expired")
+    )
+
+    client = ApmClient(
+        "https://crewmobile.example.com", token={"userId": 1, "token": "expired"}
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        responses = list(
+            executor.map(lambda path: client.request("get", path), ["/a", "/b"])
+        )
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert refreshes == ["expired"]
@@ -0,0 +1,78 @@
+"""Test sharing crew members through crew directories."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import date
+import pickle
+
+from apm_crewconnect import CrewDirectory, CrewMember, Flight, ThumbnailStore
+
+from .fixtures import FakeApm, flight_schedule_data, sector_data
+
+
+def test_directory_shares_members_and_thumbnails(tmp_path) -> None:
+    """Test equal crew members are shared, and thumbnails are stored once."""
+    directory = CrewDirectory(ThumbnailStore(str(tmp_path / "thumbnails")))
+    flights = directory.add_flights(
+        [Flight.from_dict(sector_data(legId=leg_id)) for leg_id in (1, 2, 3)]
+    )
+
+    members = [flight.crew_members[0] for flight in flights]
+
+    assert members[0] is members[1] is members[2]
+    assert members[0] == CrewMember(
+        first_name="Jane",
+        last_name="Doe",
+        photo_thumbnail="data:image/jpeg;base64,AAAA",
+        dead_heading=False,
+        ground_staff_on_board=False,
+        role_code="CDB",
+        crew_code="JDO",
+        commander=True,
+    )
+    assert directory.get("JDO") is members[0]
+    assert len(directory.thumbnails) == 1
+    assert "photo_thumbnail" not in vars(members[0])
+
+    # A dead heading member is kept apart, but shares the thumbnail
+    dead_heading = directory.add(
+        CrewMember(
+            first_name="Jane",
+            last_name="Doe",
+            photo_thumbnail="data:image/jpeg;base64,AAAA",
+            dead_heading=True,
+            ground_staff_on_board=False,
+            crew_code="JDO",
+        )
+    )
+
+    assert dead_heading is not members[0]
+    assert directory.get("JDO") is members[0]
+    assert len(directory) == 1
+    assert len(directory.thumbnails) == 1
+
+    # Spilled thumbnails are found again by a new store
+    store = ThumbnailStore(str(tmp_path / "thumbnails"))
+
+    assert members[0].photo_thumbnail_digest in store
+    assert store.get(members[0].photo_thumbnail_digest) == members[0].photo_thumbnail
+
+    # Members are pickled without their store
+    assert type(pickle.loads(pickle.dumps(members[0]))) is CrewMember
+
+
+def test_apm_shares_schedule_crew_members() -> None:
+    """Test flight schedules are routed through the client's crew directory."""
+    apm = FakeApm(
+        lambda method, path, kwargs: flight_schedule_data(
+            {"FHUYE": [sector_data(legId=1), sector_data(legId=2)]}
+        ),
+        crew_directory=CrewDirectory(),
+    )
+
+    flights = apm.get_flight_schedule(date(2024, 11, 10))
+
+    assert flights[0].crew_members[0] is flights[1].crew_members[0]
+    assert apm.crew_directory.get("JDO") is flights[0].crew_members[0]
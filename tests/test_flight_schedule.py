@@ -0,0 +1,197 @@
+"""Test flight schedule retrieval."""
+
+import sys
+
+sys.path.append("./src")
+
+import dataclasses
+from datetime import UTC, date, datetime, timedelta
+import json
+
+import pytest
+
+from apm_crewconnect import Flight, MemoryCache
+from apm_crewconnect.models.flight import LazyFlight
+from apm_crewconnect.streaming import iter_array_items
+
+from .fixtures import FakeApm, flight_schedule_data, sector_data
+
+
+def schedule_handler(method, path, kwargs) -> dict:
+    day = kwargs["params"]["from"]
+
+    return flight_schedule_data(
+        {
+            "FHUYE": [
+                sector_data(
+                    legId=int(day.replace("-", "")),
+                    departureTime=day + "T06:00:00+00:00",
+                )
+            ]
+        }
+    )
+
+
+def test_get_flight_schedule_fetches_each_day() -> None:
+    """Test multi-day schedules are assembled from one request per day."""
+    apm = FakeApm(schedule_handler)
+
+    flights = apm.get_flight_schedule(date(2024, 11, 10), date(2024, 11, 12))
+
+    assert [flight.leg_id for flight in flights] == [20241110, 20241111, 20241112]
+    assert sorted(request[2]["params"]["from"] for request in apm.client.requests) == [
+        "2024-11-10",
+        "2024-11-11",
+        "2024-11-12",
+    ]
+
+
+def test_get_flight_schedule_only_fetches_missing_days() -> None:
+    """Test cached days are not requested again."""
+    apm = FakeApm(schedule_handler)
+
+    apm.get_flight_schedule(date(2024, 11, 10))
+    apm.client.requests.clear()
+
+    flights = apm.get_flight_schedule(date(2024, 11, 10), date(2024, 11, 11))
+
+    assert len(flights) == 2
+    assert [request[2]["params"]["from"] for request in apm.client.requests] == [
+        "2024-11-11"
+    ]
+
+
+def test_get_flight_schedule_deduplicates_sectors() -> None:
+    """Test sectors returned for two consecutive days are only kept once."""
+    apm = FakeApm(
+        lambda method, path, kwargs: flight_schedule_data({"FHUYE": [sector_data()]})
+    )
+
+    assert len(apm.get_flight_schedule(date(2024, 11, 10), date(2024, 11, 11))) == 1
+
+
+def test_flight_schedule_ttl() -> None:
+    """Test past days are cached permanently and current days briefly."""
+    apm = FakeApm(schedule_handler)
+    today = datetime.now(UTC).date()
+
+    assert apm._flight_schedule_ttl(today - timedelta(days=30)) is None
+    assert apm._flight_schedule_ttl(today) == apm.flight_schedule_live_ttl
+    assert apm._flight_schedule_ttl(today + timedelta(days=1)) == (
+        apm.flight_schedule_live_ttl
+    )
+    assert apm._flight_schedule_ttl(today + timedelta(days=7)) == (
+        apm.flight_schedule_ttl
+    )
+
+
+def test_memory_cache_expiry() -> None:
+    """Test MemoryCache drops expired values."""
+    cache = MemoryCache()
+
+    cache.set("permanent", [1])
+    cache.set("expired", [2], ttl=-1)
+
+    assert cache.get("permanent") == [1]
+    assert cache.get("expired") is None
+    assert not cache.has("expired")
+
+
+def test_get_flight_schedule_filters_raw_sectors() -> None:
+    """Test filters are applied to sectors before flights are built."""
+    apm = FakeApm(
+        lambda method, path, kwargs: flight_schedule_data(
+            {
+                "FHUYE": [sector_data(legId=1)],
+                "FHUYF": [
+                    sector_data(
+                        legId=2,
+                        aircraftRegistration="FHUYF",
+                        flightNumber="4013",
+                        arrivalAirportCommercialCode="NTE",
+                        icaoArrivalAirport="LFRS",
+                        departureTime="2024-11-10T14:00:00+00:00",
+                    )
+                ],
+            }
+        )
+    )
+    day = date(2024, 11, 10)
+
+    assert [f.leg_id for f in apm.get_flight_schedule(day)] == [1, 2]
+    assert [
+        f.leg_id for f in apm.get_flight_schedule(day, registrations=["F-HUYF"])
+    ] == [2]
+    assert [f.leg_id for f in apm.get_flight_schedule(day, airports=["RAK"])] == [1]
+    assert [
+        f.leg_id for f in apm.get_flight_schedule(day, flight_numbers=["TO4012"])
+    ] == [1, 2]
+    assert [
+        f.leg_id
+        for f in apm.get_flight_schedule(
+            day, departs_after=datetime(2024, 11, 10, 12, tzinfo=UTC)
+        )
+    ] == [2]
+
+
+def test_lazy_flight_matches_eager_flight() -> None:
+    """Test lazily decoded flights expose the same values as eager ones."""
+    data = sector_data()
+
+    eager = Flight.from_dict(data)
+    lazy = Flight.from_dict(data, lazy=True)
+
+    assert isinstance(lazy, LazyFlight)
+    assert "crew_members" not in lazy.__dict__
+    assert lazy.flight_times == eager.flight_times
+    assert lazy.crew_members is lazy.crew_members
+    assert lazy == eager
+    assert dataclasses.asdict(lazy) == dataclasses.asdict(eager)
+
+
+def test_replace_lazy_flight() -> None:
+    """Test replacing fields of a lazy flight gives a plain Flight."""
+    data = sector_data()
+
+    eager = Flight.from_dict(data)
+    lazy = Flight.from_dict(data, lazy=True)
+    replaced = dataclasses.replace(lazy, flight_number="TO3001")
+
+    assert type(replaced) is Flight
+    assert replaced == dataclasses.replace(eager, flight_number="TO3001")
+    assert replaced.crew_members == eager.crew_members
+    assert lazy.flight_number == eager.flight_number
+
+
+def test_iter_flight_schedule_streams_missing_days() -> None:
+    """Test streamed schedules match decoded ones."""
+    apm = FakeApm(schedule_handler)
+
+    apm.get_flight_schedule(date(2024, 11, 10))
+
+    flights = list(apm.iter_flight_schedule(date(2024, 11, 10), date(2024, 11, 11)))
+
+    assert flights == apm.get_flight_schedule(date(2024, 11, 10), date(2024, 11, 11))
+    assert apm.client.requests[1][2]["stream"] is True
+
+
+def test_iter_array_items_across_chunks() -> None:
+    """Test array items are decoded whatever the chunk boundaries."""
+    data = flight_schedule_data(
+        {
+            "FHUYE": [sector_data(departureAirportName='Paris "Orly" {]\\ é')],
+            "FHUYF": [sector_data(legId=2), sector_data(legId=3)],
+        }
+    )
+    body = json.dumps(data, ensure_ascii=False).encode()
+    expected = data["_embedded"]["companyAircraftByDateDtoList"][0]["aircraftList"][
+        "_embedded"
+    ]["companyAircraftDtoList"]
+
+    for size in (1, 7, 64, len(body)):
+        chunks = [body[i : i + size] for i in range(0, len(body), size)]
+
+        assert list(iter_array_items(chunks, "companyAircraftDtoList")) == expected
+
+    with pytest.raises(ValueError):
+        list(iter_array_items([body[:500]], "companyAircraftDtoList"))
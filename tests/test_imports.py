@@ -0,0 +1,61 @@
+"""Test the package's submodules are imported lazily."""
+
+import sys
+
+sys.path.append("./src")
+
+import subprocess
+
+import apm_crewconnect
+
+
+def imported_modules(statement: str) -> set[str]:
+    """Get the modules imported by a statement, in a fresh interpreter."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; sys.path.append('./src'); {statement}; "
+            "print('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    return set(output.splitlines())
+
+
+def test_models_dont_import_clients() -> None:
+    """Test importing the package, or its models, imports no HTTP stack or numpy."""
+    modules = imported_modules("import apm_crewconnect")
+
+    assert not {"apm_crewconnect.apm", "humps", "numpy", "requests"} & modules
+
+    modules = imported_modules("from apm_crewconnect import Flight, Roster, utils")
+
+    assert "apm_crewconnect.models.flight" in modules
+    assert not {"apm_crewconnect.apm", "numpy", "oauthlib", "requests"} & modules
+
+
+def test_client_doesnt_import_numpy() -> None:
+    """Test numpy is only imported once pairings are ranked."""
+    modules = imported_modules("from apm_crewconnect import Apm")
+
+    assert "apm_crewconnect.ranking" in modules
+    assert "numpy" not in modules
+
+    modules = imported_modules(
+        "from apm_crewconnect import PairingRanker; PairingRanker({'mean_rest': 1})"
+    )
+
+    assert "numpy" in modules
+
+
+def test_attributes_are_loaded_on_access() -> None:
+    """Test every exported attribute is found."""
+    for name in apm_crewconnect.__all__:
+        assert getattr(apm_crewconnect, name) is not None
+
+    assert apm_crewconnect.Flight.__module__ == "apm_crewconnect.models.flight"
+    assert "Apm" in dir(apm_crewconnect)
@@ -0,0 +1,50 @@
+"""Test properties derived from pairings' duty periods."""
+
+import json
+import sys
+
+sys.path.append("./src")
+
+from datetime import date, timedelta
+
+from apm_crewconnect import Pairing, RestPeriod
+from apm_crewconnect.parsing import parse_pairing_details
+
+from .fixtures import pairing_data, pairing_details_data
+
+START = date(2025, 4, 1)
+
+
+def duty_periods(check_ins: list[str]) -> list:
+    return parse_pairing_details(
+        json.dumps(pairing_details_data(1, START, check_ins)).encode()
+    )
+
+
+def test_derived_properties_are_cached() -> None:
+    """Test derived properties are computed once, until duty periods change."""
+    pairing = Pairing.from_dict(pairing_data(1, START))
+
+    assert pairing.rest_periods is None
+    assert pairing.total_block is None
+
+    pairing.duty_periods = duty_periods(["08:30", "09:00"])
+
+    assert pairing.rest_periods == [
+        RestPeriod(stopover="RAK", duration=timedelta(hours=15))
+    ]
+    assert pairing.rest_periods is pairing.rest_periods
+    assert pairing.total_block == timedelta(hours=8)
+
+    pairing.duty_periods = duty_periods(["08:30", "10:00", "07:00"])
+
+    assert [rest_period.duration for rest_period in pairing.rest_periods] == [
+        timedelta(hours=16),
+        timedelta(hours=13),
+    ]
+    assert pairing.total_block == timedelta(hours=12)
+    assert len(pairing.report_times) == 3
+    assert pairing.to_dict()["rest_periods"][0] == {
+        "stopover": "RAK",
+        "duration": timedelta(hours=16),
+    }
@@ -0,0 +1,42 @@
+"""Test local queries over fetched pairing options."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import date
+
+from apm_crewconnect import Pairing, PairingIndex, utils
+
+from .fixtures import pairing_data
+
+
+def test_pairing_index_query() -> None:
+    """Test compound include and exclude queries."""
+    start = date(2025, 4, 1)
+    index = PairingIndex(
+        Pairing.from_dict(data)
+        for data in [
+            pairing_data(1, start, days=3, stopovers=["RAK"]),
+            pairing_data(2, start, days=1),
+            pairing_data(3, start, days=3, stopovers=["NTE", "RAK"]),
+            pairing_data(4, date(2025, 4, 10), days=2, stopovers=["LIS"]),
+            pairing_data(5, date(2025, 4, 5), days=4, stopovers=["RAK"]),
+        ]
+    )
+
+    def query(**kwargs) -> list[int]:
+        return [pairing.id for pairing in index.query(**kwargs)]
+
+    assert query() == [1, 2, 3, 4, 5]
+    assert query(stopovers=["RAK", "LIS"]) == [1, 3, 4, 5]
+    assert query(stopovers=["RAK"], excluded_stopovers=["NTE"]) == [1, 5]
+    assert query(airports=["ORY"], minimum_on_days=3) == [1, 3, 5]
+    assert query(total_on_days=3, excluded_airports=["NTE"]) == [1]
+    assert query(flight_numbers=["TO4002", "TO4004"]) == [2, 4]
+    assert query(excluded_flight_numbers=["TO4001"], stopovers=["RAK"]) == [3, 5]
+    assert query(dates=[date(2025, 4, 3)]) == [1, 3]
+    assert query(
+        excluded_dates=[utils.DateRange(date(2025, 4, 3), date(2025, 4, 5))]
+    ) == [2, 4]
+    assert query(stopovers=["CDG"]) == []
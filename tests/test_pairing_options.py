@@ -0,0 +1,288 @@
+"""Test pairing option searches."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import UTC, date, datetime, time
+
+from apm_crewconnect import (
+    GroundActivity,
+    OffActivity,
+    Roster,
+    SqliteCache,
+    VacationActivity,
+    utils,
+)
+
+from .fixtures import (
+    FakeApm,
+    ground_activity,
+    pairing_data,
+    pairing_details_data,
+    pairing_search_handler,
+)
+
+
+def detail_requests(apm: FakeApm) -> list[str]:
+    return [path for _, path, _ in apm.client.requests if path.endswith("/details")]
+
+
+def test_get_pairing_options_filters_before_fetching_details() -> None:
+    """Test only pairings passing summary predicates have their details fetched."""
+    start = date(2025, 4, 1)
+    apm = FakeApm(
+        pairing_search_handler(
+            [
+                pairing_data(1, start, days=3, stopovers=["RAK"]),
+                pairing_data(2, start, days=1),
+                pairing_data(3, start, days=3, stopovers=["NTE"]),
+                pairing_data(4, date(2025, 4, 10), days=3, stopovers=["RAK"]),
+                pairing_data(5, start, days=3, check_in="06:00"),
+                pairing_data(6, start, days=3, stopovers=["RAK"]),
+                pairing_data(7, start, days=3, stopovers=["RAK"]),
+            ],
+            {
+                1: pairing_details_data(1, start),
+                6: pairing_details_data(6, start, bidder_roles=["OPL"]),
+                7: pairing_details_data(7, start, check_ins=["08:30", "07:00"]),
+            },
+        )
+    )
+
+    pairing_options = apm.get_pairing_options(
+        date(2025, 4, 1),
+        excluded_dates=[date(2025, 4, 11)],
+        excluded_stopovers=["NTE"],
+        minimum_on_days=2,
+        earliest_check_in=time(8, 0),
+        without_bidders="OPL",
+    )
+
+    assert [pairing.id for pairing in pairing_options] == [1]
+    assert detail_requests(apm) == [
+        f"/api/crews/12345/pairing-requests/{pairing_id}/details"
+        for pairing_id in (1, 6, 7)
+    ]
+
+
+def test_get_pairing_options_unsatisfiable_query() -> None:
+    """Test contradictory queries don't reach the API."""
+    apm = FakeApm(pairing_search_handler([], {}))
+
+    assert (
+        apm.get_pairing_options(date(2025, 4, 1), total_on_days=2, minimum_on_days=3)
+        == []
+    )
+    assert apm.client.requests == []
+
+
+def test_iter_pairing_options_yields_before_search_completes() -> None:
+    """Test pairing options are yielded as soon as their details are resolved."""
+    start = date(2025, 4, 1)
+    apm = FakeApm(
+        pairing_search_handler(
+            [pairing_data(pairing_id, start) for pairing_id in (1, 2, 3)],
+            {
+                pairing_id: pairing_details_data(pairing_id, start)
+                for pairing_id in (1, 2, 3)
+            },
+        )
+    )
+    pages = []
+
+    pairing_options = apm.iter_pairing_options(start, on_page=pages.append)
+
+    assert next(pairing_options).id == 1
+    assert pages == [1]
+    assert [pairing.id for pairing in pairing_options] == [2, 3]
+    assert pages == [1, 2]
+
+
+def test_get_pairing_options_top_k_skips_details() -> None:
+    """Test top-k searches only fetch details of pairings which can make the cut."""
+    start = date(2025, 4, 1)
+    on_days = {1: 2, 2: 4, 3: 3, 4: 4, 5: 1, 6: 3}
+    apm = FakeApm(
+        pairing_search_handler(
+            [pairing_data(i, start, days=days) for i, days in on_days.items()],
+            {
+                i: pairing_details_data(
+                    i, start, bidder_roles=["OPL"] if i == 4 else []
+                )
+                for i in on_days
+            },
+        )
+    )
+
+    pairing_options = apm.get_pairing_options(
+        start, sort_by="total_on_days", limit=2, without_bidders="OPL"
+    )
+
+    assert [pairing.id for pairing in pairing_options] == [2, 3]
+    assert detail_requests(apm) == [
+        f"/api/crews/12345/pairing-requests/{pairing_id}/details"
+        for pairing_id in (2, 4, 3)
+    ]
+    assert [
+        pairing.id
+        for pairing in apm.get_pairing_options(
+            start, sort_by="total_on_days", without_bidders="OPL"
+        )[:2]
+    ] == [2, 3]
+
+
+def test_get_pairing_options_top_k_by_rest_skips_day_trips() -> None:
+    """Test top-k searches by rest skip pairings too short to rest as long."""
+    start = date(2025, 4, 1)
+    on_days = {1: 2, 2: 1, 3: 2, 4: 1}
+    apm = FakeApm(
+        pairing_search_handler(
+            [pairing_data(i, start, days=days) for i, days in on_days.items()],
+            {
+                i: pairing_details_data(i, start, check_ins=["08:30", "09:00"][:days])
+                for i, days in on_days.items()
+            },
+        )
+    )
+
+    pairing_options = apm.get_pairing_options(start, sort_by="rest", limit=1)
+
+    assert [pairing.id for pairing in pairing_options] == [1]
+    assert detail_requests(apm) == [
+        f"/api/crews/12345/pairing-requests/{pairing_id}/details"
+        for pairing_id in (1, 3)
+    ]
+    assert apm.get_pairing_options(start, sort_by="rest")[0].id == 1
+
+
+def test_get_pairing_options_across_reference_dates() -> None:
+    """Test pairings found for several reference dates are only fetched once."""
+    start = date(2025, 4, 1)
+    details = {i: pairing_details_data(i, start) for i in (1, 2, 3, 4)}
+    handlers = {
+        "2025-04-01": pairing_search_handler(
+            [pairing_data(i, start) for i in (1, 2, 3)], details
+        ),
+        "2025-04-02": pairing_search_handler(
+            [pairing_data(i, start) for i in (2, 3, 4)], details
+        ),
+    }
+
+    def handler(method: str, path: str, kwargs: dict):
+        if path.endswith("/details"):
+            return details[int(path.split("/")[-2])]
+
+        return handlers[kwargs["params"]["referenceDate"][:10]](method, path, kwargs)
+
+    apm = FakeApm(handler)
+
+    pairing_options = apm.get_pairing_options(
+        utils.DateRange(start, date(2025, 4, 2)), sort_by="departure_date"
+    )
+
+    assert sorted(pairing.id for pairing in pairing_options) == [1, 2, 3, 4]
+    assert sorted(detail_requests(apm)) == [
+        f"/api/crews/12345/pairing-requests/{pairing_id}/details"
+        for pairing_id in (1, 2, 3, 4)
+    ]
+
+
+def test_get_pairing_options_excludes_roster_conflicts() -> None:
+    """Test pairings overlapping the roster are discarded before fetching details."""
+    start = date(2025, 4, 1)
+    roster = Roster(
+        user_id="12345",
+        start=start,
+        end=date(2025, 4, 30),
+        activities=[
+            # Required rest after this activity ends on the 3rd
+            ground_activity(
+                GroundActivity,
+                "E-LEARN",
+                datetime(2025, 4, 2, 8, tzinfo=UTC),
+                8,
+                post_rest_end=datetime(2025, 4, 3, 9, tzinfo=UTC),
+            ),
+            ground_activity(
+                VacationActivity, "CP", datetime(2025, 4, 10, tzinfo=UTC), 48
+            ),
+            # Non-requested days off don't block pairings
+            ground_activity(OffActivity, "OFF", datetime(2025, 4, 20, tzinfo=UTC), 24),
+        ],
+    )
+    departures = {
+        1: date(2025, 4, 1),
+        2: date(2025, 4, 3),
+        3: date(2025, 4, 4),
+        4: date(2025, 4, 11),
+        5: date(2025, 4, 19),
+    }
+    apm = FakeApm(
+        pairing_search_handler(
+            [pairing_data(i, departure, days=1) for i, departure in departures.items()],
+            {
+                i: pairing_details_data(i, departure)
+                for i, departure in departures.items()
+            },
+        )
+    )
+
+    pairing_options = apm.get_pairing_options(
+        start, sort_by="departure_date", roster=roster
+    )
+
+    assert sorted(pairing.id for pairing in pairing_options) == [1, 3, 5]
+    assert sorted(detail_requests(apm)) == [
+        f"/api/crews/12345/pairing-requests/{pairing_id}/details"
+        for pairing_id in (1, 3, 5)
+    ]
+
+
+def test_pairing_details_are_cached(tmp_path) -> None:
+    """Test pairing details are reused across searches until invalidated."""
+    start = date(2025, 4, 1)
+    handler = pairing_search_handler(
+        [pairing_data(1, start), pairing_data(2, start)],
+        {i: pairing_details_data(i, start) for i in (1, 2)},
+    )
+    apm = FakeApm(handler, cache=SqliteCache(str(tmp_path / "cache.sqlite")))
+
+    first = apm.get_pairing_options(start)
+    apm.client.requests.clear()
+
+    # A new client sharing the cache file doesn't fetch details again
+    apm = FakeApm(handler, cache=SqliteCache(str(tmp_path / "cache.sqlite")))
+
+    assert apm.get_pairing_options(start) == first
+    assert detail_requests(apm) == []
+
+    # Bidders expire sooner than duty periods
+    apm.cache.delete("pairing:12345:1:details")
+    apm.get_pairing_options(start, without_bidders="OPL")
+
+    assert detail_requests(apm) == ["/api/crews/12345/pairing-requests/1/details"]
+
+    apm.invalidate_pairing_details()
+    apm.client.requests.clear()
+    apm.get_pairing_options(start)
+
+    assert len(detail_requests(apm)) == 2
+
+
+def test_sqlite_cache(tmp_path) -> None:
+    """Test SqliteCache expiry and prefix invalidation."""
+    # Missing directories are created
+    cache = SqliteCache(str(tmp_path / ".storage" / "cache.sqlite"))
+
+    cache.set("pairing:1:details", b"{}")
+    cache.set("pairing:12:details", b"{}")
+    cache.set("pairing:2:details", b"{}", ttl=-1)
+
+    assert cache.get("pairing:1:details") == b"{}"
+    assert cache.get("pairing:2:details") is None
+
+    cache.clear("pairing:1:")
+
+    assert cache.get("pairing:1:details") is None
+    assert cache.get("pairing:12:details") == b"{}"
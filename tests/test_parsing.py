@@ -0,0 +1,51 @@
+"""Test parsing of raw response bodies."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import date
+import json
+
+from apm_crewconnect import ParsingPool
+from apm_crewconnect.parsing import parse_flight_schedule
+
+from .fixtures import FakeApm, flight_schedule_data, sector_data
+
+
+def test_parsing_pool_threshold() -> None:
+    """Test small bodies are parsed in-process and large ones in workers."""
+    content = json.dumps(
+        flight_schedule_data({"FHUYE": [sector_data(legId=1), sector_data(legId=2)]})
+    ).encode()
+
+    with ParsingPool(max_workers=1, threshold=len(content) + 1) as pool:
+        assert len(pool.map(parse_flight_schedule, [content])) == 1
+        assert pool._executor is None
+
+    with ParsingPool(max_workers=1, threshold=0) as pool:
+        in_process = parse_flight_schedule(content, {"registrations": ["FHUYE"]})
+
+        assert (
+            pool.submit(
+                parse_flight_schedule, content, {"registrations": ["FHUYE"]}
+            ).result()
+            == in_process
+        )
+        assert pool._executor is not None
+
+
+def test_get_flight_schedule_with_parsing_pool() -> None:
+    """Test schedules parsed in worker processes match in-process ones."""
+    handler = lambda method, path, kwargs: flight_schedule_data(
+        {"FHUYE": [sector_data(legId=1)], "FHUYF": [sector_data(legId=2)]}
+    )
+
+    with ParsingPool(max_workers=2, threshold=0) as pool:
+        flights = FakeApm(handler, parsing_pool=pool).get_flight_schedule(
+            date(2024, 11, 10), date(2024, 11, 11)
+        )
+
+    assert flights == FakeApm(handler).get_flight_schedule(
+        date(2024, 11, 10), date(2024, 11, 11)
+    )
@@ -0,0 +1,88 @@
+"""Test pairing option rankings."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import date
+
+import pytest
+
+from apm_crewconnect import PairingRanker
+
+from .fixtures import (
+    FakeApm,
+    pairing_data,
+    pairing_details_data,
+    pairing_search_handler,
+)
+
+START = date(2025, 4, 1)
+
+# Duty periods end at 18:00, so the second check-in sets the rest duration
+CHECK_INS = {
+    1: ["08:30", "09:00"],
+    2: ["08:30"],
+    3: ["08:30", "10:00"],
+    4: ["08:30", "09:00"],
+}
+
+
+def ranking_apm() -> FakeApm:
+    return FakeApm(
+        pairing_search_handler(
+            [
+                pairing_data(pairing_id, START, days=3 if pairing_id == 4 else 2)
+                for pairing_id in CHECK_INS
+            ],
+            {
+                pairing_id: pairing_details_data(pairing_id, START, check_ins)
+                for pairing_id, check_ins in CHECK_INS.items()
+            },
+        )
+    )
+
+
+def test_ranker_breaks_ties() -> None:
+    """Test pairings are ranked by score, then tie breakers, then original order."""
+    apm = ranking_apm()
+
+    assert [
+        pairing.id
+        for pairing in apm.get_pairing_options(
+            START, sort_by=PairingRanker(weights={"mean_rest": 1})
+        )
+    ] == [3, 1, 4, 2]
+    assert [
+        pairing.id
+        for pairing in apm.get_pairing_options(
+            START,
+            sort_by=PairingRanker(weights={"mean_rest": 1}, tie_breakers=["on_days"]),
+        )
+    ] == [3, 4, 1, 2]
+
+
+def test_ranker_top_k_is_stable() -> None:
+    """Test top-k rankings keep the order of the full ranking."""
+    apm = ranking_apm()
+    ranker = PairingRanker(weights={"mean_rest": 2, "stopover_nights": -1})
+    pairing_options = apm.get_pairing_options(START, sort_by=ranker)
+
+    for limit in range(5):
+        assert (
+            ranker.rank(pairing_options, limit) == ranker.rank(pairing_options)[:limit]
+        )
+
+
+def test_ranker_rejects_unknown_features() -> None:
+    with pytest.raises(ValueError):
+        PairingRanker(weights={"rest": 1})
+
+
+def test_sort_by_rest_without_rest_periods() -> None:
+    """Test pairings without rest periods don't break the built-in sort keys."""
+    apm = ranking_apm()
+
+    assert [
+        pairing.id for pairing in apm.get_pairing_options(START, sort_by="rest")
+    ] == [3, 1, 4, 2]
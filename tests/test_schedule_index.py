@@ -0,0 +1,67 @@
+"""Test lookups in flight schedule indexes."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import UTC, datetime, timedelta
+
+from apm_crewconnect import Flight, ScheduleIndex
+
+from .fixtures import sector_data
+
+
+def flight(
+    leg_id: int, registration: str, origin: str, destination: str, departure: str
+) -> Flight:
+    return Flight.from_dict(
+        sector_data(
+            legId=leg_id,
+            aircraftRegistration=registration,
+            departureAirportCommercialCode=origin,
+            arrivalAirportCommercialCode=destination,
+            departureTime=f"2024-11-10T{departure}:00Z",
+        )
+    )
+
+
+def test_schedule_index() -> None:
+    """Test rotations, timelines and connections."""
+    flights = [
+        flight(3, "FHUYE", "ORY", "RAK", "14:00"),
+        flight(1, "FHUYE", "ORY", "RAK", "06:00"),
+        flight(2, "FHUYE", "RAK", "ORY", "09:00"),
+        flight(4, "FHUYF", "ORY", "NTE", "11:30"),
+        flight(5, "FHUYF", "ORY", "LIS", "12:00"),
+    ]
+    index = ScheduleIndex(flights)
+
+    def leg_ids(flights: list[Flight]) -> list[int]:
+        return [flight.leg_id for flight in flights]
+
+    assert leg_ids(index.rotation("F-HUYE")) == [1, 2, 3]
+    assert leg_ids(index.following_legs(flights[1])) == [2, 3]
+    assert leg_ids(index.following_legs(flights[1], limit=1)) == [2]
+    assert leg_ids(index.next_legs("FHUYE", datetime(2024, 11, 10, 9, tzinfo=UTC))) == [
+        2,
+        3,
+    ]
+    assert index.next_legs("FHUYZ", datetime(2024, 11, 10, tzinfo=UTC)) == []
+
+    # Flight 2 arrives at ORY at 11:00
+    assert leg_ids(index.connections_from(flights[2], timedelta(hours=1))) == [4, 5]
+    assert leg_ids(
+        index.connections_from(flights[2], timedelta(hours=1), timedelta(minutes=45))
+    ) == [5]
+    assert leg_ids(
+        index.connections(
+            "ORY", datetime(2024, 11, 10, 12, tzinfo=UTC), timedelta(hours=3)
+        )
+    ) == [5, 3]
+    assert leg_ids(
+        index.arrivals(
+            "RAK",
+            datetime(2024, 11, 10, tzinfo=UTC),
+            datetime(2024, 11, 11, tzinfo=UTC),
+        )
+    ) == [1, 3]
@@ -0,0 +1,53 @@
+"""Test serialization of models."""
+
+import io
+import json
+import sys
+
+sys.path.append("./src")
+
+from datetime import date
+
+import msgpack
+
+from apm_crewconnect import Flight, Pairing, serialization
+from apm_crewconnect.parsing import parse_pairing_details
+
+from .fixtures import pairing_data, pairing_details_data, sector_data
+
+
+def test_serialize_pairing() -> None:
+    """Test pairings are serialized with their derived properties."""
+    pairing = Pairing.from_dict(pairing_data(1, date(2025, 4, 1)))
+    pairing.duty_periods = parse_pairing_details(
+        json.dumps(pairing_details_data(1, date(2025, 4, 1))).encode()
+    )
+
+    data = json.loads(serialization.dumps(pairing))
+
+    assert data["check_in"] == "2025-04-01T08:30:00+00:00"
+    assert data["scheduled_departure_date"] == "2025-04-01"
+    assert data["duty_periods"][0]["block"] == "4:00"
+    assert data["duty_periods"][0]["components"][0]["component_airport"] == "ORY-RAK"
+    assert data["rest_periods"] == [{"stopover": "RAK", "duration": "15:00"}]
+    assert data["total_block"] == "8:00"
+    assert data["report_times"][1]["check_in"] == "2025-04-02T09:00:00"
+
+
+def test_dump_streams_lists() -> None:
+    """Test lists dumped to files match their serialization in one go."""
+    flights = [
+        Flight.from_dict(sector_data(legId=1)),
+        Flight.from_dict(sector_data(legId=2), lazy=True),
+    ]
+    text_file = io.StringIO()
+    binary_file = io.BytesIO()
+
+    serialization.dump(flights, text_file)
+    serialization.dump(flights, binary_file, format="msgpack")
+
+    data = json.loads(text_file.getvalue())
+
+    assert data == json.loads(serialization.dumps(flights))
+    assert msgpack.unpackb(binary_file.getvalue()) == data
+    assert {**data[0], "leg_id": 2} == data[1]
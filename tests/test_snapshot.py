@@ -0,0 +1,110 @@
+"""Test columnar snapshots."""
+
+import sys
+
+sys.path.append("./src")
+
+from dataclasses import replace
+from datetime import UTC, date, datetime
+
+import pytest
+
+from apm_crewconnect import (
+    CrewMember,
+    Flight,
+    GroundActivity,
+    Roster,
+    Snapshot,
+    VacationActivity,
+    write_snapshot,
+)
+
+from .fixtures import flight_activity, ground_activity, sector_data
+
+
+def test_roster_snapshot(tmp_path) -> None:
+    """Test rosters are restored from snapshots, with each activity's class."""
+    roster = Roster(
+        user_id="12345",
+        start=date(2025, 4, 1),
+        end=date(2025, 4, 30),
+        activities=[
+            replace(
+                flight_activity(1, date(2025, 4, 1)),
+                crew_members=[CrewMember("Jane", "Doe", "", False, False, "CDB")],
+            ),
+            ground_activity(
+                GroundActivity, "E-LEARN", datetime(2025, 4, 2, 8, tzinfo=UTC), 8
+            ),
+            ground_activity(
+                VacationActivity, "CP", datetime(2025, 4, 10), 48, remarks="Naive"
+            ),
+        ],
+    )
+    path = str(tmp_path / "roster.snapshot")
+
+    write_snapshot(path, roster)
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.kind == "roster"
+        assert len(snapshot) == 3
+        assert snapshot.column("details")[1] == "E-LEARN"
+        assert snapshot.column("pairing_id")[0] is None
+
+        # Fields of subclasses are typed columns, null for other classes
+        assert snapshot.column("block_time").type == "timedelta"
+        assert list(snapshot.column("block_time").values)[0] == 3 * 3600
+        assert snapshot.column("block_time")[1] is None
+        assert snapshot.column("origin_timezone")[0] == UTC
+        assert snapshot.column("ground_code")[1] == "E-LEARN"
+        assert snapshot.column("crew_members")[0][0]["role_code"] == "CDB"
+        assert snapshot.to_roster() == roster
+
+
+def test_flight_schedule_snapshot(tmp_path) -> None:
+    """Test flight columns are read in place, and rows built on access."""
+    flights = [
+        Flight.from_dict(
+            sector_data(legId=1, departureTime="2024-11-10T06:00:00+01:00")
+        ),
+        Flight.from_dict(sector_data(legId=2, aircraftRegistration="FHUYF"), lazy=True),
+    ]
+    path = str(tmp_path / "flights.snapshot")
+
+    write_snapshot(path, flights)
+
+    with Snapshot(path) as snapshot:
+        assert snapshot.kind == "flights"
+        assert list(snapshot.column("leg_id").values) == [1, 2]
+        assert snapshot.column("aircraft_registration")[1] == "FHUYF"
+        assert snapshot.column("aircraft_registration").values.tolist() == [0, 1]
+        assert snapshot.column("departure_time").values[0] == int(
+            datetime(2024, 11, 10, 5, tzinfo=UTC).timestamp() * 1_000_000
+        )
+        assert snapshot[0] == flights[0]
+        assert snapshot[0].departure_time.utcoffset().total_seconds() == 3600
+        assert list(snapshot) == flights
+
+
+def test_snapshot_header_holds_no_strings(tmp_path) -> None:
+    """Test string dictionaries are stored as buffers, not in the header."""
+    path = tmp_path / "flights.snapshot"
+
+    write_snapshot(str(path), [Flight.from_dict(sector_data(flightNumber="Z123"))])
+
+    data = path.read_bytes()
+    header_length = int.from_bytes(data[8:12], "little")
+
+    assert b"Z123" in data
+    assert b"Z123" not in data[12 : 12 + header_length]
+
+    with Snapshot(str(path)) as snapshot:
+        assert snapshot.column("flight_number")[0] == "Z123"
+
+
+def test_snapshot_rejects_other_files(tmp_path) -> None:
+    path = tmp_path / "other.json"
+    path.write_text("[]")
+
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
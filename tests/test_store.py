@@ -0,0 +1,141 @@
+"""Test the local flight and roster store."""
+
+import sys
+
+sys.path.append("./src")
+
+from dataclasses import replace
+from datetime import UTC, date, datetime, timedelta
+
+from apm_crewconnect import FlightActivity, FlightStore, GroundActivity, Roster
+
+from .fixtures import (
+    FakeApm,
+    flight_activity,
+    flight_schedule_data,
+    ground_activity,
+    sector_data,
+)
+
+
+def test_store_flights(tmp_path) -> None:
+    """Test flights are upserted by leg ID, and queried by indexed columns."""
+    store = FlightStore(str(tmp_path / "flights.sqlite"))
+    store.batch_size = 2
+    apm = FakeApm(
+        lambda method, path, kwargs: flight_schedule_data(
+            {
+                "FHUYE": [
+                    sector_data(
+                        legId=int(kwargs["params"]["from"].replace("-", "")),
+                        departureTime=f"{kwargs['params']['from']}T06:00:00Z",
+                        scheduledDepartureTime=f"{kwargs['params']['from']}T06:00:00Z",
+                    )
+                ],
+                "FHUYF": [
+                    sector_data(
+                        legId=int(kwargs["params"]["from"].replace("-", "")) * 10,
+                        aircraftRegistration="FHUYF",
+                        flightNumber="4013",
+                        commercialFlightNumber="TO4013",
+                        departureAirportCommercialCode="NTE",
+                        departureTime=f"{kwargs['params']['from']}T09:00:00Z",
+                        scheduledDepartureTime=f"{kwargs['params']['from']}T09:00:00Z",
+                    )
+                ],
+            }
+        )
+    )
+
+    assert (
+        store.ingest_flight_schedule(apm, date(2024, 11, 10), date(2024, 11, 12)) == 6
+    )
+
+    # Upserting the same legs again doesn't duplicate them
+    store.add_flights(apm.get_flight_schedule(date(2024, 11, 10)))
+
+    assert len(store.flights()) == 6
+    assert [
+        flight.leg_id
+        for flight in store.flights(
+            registration="F-HUYE", start_date=date(2024, 11, 11)
+        )
+    ] == [20241111, 20241112]
+    assert store.flights(
+        flight_number="TO4013", columns=["leg_id", "departure_date"]
+    ) == {
+        "leg_id": [202411100, 202411110, 202411120],
+        "departure_date": ["2024-11-10", "2024-11-11", "2024-11-12"],
+    }
+    assert len(store.flights(airport="NTE", end_date=date(2024, 11, 11))) == 2
+
+
+def test_store_roster(tmp_path) -> None:
+    """Test roster activities are stored and queried with their classes."""
+    store = FlightStore(str(tmp_path / "flights.sqlite"))
+    roster = Roster(
+        user_id="12345",
+        start=date(2025, 4, 1),
+        end=date(2025, 4, 30),
+        activities=[
+            flight_activity(1, date(2025, 4, 1)),
+            ground_activity(
+                GroundActivity, "E-LEARN", datetime(2025, 4, 2, 8, tzinfo=UTC), 8
+            ),
+            flight_activity(2, date(2025, 4, 3)),
+        ],
+    )
+
+    assert store.add_roster(roster) == 3
+    assert store.activities(user_id="12345") == roster.activities
+    assert store.activities(activity_type=FlightActivity, columns=["id"]) == {
+        "id": [1, 2]
+    }
+    assert store.activities(flight_number="TO2") == [roster.activities[2]]
+
+
+def test_store_roster_twice(tmp_path) -> None:
+    """Test storing a roster again, as fetched by another process, replaces it."""
+    store = FlightStore(str(tmp_path / ".storage" / "flights.sqlite"))
+    activities = [
+        ground_activity(
+            GroundActivity,
+            "E-LEARN",
+            datetime(2025, 4, 2, 8, tzinfo=UTC),
+            8,
+            has_generated_id=True,
+        ),
+        flight_activity(1, date(2025, 4, 3)),
+    ]
+
+    store.add_roster(Roster("12345", date(2025, 4, 1), date(2025, 4, 30), activities))
+
+    # Activities without an ID in the roster get another ID in another process
+    activities[0] = replace(activities[0], id=activities[0].id + 1)
+    store.add_roster(Roster("12345", date(2025, 4, 1), date(2025, 4, 30), activities))
+
+    assert len(store.activities()) == 2
+    assert store.activities()[0].has_generated_id
+
+    # Other users' activities are kept apart
+    store.add_roster(Roster("67890", date(2025, 4, 1), date(2025, 4, 30), activities))
+
+    assert len(store.activities()) == 4
+
+
+def test_store_delayed_activity(tmp_path) -> None:
+    """Test an activity whose times changed replaces the one with the same ID."""
+    store = FlightStore(str(tmp_path / "flights.sqlite"))
+    activity = flight_activity(1, date(2025, 4, 3))
+
+    store.add_roster(Roster("12345", date(2025, 4, 1), date(2025, 4, 30), [activity]))
+
+    delayed = replace(
+        activity,
+        start=activity.start + timedelta(minutes=30),
+        end=activity.end + timedelta(minutes=30),
+    )
+    store.add_roster(Roster("12345", date(2025, 4, 1), date(2025, 4, 30), [delayed]))
+
+    assert store.activities() == [delayed]
+    assert store.activities()[0].start == delayed.start
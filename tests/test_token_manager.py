@@ -0,0 +1,95 @@
+"""Test sharing tokens between clients through SQLite token managers."""
+
+import sys
+
+sys.path.append("./src")
+
+from types import SimpleNamespace
+
+from apm_crewconnect import Apm, ApmClient, SqliteTokenManager
+
+
+def test_transaction_writes_once(tmp_path) -> None:
+    """Test updates within a transaction are only seen by others once it ends."""
+    path = str(tmp_path / "tokens.sqlite")
+    manager = SqliteTokenManager(path)
+    other_manager = SqliteTokenManager(path, timeout=0)
+
+    manager.set(key="apm", value={"token": "a1"})
+
+    assert other_manager.get("apm") == {"token": "a1"}
+
+    with manager.transaction():
+        manager.set(key="apm", value={"token": "a2"})
+        manager.set(key="okta", value={"access_token": "o2"})
+
+        assert manager.get("apm") == {"token": "a2"}
+        assert other_manager.get("apm") == {"token": "a1"}
+        assert not other_manager.has("okta")
+
+    assert other_manager.get() == {
+        "apm": {"token": "a2"},
+        "okta": {"access_token": "o2"},
+    }
+
+
+class FakeOktaClient:
+    refreshes = 0
+
+    def __init__(self, token=None, token_updater=None) -> None:
+        self.token_updater = token_updater
+        self.session = SimpleNamespace(token=token)
+        self._token = token
+
+    @property
+    def token(self):
+        return self._token
+
+    @token.setter
+    def token(self, value) -> None:
+        self._token = value
+
+        if self.token_updater is not None:
+            self.token_updater(value)
+
+    def refresh_token(self) -> None:
+        FakeOktaClient.refreshes += 1
+        self.token = {"access_token": f"o{FakeOktaClient.refreshes}"}
+
+
+def test_refreshed_tokens_are_shared(tmp_path, monkeypatch) -> None:
+    """Test a client adopts the tokens refreshed by another, without refreshing."""
+
+    def setup_okta_client(self, **kwargs) -> None:
+        self.okta_client = FakeOktaClient(**kwargs)
+
+    def fetch_token(self) -> dict:
+        self.token = {
+            "userId": 1,
+            "token": "a" + self.okta_client.token["access_token"],
+        }
+        return self.token
+
+    monkeypatch.setattr(ApmClient, "setup_okta_client", setup_okta_client)
+    monkeypatch.setattr(ApmClient, "fetch_token", fetch_token)
+
+    path = str(tmp_path / "tokens.sqlite")
+    SqliteTokenManager(path).set(
+        value={"apm": {"userId": 1, "token": "ao0"}, "okta": {"access_token": "o0"}}
+    )
+    apm = Apm("https://crewmobile.example.com", SqliteTokenManager(path))
+    other_apm = Apm("https://crewmobile.example.com", SqliteTokenManager(path))
+
+    apm.client.refresh_token()
+
+    assert FakeOktaClient.refreshes == 1
+    assert apm.token_manager.get() == {
+        "apm": {"userId": 1, "token": "ao1"},
+        "okta": {"access_token": "o1"},
+    }
+
+    other_apm.client.refresh_token()
+
+    assert FakeOktaClient.refreshes == 1
+    assert other_apm.client.access_token == "ao1"
+    assert other_apm.client.okta_client.session.token == {"access_token": "o1"}
@@ -21,3 +21,44 @@ def test_date_range() -> None:
 
     with pytest.raises(ValueError):
         utils.date_range(date(2024, 7, 22), date(2024, 7, 19))
+
+
+def test_date_range_lazy() -> None:
+    """Test DateRange."""
+    dates = utils.DateRange(date(2024, 7, 19), date(2024, 7, 22))
+
+    assert list(dates) == utils.date_range(date(2024, 7, 19), date(2024, 7, 22))
+    assert len(dates) == 4
+    assert dates[-1] == date(2024, 7, 22)
+    assert date(2024, 7, 20) in dates
+    assert date(2024, 7, 23) not in dates
+    assert len({dates, utils.DateRange(date(2024, 7, 19), date(2024, 7, 22))}) == 1
+
+    with pytest.raises(ValueError):
+        utils.DateRange(date(2024, 7, 22), date(2024, 7, 19))
+
+
+def test_date_set() -> None:
+    """Test DateSet."""
+    dates = utils.DateSet(
+        [
+            utils.DateRange(date(2024, 7, 19), date(2024, 7, 22)),
+            date(2024, 7, 23),
+            date(2024, 8, 1),
+        ]
+    )
+
+    assert list(dates.ranges()) == [
+        utils.DateRange(date(2024, 7, 19), date(2024, 7, 23)),
+        utils.DateRange(date(2024, 8, 1), date(2024, 8, 1)),
+    ]
+    assert len(dates) == 6
+    assert date(2024, 7, 23) in dates
+    assert date(2024, 7, 24) not in dates
+    assert dates.intersects(date(2024, 7, 24), date(2024, 8, 5))
+    assert not dates.intersects(date(2024, 7, 24), date(2024, 7, 31))
+    assert not dates.intersects(date(2024, 7, 1), date(2024, 7, 18))
+    assert utils.dates_in_range(dates, date(2024, 7, 1), date(2024, 7, 19))
+    assert dates | [date(2024, 7, 24)] == utils.DateSet(
+        [utils.DateRange(date(2024, 7, 19), date(2024, 7, 24)), date(2024, 8, 1)]
+    )
@@ -0,0 +1,89 @@
+"""Test flight schedule watchers."""
+
+import sys
+
+sys.path.append("./src")
+
+from datetime import UTC, date, datetime
+
+from .fixtures import FakeApm, flight_schedule_data, sector_data
+
+
+def test_watcher_reports_changed_legs() -> None:
+    """Test only new, changed and removed legs are reported."""
+    sectors = {
+        1: sector_data(legId=1, departureTime="2024-11-10T06:00:00Z"),
+        2: sector_data(legId=2, departureTime="2024-11-10T18:00:00Z"),
+    }
+    apm = FakeApm(
+        lambda method, path, kwargs: flight_schedule_data(
+            {"FHUYE": list(sectors.values())}
+        )
+    )
+    now = datetime(2024, 11, 10, 12, tzinfo=UTC)
+    watcher = apm.watch_flight_schedule(
+        date(2024, 11, 10), now=lambda: now, sleep=lambda interval: None
+    )
+
+    changes = watcher.poll()
+
+    assert [flight.leg_id for flight in changes.updated] == [1, 2]
+    assert not watcher.poll()
+
+    sectors[2] = sectors[2] | {"delays": [{"delayMinutes": 20, "delayCode": "93"}]}
+    sectors[3] = sector_data(legId=3, departureTime="2024-11-10T20:00:00Z")
+    del sectors[1]
+
+    changes = watcher.poll()
+
+    assert [flight.leg_id for flight in changes.updated] == [2, 3]
+    assert changes.updated[0].delays[0].delay_minutes == 20
+    assert changes.removed == [1]
+
+    # Watching only yields changes, waiting between polls
+    sleeps = []
+    watcher = apm.watch_flight_schedule(
+        date(2024, 11, 10), now=lambda: now, sleep=sleeps.append
+    )
+    watch = watcher.watch()
+
+    assert [flight.leg_id for flight in next(watch).updated] == [2, 3]
+
+    sectors[3] = sectors[3] | {"aircraftRegistration": "FHUYF"}
+
+    assert [flight.leg_id for flight in next(watch).updated] == [3]
+    assert len(sleeps) == 1
+
+
+def test_watcher_polling_interval() -> None:
+    """Test polls are frequent near movements, and sparse when quiet."""
+    apm = FakeApm(
+        lambda method, path, kwargs: flight_schedule_data(
+            {"FHUYE": [sector_data(departureTime="2024-11-10T18:00:00Z")]}
+        )
+    )
+    now = datetime(2024, 11, 10, 2, tzinfo=UTC)
+    watcher = apm.watch_flight_schedule(
+        date(2024, 11, 10), now=lambda: now, maximum_interval=600
+    )
+
+    watcher.poll()
+
+    # Changes halve the interval, which can't be shorter than the minimum
+    assert watcher.interval == 30
+
+    for _ in range(20):
+        watcher.poll()
+
+    assert watcher.interval == 600
+
+    now = datetime(2024, 11, 10, 17, 30, tzinfo=UTC)
+    watcher.poll()
+
+    assert watcher.interval == 30
+
+    # Once the flight has arrived, polls slow down again
+    now = datetime(2024, 11, 10, 21, tzinfo=UTC)
+    watcher.poll()
+
+    assert watcher.interval == 45